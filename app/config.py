@@ -7,10 +7,36 @@ from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
+    database_url: str = "sqlite:///./salesmailer.db"
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+    # "production" applies WAL, synchronous=NORMAL, busy_timeout, mmap and cache pragmas on connect.
+    sqlite_profile: str = "production"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size_kib: int = 65536
+
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o-mini"
     openai_temperature: float = 0.7
     openai_max_tokens: int = 500
+    openai_base_url: Optional[str] = None
+    openai_timeout_seconds: float = 30.0
+    openai_deadline_seconds: float = 60.0
+    openai_max_concurrency: int = 16
+    openai_max_retries: int = 3
+    openai_batch_window_ms: int = 50
+    openai_batch_max_size: int = 20
+    openai_cache_enabled: bool = True
+    openai_cache_ttl_seconds: int = 86400
+    openai_cache_max_entries: int = 2048
+    openai_cache_path: Optional[str] = None
+    # USD per million input/output tokens, used to estimate spend in usage reports.
+    openai_token_prices: dict[str, tuple[float, float]] = {"gpt-4o-mini": (0.15, 0.60)}
 
     gmail_user_id: Optional[str] = None
     gmail_token: Optional[str] = None
@@ -18,6 +44,43 @@ class Settings(BaseSettings):
     gmail_client_id: Optional[str] = None
     gmail_client_secret: Optional[str] = None
     gmail_token_uri: str = "https://oauth2.googleapis.com/token"
+    # Overrides the Gmail API root (e.g. a local stub for load tests); batch requests follow it.
+    gmail_api_base_url: Optional[str] = None
+    gmail_pool_size: int = 4
+    gmail_brand_pool_size: int = 2
+    gmail_registry_max_clients: int = 32
+    gmail_token_refresh_margin_seconds: int = 300
+    gmail_send_rate_per_second: float = 1.0
+    gmail_send_burst: int = 10
+
+    outbox_enabled: bool = True
+    outbox_max_concurrency: int = 4
+    outbox_max_attempts: int = 5
+    outbox_backoff_base_seconds: float = 30.0
+    outbox_poll_interval_seconds: float = 2.0
+    outbox_batch_size: int = 50
+    outbox_stale_after_seconds: int = 600
+
+    lead_batch_max_size: int = 500
+    lead_export_yield_per: int = 1000
+    email_body_codec: str = "zlib"
+    email_body_compression_level: int = 6
+    ingest_dedup_window_seconds: int = 600
+    ingest_claim_timeout_seconds: int = 120
+    template_cache_size: int = 256
+    brand_context_ttl_seconds: int = 300
+
+    metrics_enabled: bool = True
+    server_timing_enabled: bool = True
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_header: str = "X-Profile"
+    profiling_dir: str = "profiles"
+    profiling_interval_ms: float = 5.0
+
+    generation_max_workers: int = 4
+    generation_max_pending: int = 100
+    generation_stale_after_seconds: int = 600
 
     class Config:
         env_file = ".env"
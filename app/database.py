@@ -1,26 +1,115 @@
 from collections.abc import Generator
 from contextlib import contextmanager
-from typing import Annotated
+from time import perf_counter
+from typing import Annotated, Any
 
 from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlmodel import Session, SQLModel, create_engine
 
-DATABASE_URL = "sqlite:///./salesmailer.db"
+from app.config import Settings, get_settings
+from app.migrations import upgrade_schema
+from app.services.lead_search import install_lead_search
+from app.services.metrics import add_request_time, stage
 
-engine_kwargs = {"connect_args": {"check_same_thread": False}}
-engine = create_engine(DATABASE_URL, echo=False, **engine_kwargs)
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url == "sqlite://")
+
+
+def _engine_kwargs(settings: Settings) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {"echo": settings.database_echo, "pool_pre_ping": settings.database_pool_pre_ping}
+    if settings.database_url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000}
+        if _is_memory_sqlite(settings.database_url):
+            return kwargs
+    kwargs.update(
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+    )
+    return kwargs
+
+
+def _apply_sqlite_profile(settings: Settings):  # type: ignore[no-untyped-def]
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+    def _on_connect(dbapi_connection, connection_record) -> None:  # type: ignore[no-untyped-def]
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return _on_connect
+
+
+def _time_queries(db_engine: Engine) -> None:
+    """Add each statement's execution time to the current request's ``sql`` timing."""
+
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        conn.info.setdefault("query_started", []).append(perf_counter())
+
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        add_request_time("sql", perf_counter() - conn.info["query_started"].pop())
+
+    event.listen(db_engine, "before_cursor_execute", _before)
+    event.listen(db_engine, "after_cursor_execute", _after)
+
+
+def create_db_engine(settings: Settings) -> Engine:
+    db_engine = create_engine(settings.database_url, **_engine_kwargs(settings))
+    if db_engine.dialect.name == "sqlite" and settings.sqlite_profile == "production":
+        event.listen(db_engine, "connect", _apply_sqlite_profile(settings))
+    if settings.server_timing_enabled:
+        _time_queries(db_engine)
+    return db_engine
+
+
+engine = create_db_engine(get_settings())
 
 
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
+    upgrade_schema(engine)
+    install_lead_search(engine)
+
+
+@contextmanager
+def count_queries(bind: Engine | None = None) -> Generator[list[str], None, None]:
+    """Collect every SQL statement executed on ``bind`` while the block runs."""
+
+    target = bind or engine
+    statements: list[str] = []
+
+    def _record(connection, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(target, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(target, "before_cursor_execute", _record)
 
 
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
-    session = Session(engine)
+    # Objects stay usable after commit, so handlers never pay a refresh SELECT to serialise them.
+    session = Session(engine, expire_on_commit=False)
     try:
         yield session
-        session.commit()
+        with stage("db_commit"):
+            session.commit()
     except Exception:
         session.rollback()
         raise
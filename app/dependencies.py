@@ -2,33 +2,64 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from fastapi import Depends
-
 from app.config import Settings, get_settings
+from app.database import session_scope
+from app.services.body_store import EmailBodyStore
+from app.services.brand_context import BrandContextCache
+from app.services.copy_batcher import CopyBatcher
 from app.services.email_renderer import EmailRenderer
+from app.services.generation_worker import GenerationWorker
 from app.services.gmail_client import GmailClient, GmailSettings
+from app.services.gmail_registry import GmailClientRegistry
 from app.services.openai_client import OpenAIClient, OpenAIConfig
+from app.services.outbox import OutboxDispatcher
+from app.services.profiling import ProfilerControl
+from app.services.response_cache import ResponseCache
 
 
 @lru_cache
 def get_renderer() -> EmailRenderer:
-    return EmailRenderer()
+    return EmailRenderer(cache_size=get_settings().template_cache_size)
 
 
 @lru_cache
-def get_openai_service(settings: Settings) -> OpenAIClient:
+def get_openai_service() -> OpenAIClient:
+    settings = get_settings()
     if settings.openai_api_key:
         config = OpenAIConfig(
             model=settings.openai_model,
             temperature=settings.openai_temperature,
             max_tokens=settings.openai_max_tokens,
+            base_url=settings.openai_base_url,
+            timeout_seconds=settings.openai_timeout_seconds,
+            deadline_seconds=settings.openai_deadline_seconds,
+            max_concurrency=settings.openai_max_concurrency,
+            max_retries=settings.openai_max_retries,
         )
-        return OpenAIClient(api_key=settings.openai_api_key, config=config)
+        cache = None
+        if settings.openai_cache_enabled:
+            cache = ResponseCache(
+                ttl_seconds=settings.openai_cache_ttl_seconds,
+                max_entries=settings.openai_cache_max_entries,
+                path=settings.openai_cache_path,
+            )
+        return OpenAIClient(api_key=settings.openai_api_key, config=config, cache=cache)
     return OpenAIClient()
 
 
 @lru_cache
-def get_gmail_service(settings: Settings) -> GmailClient:
+def get_copy_batcher() -> CopyBatcher:
+    settings = get_settings()
+    return CopyBatcher(
+        get_openai_service(),
+        window_seconds=settings.openai_batch_window_ms / 1000,
+        max_batch_size=settings.openai_batch_max_size,
+    )
+
+
+@lru_cache
+def get_gmail_service() -> GmailClient:
+    settings = get_settings()
     if all(
         [
             settings.gmail_user_id,
@@ -45,11 +76,76 @@ def get_gmail_service(settings: Settings) -> GmailClient:
             client_id=settings.gmail_client_id or "",
             client_secret=settings.gmail_client_secret or "",
             token_uri=settings.gmail_token_uri,
+            api_base_url=settings.gmail_api_base_url,
         )
-        return GmailClient(gmail_settings)
+        return GmailClient(gmail_settings, pool_size=settings.gmail_pool_size)
     return GmailClient()
 
 
+@lru_cache
+def get_brand_context_cache() -> BrandContextCache:
+    return BrandContextCache(ttl_seconds=get_settings().brand_context_ttl_seconds)
+
+
+@lru_cache
+def get_body_store() -> EmailBodyStore:
+    settings = get_settings()
+    return EmailBodyStore(codec=settings.email_body_codec, level=settings.email_body_compression_level)
+
+
+@lru_cache
+def get_profiler() -> ProfilerControl:
+    settings = get_settings()
+    return ProfilerControl(
+        enabled=settings.profiling_enabled,
+        sample_rate=settings.profiling_sample_rate,
+        header=settings.profiling_header,
+        directory=settings.profiling_dir,
+        interval_ms=settings.profiling_interval_ms,
+    )
+
+
+@lru_cache
+def get_generation_worker() -> GenerationWorker:
+    settings = get_settings()
+    return GenerationWorker(
+        max_workers=settings.generation_max_workers,
+        max_pending=settings.generation_max_pending,
+    )
+
+
+@lru_cache
+def get_gmail_registry() -> GmailClientRegistry:
+    settings = get_settings()
+    return GmailClientRegistry(
+        default=get_gmail_service(),
+        client_id=settings.gmail_client_id,
+        client_secret=settings.gmail_client_secret,
+        token_uri=settings.gmail_token_uri,
+        api_base_url=settings.gmail_api_base_url,
+        max_clients=settings.gmail_registry_max_clients,
+        pool_size=settings.gmail_brand_pool_size,
+        refresh_margin_seconds=settings.gmail_token_refresh_margin_seconds,
+    )
+
+
+@lru_cache
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    settings = get_settings()
+    return OutboxDispatcher(
+        session_factory=session_scope,
+        client_for=get_gmail_registry().client_for,
+        body_store=get_body_store(),
+        rate_per_second=settings.gmail_send_rate_per_second,
+        burst=settings.gmail_send_burst,
+        max_concurrency=settings.outbox_max_concurrency,
+        max_attempts=settings.outbox_max_attempts,
+        backoff_base_seconds=settings.outbox_backoff_base_seconds,
+        poll_interval_seconds=settings.outbox_poll_interval_seconds,
+        batch_size=settings.outbox_batch_size,
+    )
+
+
 def settings_dependency() -> Settings:
     return get_settings()
 
@@ -58,9 +154,37 @@ def renderer_dependency() -> EmailRenderer:
     return get_renderer()
 
 
-def openai_dependency(settings: Settings = Depends(settings_dependency)) -> OpenAIClient:
-    return get_openai_service(settings)
+def brand_context_dependency() -> BrandContextCache:
+    return get_brand_context_cache()
+
+
+def openai_dependency() -> OpenAIClient:
+    return get_openai_service()
+
+
+def copy_batcher_dependency() -> CopyBatcher:
+    return get_copy_batcher()
+
+
+def gmail_dependency() -> GmailClient:
+    return get_gmail_service()
+
+
+def body_store_dependency() -> EmailBodyStore:
+    return get_body_store()
+
+
+def profiler_dependency() -> ProfilerControl:
+    return get_profiler()
+
+
+def generation_worker_dependency() -> GenerationWorker:
+    return get_generation_worker()
+
+
+def gmail_registry_dependency() -> GmailClientRegistry:
+    return get_gmail_registry()
 
 
-def gmail_dependency(settings: Settings = Depends(settings_dependency)) -> GmailClient:
-    return get_gmail_service(settings)
+def outbox_dependency() -> OutboxDispatcher:
+    return get_outbox_dispatcher()
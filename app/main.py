@@ -3,25 +3,52 @@ from __future__ import annotations
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from app.config import get_settings
 from app.database import init_db
-from app.routers import brands, campaigns, features, leads, templates
+from app.dependencies import get_copy_batcher, get_generation_worker, get_outbox_dispatcher, get_profiler
+from app.routers import admin, brands, campaigns, features, leads, templates, usage
+from app.services.metrics import CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.services.profiling import ServerTimingMiddleware
 
 app = FastAPI(title="Sales Mailer Portal", version="0.1.0")
 
 BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+page_templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 static_dir = BASE_DIR / "static"
 if static_dir.exists():
     app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+if get_settings().metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+if get_settings().server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware, profiler=get_profiler())
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    settings = get_settings()
+    leads.requeue_stale_generation_jobs(settings.generation_stale_after_seconds)
+    get_generation_worker().start(leads.run_generation_job, leads.pending_generation_jobs)
+    if settings.outbox_enabled:
+        outbox = get_outbox_dispatcher()
+        outbox.requeue_stale(settings.outbox_stale_after_seconds)
+        outbox.start()
+
+
+@app.on_event("shutdown")
+async def drain_copy_batches() -> None:
+    # Runs on the event loop that owns the batcher's timers and dispatch tasks.
+    await get_copy_batcher().aclose()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    get_generation_worker().shutdown(wait=False)
+    get_outbox_dispatcher().stop()
 
 
 app.include_router(brands.router, prefix="/brands", tags=["brands"])
@@ -29,8 +56,17 @@ app.include_router(features.router, prefix="/features", tags=["features"])
 app.include_router(templates.router, prefix="/templates", tags=["templates"])
 app.include_router(campaigns.router, prefix="/campaigns", tags=["campaigns"])
 app.include_router(leads.router, prefix="/leads", tags=["leads"])
+app.include_router(usage.router, prefix="/usage", tags=["usage"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus text exposition of pipeline stage latencies and request counters."""
+
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
 
 
 @app.get("/", response_class=HTMLResponse)
 def root(request: Request) -> HTMLResponse:
-    return templates.TemplateResponse("index.html", {"request": request})
+    return page_templates.TemplateResponse("index.html", {"request": request})
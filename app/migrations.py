@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Column, inspect, literal, text
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlmodel import SQLModel
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(column: Column, dialect: Dialect) -> str:
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = literal(default.arg, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        ddl += f" DEFAULT {value}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    # Columns without a scalar default are added as nullable: existing rows
+    # have no value to backfill them with.
+    return ddl
+
+
+def _upgrade_table(connection: Connection, table_name: str) -> list[str]:
+    table = SQLModel.metadata.tables[table_name]
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    applied: list[str] = []
+
+    existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+    for column in table.columns:
+        if column.name in existing_columns:
+            continue
+        statement = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {_column_ddl(column, connection.dialect)}"
+        connection.execute(text(statement))
+        applied.append(statement)
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+    for index in sorted(table.indexes, key=lambda item: item.name or ""):
+        if index.name in existing_indexes:
+            continue
+        index.create(connection, checkfirst=True)
+        applied.append(f"CREATE {'UNIQUE ' if index.unique else ''}INDEX {index.name}")
+    return applied
+
+
+def upgrade_schema(bind: Engine) -> list[str]:
+    """Add missing columns and indexes to existing tables; returns the applied changes.
+
+    ``create_all`` only creates missing tables, so fields and indexes added to a
+    model never reach an existing database without this. Upgrades are additive
+    only: nothing is dropped or altered.
+    """
+
+    applied: list[str] = []
+    with bind.begin() as connection:
+        existing_tables = set(inspect(connection).get_table_names())
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name in existing_tables:
+                applied.extend(_upgrade_table(connection, table.name))
+    for change in applied:
+        logger.info("Schema upgrade applied: %s", change)
+    return applied
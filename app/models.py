@@ -1,9 +1,7 @@
-from __future__ import annotations
-
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Column, JSON, event
+from sqlalchemy import Column, Index, JSON, LargeBinary, event
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -23,10 +21,15 @@ class Brand(TimestampMixin, SQLModel, table=True):
     default_subject: Optional[str] = Field(default=None)
     default_tone: Optional[str] = Field(default=None)
     openai_style_instructions: Optional[str] = Field(default=None)
+    openai_cache_enabled: bool = Field(default=True)
+    gmail_user_id: Optional[str] = Field(default=None)
+    gmail_refresh_token: Optional[str] = Field(default=None)
+    gmail_client_id: Optional[str] = Field(default=None)
+    gmail_client_secret: Optional[str] = Field(default=None)
 
-    templates: list[EmailTemplate] = Relationship(back_populates="brand")
-    brand_features: list[BrandFeature] = Relationship(back_populates="brand")
-    campaigns: list[Campaign] = Relationship(back_populates="brand")
+    templates: list["EmailTemplate"] = Relationship(back_populates="brand")
+    brand_features: list["BrandFeature"] = Relationship(back_populates="brand")
+    campaigns: list["Campaign"] = Relationship(back_populates="brand")
 
 
 class Feature(TimestampMixin, SQLModel, table=True):
@@ -37,7 +40,7 @@ class Feature(TimestampMixin, SQLModel, table=True):
     short_description: str
     long_description: Optional[str] = Field(default=None)
 
-    brand_links: list[BrandFeature] = Relationship(back_populates="feature")
+    brand_links: list["BrandFeature"] = Relationship(back_populates="feature")
 
 
 class BrandFeature(TimestampMixin, SQLModel, table=True):
@@ -50,13 +53,14 @@ class BrandFeature(TimestampMixin, SQLModel, table=True):
     asset_url: Optional[str] = Field(default=None)
     cta_text: Optional[str] = Field(default=None)
 
-    brand: Brand = Relationship(back_populates="brand_features")
-    feature: Feature = Relationship(back_populates="brand_links")
-    campaign_links: list[CampaignFeature] = Relationship(back_populates="brand_feature")
+    brand: "Brand" = Relationship(back_populates="brand_features")
+    feature: "Feature" = Relationship(back_populates="brand_links")
+    campaign_links: list["CampaignFeature"] = Relationship(back_populates="brand_feature")
 
 
 class EmailTemplate(TimestampMixin, SQLModel, table=True):
     __tablename__ = "email_templates"
+    __table_args__ = (Index("ix_email_templates_brand_default_updated", "brand_id", "is_default", "updated_at"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     brand_id: int = Field(foreign_key="brands.id")
@@ -65,11 +69,12 @@ class EmailTemplate(TimestampMixin, SQLModel, table=True):
     html_body: str
     is_default: bool = Field(default=False)
 
-    brand: Brand = Relationship(back_populates="templates")
+    brand: "Brand" = Relationship(back_populates="templates")
 
 
 class Campaign(TimestampMixin, SQLModel, table=True):
     __tablename__ = "campaigns"
+    __table_args__ = (Index("ix_campaigns_brand_active_updated", "brand_id", "is_active", "updated_at"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     brand_id: int = Field(foreign_key="brands.id")
@@ -78,13 +83,14 @@ class Campaign(TimestampMixin, SQLModel, table=True):
     tone_override: Optional[str] = Field(default=None)
     is_active: bool = Field(default=False, index=True)
 
-    brand: Brand = Relationship(back_populates="campaigns")
-    features: list[CampaignFeature] = Relationship(back_populates="campaign")
-    generated_emails: list[GeneratedEmail] = Relationship(back_populates="campaign")
+    brand: "Brand" = Relationship(back_populates="campaigns")
+    features: list["CampaignFeature"] = Relationship(back_populates="campaign")
+    generated_emails: list["GeneratedEmail"] = Relationship(back_populates="campaign")
 
 
 class CampaignFeature(TimestampMixin, SQLModel, table=True):
     __tablename__ = "campaign_features"
+    __table_args__ = (Index("ix_campaign_features_campaign_sort", "campaign_id", "sort_order"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     campaign_id: int = Field(foreign_key="campaigns.id")
@@ -92,12 +98,13 @@ class CampaignFeature(TimestampMixin, SQLModel, table=True):
     sort_order: int = Field(default=0, index=True)
     highlight_text: Optional[str] = Field(default=None)
 
-    campaign: Campaign = Relationship(back_populates="features")
-    brand_feature: BrandFeature = Relationship(back_populates="campaign_links")
+    campaign: "Campaign" = Relationship(back_populates="features")
+    brand_feature: "BrandFeature" = Relationship(back_populates="campaign_links")
 
 
 class Lead(TimestampMixin, SQLModel, table=True):
     __tablename__ = "leads"
+    __table_args__ = (Index("ix_leads_brand_created", "brand_id", "created_at"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     brand_id: int = Field(foreign_key="brands.id")
@@ -107,26 +114,101 @@ class Lead(TimestampMixin, SQLModel, table=True):
     company: Optional[str] = Field(default=None)
     job_title: Optional[str] = Field(default=None)
     phone_number: Optional[str] = Field(default=None)
-    metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    # ``metadata`` is reserved on SQLModel classes, so the attribute is renamed but the column keeps its name.
+    extra: Optional[dict] = Field(default=None, sa_column=Column("metadata", JSON, nullable=True))
+
+    generated_emails: list["GeneratedEmail"] = Relationship(back_populates="lead")
+
+
+class EmailBody(SQLModel, table=True):
+    """Compressed rendered HTML, stored once per distinct body and keyed by its SHA-256."""
 
-    generated_emails: list[GeneratedEmail] = Relationship(back_populates="lead")
+    __tablename__ = "email_bodies"
+
+    digest: str = Field(primary_key=True)
+    codec: str
+    size: int
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
 class GeneratedEmail(TimestampMixin, SQLModel, table=True):
     __tablename__ = "generated_emails"
+    __table_args__ = (Index("ix_generated_emails_status_next_attempt", "status", "next_attempt_at"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    lead_id: int = Field(foreign_key="leads.id")
+    lead_id: int = Field(foreign_key="leads.id", index=True)
     campaign_id: Optional[int] = Field(default=None, foreign_key="campaigns.id")
     template_id: Optional[int] = Field(default=None, foreign_key="email_templates.id")
     subject: str
+    # Empty once the body lives in ``email_bodies``; older rows may still carry it inline.
     html_body: str
-    status: str = Field(default="draft")
+    body_digest: Optional[str] = Field(default=None, foreign_key="email_bodies.digest", index=True)
+    status: str = Field(default="draft", index=True)
+    send_attempts: int = Field(default=0)
+    next_attempt_at: Optional[datetime] = Field(default=None)
+    last_error: Optional[str] = Field(default=None)
     sent_at: Optional[datetime] = Field(default=None)
-    metadata: Optional[dict] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    extra: Optional[dict] = Field(default=None, sa_column=Column("metadata", JSON, nullable=True))
+
+    lead: "Lead" = Relationship(back_populates="generated_emails")
+    campaign: Optional["Campaign"] = Relationship(back_populates="generated_emails")
+
+
+class GenerationJob(TimestampMixin, SQLModel, table=True):
+    __tablename__ = "generation_jobs"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    lead_id: int = Field(foreign_key="leads.id", index=True)
+    status: str = Field(default="queued", index=True)
+    attempts: int = Field(default=0)
+    generated_email_id: Optional[int] = Field(default=None, foreign_key="generated_emails.id")
+    error: Optional[str] = Field(default=None)
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+
+
+class IngestionKey(TimestampMixin, SQLModel, table=True):
+    __tablename__ = "ingestion_keys"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key: str = Field(index=True, unique=True)
+    lead_id: Optional[int] = Field(default=None, foreign_key="leads.id")
 
-    lead: Lead = Relationship(back_populates="generated_emails")
-    campaign: Optional[Campaign] = Relationship(back_populates="generated_emails")
+
+class UsageEvent(SQLModel, table=True):
+    """Token usage of one generated email, written in the same transaction as the email."""
+
+    __tablename__ = "usage_events"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    generated_email_id: int = Field(foreign_key="generated_emails.id", index=True)
+    brand_id: int = Field(foreign_key="brands.id")
+    campaign_id: Optional[int] = Field(default=None, foreign_key="campaigns.id")
+    model: str
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+    cache_hit: bool = Field(default=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class UsageDaily(SQLModel, table=True):
+    """Running usage totals per day, brand, campaign and model, incremented as events are written."""
+
+    __tablename__ = "usage_daily"
+    __table_args__ = (Index("ix_usage_daily_key", "day", "brand_id", "campaign_id", "model", unique=True),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    day: date
+    brand_id: int = Field(foreign_key="brands.id")
+    # 0 rather than NULL for emails without a campaign, so the unique key also covers them.
+    campaign_id: int = Field(default=0)
+    model: str
+    requests: int = Field(default=0)
+    cache_hits: int = Field(default=0)
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
 
 def _set_timestamp(mapper, connection, target) -> None:  # type: ignore[no-untyped-def]
@@ -134,6 +216,17 @@ def _set_timestamp(mapper, connection, target) -> None:  # type: ignore[no-untyp
         target.updated_at = datetime.utcnow()
 
 
-for model in (Brand, Feature, BrandFeature, EmailTemplate, Campaign, CampaignFeature, Lead, GeneratedEmail):
+for model in (
+    Brand,
+    Feature,
+    BrandFeature,
+    EmailTemplate,
+    Campaign,
+    CampaignFeature,
+    Lead,
+    GeneratedEmail,
+    GenerationJob,
+    IngestionKey,
+):
     event.listen(model, "before_update", _set_timestamp)
 
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from typing import Annotated, Any, Optional
+
+from fastapi import Depends, HTTPException, Query, status
+from sqlalchemy import Column
+from sqlmodel import Session, SQLModel
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    after_id: int | None = None
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = decoded.partition(":")
+        if prefix != "id":
+            raise ValueError(decoded)
+        return int(value)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from None
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+) -> PageParams:
+    return PageParams(limit=limit, after_id=decode_cursor(cursor) if cursor else None)
+
+
+PageDep = Annotated[PageParams, Depends(page_params)]
+
+
+def list_columns(model: type[SQLModel], *, exclude: set[str]) -> list[Column]:
+    """Table columns of ``model`` minus ``exclude``, for listings that skip large fields."""
+
+    return [column for column in model.__table__.columns if column.key not in exclude]
+
+
+def paginate(session: Session, statement, id_column, page: PageParams) -> dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Run ``statement`` as one keyset page ordered by ``id_column``.
+
+    Pages seek past the last id instead of using OFFSET, so every page costs one
+    index range scan no matter how deep the client has paged.
+    """
+
+    if page.after_id is not None:
+        statement = statement.where(id_column > page.after_id)
+    rows = list(session.exec(statement.order_by(None).order_by(id_column).limit(page.limit + 1)).all())
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.dependencies import profiler_dependency
+from app.schemas import ProfilingStatus, ProfilingUpdate
+from app.services.profiling import ProfilerControl
+
+router = APIRouter()
+
+
+@router.get("/profiling", response_model=ProfilingStatus)
+def get_profiling(profiler: ProfilerControl = Depends(profiler_dependency)) -> dict:
+    return profiler.status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus)
+def update_profiling(payload: ProfilingUpdate, profiler: ProfilerControl = Depends(profiler_dependency)) -> dict:
+    """Switch request profiling on or off and change the sampled share of requests without a restart."""
+
+    if payload.enabled is not None:
+        profiler.enabled = payload.enabled
+    if payload.sample_rate is not None:
+        profiler.sample_rate = payload.sample_rate
+    return profiler.status()
@@ -4,15 +4,17 @@ from fastapi import APIRouter, HTTPException, status
 from sqlmodel import select
 
 from app.database import SessionDep
+from app.dependencies import get_brand_context_cache
 from app.models import Brand
-from app.schemas import BrandCreate, BrandRead, BrandUpdate
+from app.pagination import PageDep, paginate
+from app.schemas import BrandCreate, BrandRead, BrandUpdate, Page
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[BrandRead])
-def list_brands(session: SessionDep) -> list[Brand]:
-    return session.exec(select(Brand)).all()
+@router.get("/", response_model=Page[BrandRead])
+def list_brands(session: SessionDep, page: PageDep) -> dict:
+    return paginate(session, select(Brand), Brand.id, page)
 
 
 @router.post("/", response_model=BrandRead, status_code=status.HTTP_201_CREATED)
@@ -20,7 +22,7 @@ def create_brand(payload: BrandCreate, session: SessionDep) -> Brand:
     brand = Brand(**payload.model_dump())
     session.add(brand)
     session.commit()
-    session.refresh(brand)
+    get_brand_context_cache().invalidate(brand.id)
     return brand
 
 
@@ -43,7 +45,7 @@ def update_brand(brand_id: int, payload: BrandUpdate, session: SessionDep) -> Br
 
     session.add(brand)
     session.commit()
-    session.refresh(brand)
+    get_brand_context_cache().invalidate(brand.id)
     return brand
 
 
@@ -55,3 +57,4 @@ def delete_brand(brand_id: int, session: SessionDep) -> None:
 
     session.delete(brand)
     session.commit()
+    get_brand_context_cache().invalidate(brand_id)
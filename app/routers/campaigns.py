@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, status
+from sqlalchemy.orm import joinedload
 from sqlmodel import select
 
 from app.database import SessionDep
-from app.models import Brand, Campaign, CampaignFeature
+from app.dependencies import get_brand_context_cache
+from app.models import Brand, BrandFeature, Campaign, CampaignFeature
+from app.pagination import PageDep, paginate
 from app.schemas import (
     CampaignCreate,
     CampaignFeatureCreate,
@@ -12,14 +17,35 @@ from app.schemas import (
     CampaignFeatureUpdate,
     CampaignRead,
     CampaignUpdate,
+    Page,
 )
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[CampaignRead])
-def list_campaigns(session: SessionDep) -> list[Campaign]:
-    return session.exec(select(Campaign)).all()
+def _feature_graph():  # type: ignore[no-untyped-def]
+    # brand_feature and feature are many-to-one, so the whole response graph loads in the same SELECT.
+    # Built per query: creating loader options at import time would configure the mappers on import.
+    return joinedload(CampaignFeature.brand_feature, innerjoin=True).joinedload(BrandFeature.feature, innerjoin=True)
+
+
+def _load_campaign_feature(session: SessionDep, campaign_feature_id: int) -> CampaignFeature | None:
+    return session.get(CampaignFeature, campaign_feature_id, options=[_feature_graph()], populate_existing=True)
+
+
+@router.get("/", response_model=Page[CampaignRead])
+def list_campaigns(
+    session: SessionDep,
+    page: PageDep,
+    brand_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+) -> dict:
+    statement = select(Campaign)
+    if brand_id is not None:
+        statement = statement.where(Campaign.brand_id == brand_id)
+    if is_active is not None:
+        statement = statement.where(Campaign.is_active == is_active)
+    return paginate(session, statement, Campaign.id, page)
 
 
 @router.post("/", response_model=CampaignRead, status_code=status.HTTP_201_CREATED)
@@ -38,7 +64,7 @@ def create_campaign(payload: CampaignCreate, session: SessionDep) -> Campaign:
     campaign = Campaign(**payload.model_dump())
     session.add(campaign)
     session.commit()
-    session.refresh(campaign)
+    get_brand_context_cache().invalidate(campaign.brand_id)
     return campaign
 
 
@@ -62,7 +88,7 @@ def update_campaign(campaign_id: int, payload: CampaignUpdate, session: SessionD
 
     session.add(campaign)
     session.commit()
-    session.refresh(campaign)
+    get_brand_context_cache().invalidate(campaign.brand_id)
     return campaign
 
 
@@ -78,18 +104,15 @@ def add_campaign_feature(campaign_id: int, payload: CampaignFeatureCreate, sessi
     campaign_feature = CampaignFeature(**payload.model_dump())
     session.add(campaign_feature)
     session.commit()
-    session.refresh(campaign_feature)
-    session.refresh(campaign_feature, attribute_names=["brand_feature"])
-    if campaign_feature.brand_feature:
-        session.refresh(campaign_feature.brand_feature, attribute_names=["feature"])
-    return campaign_feature
+    get_brand_context_cache().invalidate(campaign.brand_id)
+    return _load_campaign_feature(session, campaign_feature.id)
 
 
 @router.patch("/features/{campaign_feature_id}", response_model=CampaignFeatureRead)
 def update_campaign_feature(
     campaign_feature_id: int, payload: CampaignFeatureUpdate, session: SessionDep
 ) -> CampaignFeature:
-    campaign_feature = session.get(CampaignFeature, campaign_feature_id)
+    campaign_feature = _load_campaign_feature(session, campaign_feature_id)
     if not campaign_feature:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign feature not found")
 
@@ -98,22 +121,20 @@ def update_campaign_feature(
 
     session.add(campaign_feature)
     session.commit()
-    session.refresh(campaign_feature)
-    session.refresh(campaign_feature, attribute_names=["brand_feature"])
-    if campaign_feature.brand_feature:
-        session.refresh(campaign_feature.brand_feature, attribute_names=["feature"])
+    # Campaign features do not carry the brand id; writes are rare enough to drop every snapshot.
+    get_brand_context_cache().invalidate()
     return campaign_feature
 
 
 @router.get("/{campaign_id}/features", response_model=list[CampaignFeatureRead])
 def list_campaign_features(campaign_id: int, session: SessionDep) -> list[CampaignFeature]:
-    statement = select(CampaignFeature).where(CampaignFeature.campaign_id == campaign_id)
-    results = session.exec(statement).all()
-    for result in results:
-        session.refresh(result, attribute_names=["brand_feature"])
-        if result.brand_feature:
-            session.refresh(result.brand_feature, attribute_names=["feature"])
-    return results
+    statement = (
+        select(CampaignFeature)
+        .where(CampaignFeature.campaign_id == campaign_id)
+        .options(_feature_graph())
+        .order_by(CampaignFeature.sort_order, CampaignFeature.id)
+    )
+    return session.exec(statement).all()
 
 
 @router.delete("/features/{campaign_feature_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -124,3 +145,4 @@ def delete_campaign_feature(campaign_feature_id: int, session: SessionDep) -> No
 
     session.delete(campaign_feature)
     session.commit()
+    get_brand_context_cache().invalidate()
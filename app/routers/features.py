@@ -1,24 +1,37 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException, status
+from sqlalchemy.orm import joinedload
 from sqlmodel import select
 
 from app.database import SessionDep
+from app.dependencies import get_brand_context_cache
 from app.models import BrandFeature, Feature
+from app.pagination import PageDep, paginate
 from app.schemas import (
     BrandFeatureCreate,
     BrandFeatureRead,
     BrandFeatureUpdate,
     FeatureCreate,
     FeatureRead,
+    Page,
 )
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[FeatureRead])
-def list_features(session: SessionDep) -> list[Feature]:
-    return session.exec(select(Feature)).all()
+def _feature_graph():  # type: ignore[no-untyped-def]
+    # Built per query: creating loader options at import time would configure the mappers on import.
+    return joinedload(BrandFeature.feature, innerjoin=True)
+
+
+def _load_brand_feature(session: SessionDep, brand_feature_id: int) -> BrandFeature | None:
+    return session.get(BrandFeature, brand_feature_id, options=[_feature_graph()], populate_existing=True)
+
+
+@router.get("/", response_model=Page[FeatureRead])
+def list_features(session: SessionDep, page: PageDep) -> dict:
+    return paginate(session, select(Feature), Feature.id, page)
 
 
 @router.post("/", response_model=FeatureRead, status_code=status.HTTP_201_CREATED)
@@ -26,7 +39,6 @@ def create_feature(payload: FeatureCreate, session: SessionDep) -> Feature:
     feature = Feature(**payload.model_dump())
     session.add(feature)
     session.commit()
-    session.refresh(feature)
     return feature
 
 
@@ -35,14 +47,13 @@ def attach_feature_to_brand(payload: BrandFeatureCreate, session: SessionDep) ->
     brand_feature = BrandFeature(**payload.model_dump())
     session.add(brand_feature)
     session.commit()
-    session.refresh(brand_feature)
-    session.refresh(brand_feature, attribute_names=["feature"])
-    return brand_feature
+    get_brand_context_cache().invalidate(brand_feature.brand_id)
+    return _load_brand_feature(session, brand_feature.id)
 
 
 @router.patch("/brand/{brand_feature_id}", response_model=BrandFeatureRead)
 def update_brand_feature(brand_feature_id: int, payload: BrandFeatureUpdate, session: SessionDep) -> BrandFeature:
-    brand_feature = session.get(BrandFeature, brand_feature_id)
+    brand_feature = _load_brand_feature(session, brand_feature_id)
     if not brand_feature:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Brand feature not found")
 
@@ -51,18 +62,16 @@ def update_brand_feature(brand_feature_id: int, payload: BrandFeatureUpdate, ses
 
     session.add(brand_feature)
     session.commit()
-    session.refresh(brand_feature)
-    session.refresh(brand_feature, attribute_names=["feature"])
+    get_brand_context_cache().invalidate(brand_feature.brand_id)
     return brand_feature
 
 
 @router.get("/brand/{brand_id}", response_model=list[BrandFeatureRead])
 def list_brand_features(brand_id: int, session: SessionDep) -> list[BrandFeature]:
-    statement = select(BrandFeature).where(BrandFeature.brand_id == brand_id)
-    results = session.exec(statement).all()
-    for result in results:
-        session.refresh(result, attribute_names=["feature"])
-    return results
+    statement = (
+        select(BrandFeature).where(BrandFeature.brand_id == brand_id).options(_feature_graph()).order_by(BrandFeature.id)
+    )
+    return session.exec(statement).all()
 
 
 @router.delete("/brand/{brand_feature_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -71,5 +80,7 @@ def delete_brand_feature(brand_feature_id: int, session: SessionDep) -> None:
     if not brand_feature:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Brand feature not found")
 
+    brand_id = brand_feature.brand_id
     session.delete(brand_feature)
     session.commit()
+    get_brand_context_cache().invalidate(brand_id)
@@ -1,22 +1,84 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from sqlmodel import select
-
-from app.database import SessionDep
-from app.dependencies import gmail_dependency, openai_dependency, renderer_dependency
-from app.models import Brand, BrandFeature, Campaign, CampaignFeature, EmailTemplate, GeneratedEmail, Lead
-from app.schemas import EmailPreview, EmailSendRequest, GeneratedEmailRead, LeadCreate, LeadRead
-from app.services.gmail_client import GmailClient
+from sqlmodel import delete, select, update
+
+from app.config import Settings
+from app.database import SessionDep, session_scope
+from app.dependencies import (
+    body_store_dependency,
+    brand_context_dependency,
+    copy_batcher_dependency,
+    generation_worker_dependency,
+    get_body_store,
+    get_brand_context_cache,
+    get_openai_service,
+    get_renderer,
+    gmail_registry_dependency,
+    openai_dependency,
+    outbox_dependency,
+    renderer_dependency,
+    settings_dependency,
+)
+from app.models import (
+    Brand,
+    BrandFeature,
+    Campaign,
+    CampaignFeature,
+    EmailTemplate,
+    GeneratedEmail,
+    GenerationJob,
+    IngestionKey,
+    Lead,
+)
+from app.pagination import PageDep, list_columns, paginate
+from app.schemas import (
+    EmailPreview,
+    EmailSendBatchRequest,
+    EmailSendBatchResult,
+    EmailSendRequest,
+    EmailStorageReport,
+    GeneratedEmailListItem,
+    GenerationJobRead,
+    LeadAccepted,
+    LeadBatchItemResult,
+    LeadBatchResult,
+    LeadCreate,
+    LeadRead,
+    Page,
+)
+from app.services.body_store import EmailBodyStore
+from app.services.brand_context import BrandContext, BrandContextCache
+from app.services.copy_batcher import CopyBatcher
+from app.services.generation_worker import GenerationWorker
+from app.services.idempotency import IngestionKeys, ingestion_keys
+from app.services.gmail_registry import GmailClientRegistry, mailbox_key
+from app.services.lead_export import EXPORT_MEDIA_TYPES, ExportFilters, stream_export
+from app.services.lead_search import fts_enabled, lead_search_statement
+from app.services.metrics import record_copy, stage
 from app.services.openai_client import OpenAIClient
+from app.services.outbox import OutboxDispatcher
+from app.services.usage import record_usage
 from app.services.email_renderer import EmailRenderer, RenderContext
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Emails a client may send or queue; anything else is queued, in flight or already sent.
+SENDABLE_STATUSES = ("draft", "failed")
+
 
 DEFAULT_TEMPLATE = """
 <h1>{{ brand.name }} - Confirmation</h1>
@@ -32,99 +94,191 @@ DEFAULT_TEMPLATE = """
 """
 
 
-def _get_brand(session: SessionDep, slug: str) -> Brand:
-    statement = select(Brand).where(Brand.slug == slug)
-    brand = session.exec(statement).first()
-    if not brand:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Brand not found")
-    return brand
-
-
-def _get_active_campaign(session: SessionDep, brand: Brand) -> Optional[Campaign]:
-    statement = (
+def active_campaign_statement(brand_id: int):  # type: ignore[no-untyped-def]
+    return (
         select(Campaign)
-        .where(Campaign.brand_id == brand.id)
+        .where(Campaign.brand_id == brand_id)
         .order_by(Campaign.is_active.desc(), Campaign.updated_at.desc())
     )
-    return session.exec(statement).first()
 
 
-def _get_campaign_features(session: SessionDep, campaign: Campaign | None) -> list[CampaignFeature]:
-    if not campaign:
-        return []
-    statement = (
+def campaign_features_statement(campaign_id: int):  # type: ignore[no-untyped-def]
+    return (
         select(CampaignFeature)
-        .where(CampaignFeature.campaign_id == campaign.id)
+        .where(CampaignFeature.campaign_id == campaign_id)
         .options(
             selectinload(CampaignFeature.brand_feature).selectinload(BrandFeature.feature)
         )
         .order_by(CampaignFeature.sort_order)
     )
-    return session.exec(statement).all()
 
 
-def _get_brand_template(session: SessionDep, brand: Brand) -> EmailTemplate:
-    statement = (
+def brand_template_statement(brand_id: int):  # type: ignore[no-untyped-def]
+    return (
         select(EmailTemplate)
-        .where(EmailTemplate.brand_id == brand.id)
+        .where(EmailTemplate.brand_id == brand_id)
         .order_by(EmailTemplate.is_default.desc(), EmailTemplate.updated_at.desc())
     )
-    template = session.exec(statement).first()
+
+
+def lead_emails_statement(lead_id: int, *, include_body: bool = True):  # type: ignore[no-untyped-def]
+    entities = [GeneratedEmail] if include_body else list_columns(GeneratedEmail, exclude={"html_body"})
+    return select(*entities).where(GeneratedEmail.lead_id == lead_id).order_by(GeneratedEmail.id)
+
+
+def _get_active_campaign(session: SessionDep, brand: Brand) -> Optional[Campaign]:
+    return session.exec(active_campaign_statement(brand.id)).first()
+
+
+def _get_campaign_features(session: SessionDep, campaign: Campaign | None) -> list[CampaignFeature]:
+    if not campaign:
+        return []
+    return session.exec(campaign_features_statement(campaign.id)).all()
+
+
+def _get_brand_template(session: SessionDep, brand: Brand) -> EmailTemplate:
+    template = session.exec(brand_template_statement(brand.id)).first()
     if template:
         return template
     return EmailTemplate(brand_id=brand.id, name="Default", html_body=DEFAULT_TEMPLATE, is_default=True)
 
 
+def _detach_context(session: SessionDep, context: BrandContext) -> BrandContext:
+    objects: list[Any] = [context.brand, context.campaign, context.template]
+    for campaign_feature in context.features:
+        objects.extend([campaign_feature, campaign_feature.brand_feature, campaign_feature.brand_feature.feature])
+    for obj in objects:
+        if obj is not None and obj in session:
+            session.expunge(obj)
+    return context
+
+
+def _load_brand_context(session: SessionDep, brand: Brand | None) -> BrandContext | None:
+    if not brand:
+        return None
+
+    # A brand without templates renders the built-in default, which is never persisted.
+    with stage("brand_lookup"):
+        campaign = _get_active_campaign(session, brand)
+        template = _get_brand_template(session, brand)
+    with stage("feature_load"):
+        features = _get_campaign_features(session, campaign)
+    context = BrandContext(brand=brand, campaign=campaign, features=features, template=template)
+    return _detach_context(session, context)
+
+
+def _get_brand_context(session: SessionDep, cache: BrandContextCache, slug: str) -> BrandContext:
+    context = cache.get(
+        ("slug", slug),
+        lambda: _load_brand_context(session, session.exec(select(Brand).where(Brand.slug == slug)).first()),
+    )
+    if not context:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Brand not found")
+    return context
+
+
+def _get_brand_context_by_id(session: SessionDep, cache: BrandContextCache, brand_id: int) -> BrandContext | None:
+    return cache.get(("id", brand_id), lambda: _load_brand_context(session, session.get(Brand, brand_id)))
+
+
+def _render_email(
+    *,
+    lead: Lead,
+    context: BrandContext,
+    renderer: EmailRenderer,
+    openai_notes: dict[str, Any],
+) -> GeneratedEmail:
+    render_context = RenderContext(
+        lead=lead,
+        brand=context.brand,
+        campaign=context.campaign,
+        features=context.features,
+        tone=context.tone,
+        openai_notes=openai_notes,
+    )
+    with stage("render"):
+        return renderer.render(context.template, render_context)
+
+
 def _generate_email(
     *,
     session: SessionDep,
     lead: Lead,
-    brand: Brand,
-    campaign: Campaign | None,
+    context: BrandContext,
     renderer: EmailRenderer,
     openai_client: OpenAIClient,
 ) -> GeneratedEmail:
-    campaign_features = _get_campaign_features(session, campaign)
+    with stage("openai"):
+        openai_notes = openai_client.generate_highlight_copy(
+            brand=context.brand,
+            lead=lead,
+            features=context.features,
+            tone=context.tone,
+        )
+    record_copy(openai_notes)
+    generated = _render_email(lead=lead, context=context, renderer=renderer, openai_notes=openai_notes)
+    return _save_generated(session, lead, generated)
 
-    openai_notes = openai_client.generate_highlight_copy(
-        brand=brand,
-        lead=lead,
-        features=campaign_features,
-        tone=campaign.tone_override if campaign else brand.default_tone,
-    )
 
-    template = _get_brand_template(session, brand)
-    if template.id is None:
-        session.add(template)
-        session.commit()
-        session.refresh(template)
+async def _agenerate_email(
+    *,
+    session: SessionDep,
+    lead: Lead,
+    context: BrandContext,
+    renderer: EmailRenderer,
+    openai_client: OpenAIClient | CopyBatcher,
+    claimed: str | None = None,
+) -> GeneratedEmail:
+    with stage("openai"):
+        openai_notes = await openai_client.agenerate_highlight_copy(
+            brand=context.brand,
+            lead=lead,
+            features=context.features,
+            tone=context.tone,
+        )
+    record_copy(openai_notes)
+    generated = _render_email(lead=lead, context=context, renderer=renderer, openai_notes=openai_notes)
+    return await run_in_threadpool(_store_generated, session, lead, generated, claimed)
 
-    context = RenderContext(
-        lead=lead,
-        brand=brand,
-        campaign=campaign,
-        features=campaign_features,
-        tone=campaign.tone_override if campaign else brand.default_tone,
-        openai_notes=openai_notes,
-    )
 
-    generated = renderer.render(template, context)
-    session.add(generated)
+def _release_connection(session: SessionDep) -> None:
+    # Ends the read transaction so its pooled connection is not held while the model call is
+    # awaited; otherwise threadpool threads can all block on a pool drained by idle handlers.
     session.commit()
-    session.refresh(generated)
+
+
+def _save_generated(session: SessionDep, lead: Lead, generated: GeneratedEmail) -> GeneratedEmail:
+    """Flush the email (and its lead, if new) with its usage; the caller commits."""
+
+    with stage("db_write"):
+        if lead.id is None:
+            session.add(lead)
+            session.flush()
+        generated.lead_id = lead.id
+        get_body_store().externalize(session, [generated])
+        record_usage(session, [(lead.brand_id, generated)])
     return generated
 
 
-@router.post("/", response_model=LeadRead, status_code=status.HTTP_201_CREATED)
-def ingest_lead(
-    payload: LeadCreate,
-    session: SessionDep,
-    renderer: EmailRenderer = Depends(renderer_dependency),
-    openai_client: OpenAIClient = Depends(openai_dependency),
-) -> Lead:
-    brand = _get_brand(session, payload.brand_slug)
+def _commit(session: SessionDep) -> None:
+    # Handlers commit before responding; a commit left to the dependency teardown
+    # runs after the response is sent, so its failure would never reach the client.
+    with stage("db_commit"):
+        session.commit()
 
-    lead = Lead(
+
+def _store_generated(
+    session: SessionDep, lead: Lead, generated: GeneratedEmail, claimed: str | None = None
+) -> GeneratedEmail:
+    """Save and commit in one threadpool call, so the connection is never held across an await."""
+
+    _save_generated(session, lead, generated)
+    _commit_ingest(session, claimed, lead.id)
+    return generated
+
+
+def _build_lead(payload: LeadCreate, brand: Brand) -> Lead:
+    return Lead(
         brand_id=brand.id,
         email=payload.email,
         first_name=payload.first_name,
@@ -132,25 +286,447 @@ def ingest_lead(
         company=payload.company,
         job_title=payload.job_title,
         phone_number=payload.phone_number,
-        metadata=payload.metadata,
+        extra=payload.metadata,
+    )
+
+
+def _ingestion_keys(payload: LeadCreate, idempotency_key: str | None, settings: Settings) -> IngestionKeys | None:
+    return ingestion_keys(
+        brand_slug=payload.brand_slug,
+        email=payload.email,
+        idempotency_key=idempotency_key,
+        window_seconds=settings.ingest_dedup_window_seconds,
+        now=datetime.utcnow(),
+    )
+
+
+def _claim_ingestion(
+    session: SessionDep, keys: IngestionKeys, claim_timeout_seconds: int
+) -> tuple[str | None, int | None]:
+    """Claim a submission's key; returns ``(claimed_key, None)`` or ``(None, original_lead_id)``.
+
+    The claim is committed on its own so concurrent duplicates collide on the
+    unique key before any of them pays for a model call. A duplicate of a
+    submission that is still in flight gets a 409 unless the original claim is
+    older than ``claim_timeout_seconds`` (e.g. its process crashed), in which
+    case it takes the claim over.
+    """
+
+    rows = session.exec(
+        select(IngestionKey.key, IngestionKey.lead_id).where(IngestionKey.key.in_(keys.lookup))
+    ).all()
+    for _, lead_id in rows:
+        if lead_id is not None:
+            return None, lead_id
+
+    pending = rows[0][0] if rows else None
+    if pending is None:
+        session.add(IngestionKey(key=keys.claim))
+        try:
+            session.commit()
+            return keys.claim, None
+        except IntegrityError:
+            session.rollback()
+        lead_id = session.exec(select(IngestionKey.lead_id).where(IngestionKey.key == keys.claim)).first()
+        if lead_id is not None:
+            return None, lead_id
+        pending = keys.claim
+
+    now = datetime.utcnow()
+    taken = session.exec(
+        update(IngestionKey)
+        .where(
+            IngestionKey.key == pending,
+            IngestionKey.lead_id.is_(None),
+            IngestionKey.updated_at < now - timedelta(seconds=claim_timeout_seconds),
+        )
+        .values(updated_at=now)
     )
-    session.add(lead)
     session.commit()
-    session.refresh(lead)
+    if taken.rowcount:
+        return pending, None
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="An identical submission is still being processed",
+        headers={"Retry-After": "5"},
+    )
 
-    campaign = _get_active_campaign(session, brand)
-    _generate_email(
-        session=session,
-        lead=lead,
-        brand=brand,
-        campaign=campaign,
-        renderer=renderer,
-        openai_client=openai_client,
+
+def _complete_claim(session: SessionDep, key: str, lead_id: int) -> None:
+    session.exec(
+        update(IngestionKey).where(IngestionKey.key == key).values(lead_id=lead_id, updated_at=datetime.utcnow())
     )
 
+
+def _commit_ingest(session: SessionDep, claimed: str | None, lead_id: int) -> None:
+    if claimed:
+        _complete_claim(session, claimed, lead_id)
+    _commit(session)
+
+
+def _release_claim(session: SessionDep, key: str) -> None:
+    session.rollback()
+    session.exec(delete(IngestionKey).where(IngestionKey.key == key, IngestionKey.lead_id.is_(None)))
+    session.commit()
+
+
+def _mark_replayed(response: Response) -> None:
+    response.status_code = status.HTTP_200_OK
+    response.headers["Idempotent-Replayed"] = "true"
+
+
+def _prepare_ingest(
+    session: SessionDep,
+    cache: BrandContextCache,
+    slug: str,
+    keys: IngestionKeys | None,
+    claim_timeout_seconds: int,
+) -> tuple[BrandContext, str | None, int | None]:
+    context = _get_brand_context(session, cache, slug)
+    claimed, original_id = _claim_ingestion(session, keys, claim_timeout_seconds) if keys else (None, None)
+    _release_connection(session)
+    return context, claimed, original_id
+
+
+@router.post("/", response_model=LeadRead, status_code=status.HTTP_201_CREATED)
+async def ingest_lead(
+    payload: LeadCreate,
+    session: SessionDep,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    renderer: EmailRenderer = Depends(renderer_dependency),
+    copy_batcher: CopyBatcher = Depends(copy_batcher_dependency),
+    context_cache: BrandContextCache = Depends(brand_context_dependency),
+    settings: Settings = Depends(settings_dependency),
+) -> Lead:
+    # Database work runs on the threadpool; only the model call is awaited on the event loop.
+    # The lead is inserted together with its email after the model call, so no write
+    # transaction is held open while waiting on OpenAI.
+    # Retries and double submits return the original lead without another model call.
+    keys = _ingestion_keys(payload, idempotency_key, settings)
+    context, claimed, original_id = await run_in_threadpool(
+        _prepare_ingest, session, context_cache, payload.brand_slug, keys, settings.ingest_claim_timeout_seconds
+    )
+    if original_id is not None:
+        _mark_replayed(response)
+        return await run_in_threadpool(session.get, Lead, original_id)
+
+    try:
+        lead = _build_lead(payload, context.brand)
+        # Concurrent ingests for the same campaign are coalesced into one model request.
+        await _agenerate_email(
+            session=session,
+            lead=lead,
+            context=context,
+            renderer=renderer,
+            openai_client=copy_batcher,
+            claimed=claimed,
+        )
+    except Exception:
+        if claimed:
+            await run_in_threadpool(_release_claim, session, claimed)
+        raise
+
     return lead
 
 
+def _validation_errors(exc: ValidationError) -> list[dict[str, Any]]:
+    return [{"loc": list(error["loc"]), "msg": error["msg"]} for error in exc.errors()]
+
+
+def _load_batch_contexts(session: SessionDep, cache: BrandContextCache, slugs: set[str]) -> dict[str, BrandContext]:
+    contexts: dict[str, BrandContext] = {}
+    for slug in slugs:
+        try:
+            contexts[slug] = _get_brand_context(session, cache, slug)
+        except HTTPException:
+            continue
+    _release_connection(session)
+    return contexts
+
+
+async def _agenerate_batch_item(
+    *, lead: Lead, context: BrandContext, renderer: EmailRenderer, openai_client: OpenAIClient | CopyBatcher
+) -> GeneratedEmail | Exception:
+    try:
+        with stage("openai"):
+            openai_notes = await openai_client.agenerate_highlight_copy(
+                brand=context.brand,
+                lead=lead,
+                features=context.features,
+                tone=context.tone,
+            )
+        record_copy(openai_notes)
+        return _render_email(lead=lead, context=context, renderer=renderer, openai_notes=openai_notes)
+    except Exception as exc:  # noqa: BLE001 - a single bad lead must not fail the batch
+        return exc
+
+
+def _save_batch(session: SessionDep, generated_items: list[tuple[int, Lead, GeneratedEmail]]) -> None:
+    with stage("db_write"):
+        session.add_all([lead for _, lead, _ in generated_items])
+        session.flush()
+
+        for _, lead, generated in generated_items:
+            generated.lead_id = lead.id
+        get_body_store().externalize(session, [generated for _, _, generated in generated_items])
+        record_usage(session, [(lead.brand_id, generated) for _, lead, generated in generated_items])
+    _commit(session)
+
+
+@router.post("/batch", response_model=LeadBatchResult)
+async def ingest_lead_batch(
+    session: SessionDep,
+    payload: list[Any] = Body(...),
+    renderer: EmailRenderer = Depends(renderer_dependency),
+    copy_batcher: CopyBatcher = Depends(copy_batcher_dependency),
+    context_cache: BrandContextCache = Depends(brand_context_dependency),
+    settings: Settings = Depends(settings_dependency),
+) -> LeadBatchResult:
+    if len(payload) > settings.lead_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.lead_batch_max_size} leads",
+        )
+
+    results: dict[int, LeadBatchItemResult] = {}
+    valid: list[tuple[int, LeadCreate]] = []
+    for index, item in enumerate(payload):
+        try:
+            valid.append((index, LeadCreate.model_validate(item)))
+        except ValidationError as exc:
+            results[index] = LeadBatchItemResult(index=index, status="invalid", errors=_validation_errors(exc))
+
+    # Brand, campaign, features and template are resolved once per brand in the batch.
+    contexts = await run_in_threadpool(
+        _load_batch_contexts, session, context_cache, {item.brand_slug for _, item in valid}
+    )
+
+    pending: list[tuple[int, Lead, BrandContext]] = []
+    for index, item in valid:
+        context = contexts.get(item.brand_slug)
+        if not context:
+            results[index] = LeadBatchItemResult(
+                index=index, status="error", errors=[{"loc": ["brand_slug"], "msg": "Brand not found"}]
+            )
+            continue
+        pending.append((index, _build_lead(item, context.brand), context))
+
+    # All model calls are in flight together; leads sharing a campaign are coalesced by the
+    # batcher and the client's semaphore bounds how many requests reach OpenAI at once.
+    outcomes = await asyncio.gather(
+        *(
+            _agenerate_batch_item(lead=lead, context=context, renderer=renderer, openai_client=copy_batcher)
+            for _, lead, context in pending
+        )
+    )
+
+    generated_items: list[tuple[int, Lead, GeneratedEmail]] = []
+    for (index, lead, _), outcome in zip(pending, outcomes):
+        if isinstance(outcome, Exception):
+            results[index] = LeadBatchItemResult(
+                index=index, status="error", errors=[{"loc": [], "msg": f"Email generation failed: {outcome}"}]
+            )
+            continue
+        generated_items.append((index, lead, outcome))
+
+    if generated_items:
+        await run_in_threadpool(_save_batch, session, generated_items)
+        for index, lead, generated in generated_items:
+            results[index] = LeadBatchItemResult(
+                index=index,
+                status="created",
+                lead=LeadRead.model_validate(lead),
+                email_id=generated.id,
+            )
+
+    ordered = [results[index] for index in range(len(payload))]
+    created = sum(1 for result in ordered if result.status == "created")
+    return LeadBatchResult(created=created, failed=len(ordered) - created, results=ordered)
+
+
+def run_generation_job(job_id: int) -> None:
+    """Generate the email for a queued job; executed on the generation worker pool."""
+
+    with session_scope() as session:
+        claimed = session.exec(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id, GenerationJob.status == "queued")
+            .values(status="running", attempts=GenerationJob.attempts + 1, started_at=datetime.utcnow())
+        )
+        session.commit()
+        if not claimed.rowcount:
+            return
+
+        # The email and the job outcome are written in one commit by the session scope.
+        job = session.get(GenerationJob, job_id)
+        try:
+            lead = session.get(Lead, job.lead_id)
+            context = _get_brand_context_by_id(session, get_brand_context_cache(), lead.brand_id) if lead else None
+            if not lead or not context:
+                raise LookupError("Lead or brand missing for generation job")
+
+            generated = _generate_email(
+                session=session,
+                lead=lead,
+                context=context,
+                renderer=get_renderer(),
+                openai_client=get_openai_service(),
+            )
+            job.status = "succeeded"
+            job.generated_email_id = generated.id
+            job.error = None
+        except Exception as exc:  # noqa: BLE001 - failures are recorded on the job
+            logger.exception("Email generation failed", extra={"job_id": job_id})
+            session.rollback()
+            job.status = "failed"
+            job.error = str(exc)
+
+        job.finished_at = datetime.utcnow()
+        session.add(job)
+
+
+def _latest_generation_job(session: SessionDep, lead_id: int) -> GenerationJob | None:
+    statement = (
+        select(GenerationJob).where(GenerationJob.lead_id == lead_id).order_by(GenerationJob.id.desc())
+    )
+    return session.exec(statement).first()
+
+
+def pending_generation_jobs(limit: int, exclude: set[int]) -> list[int]:
+    with session_scope() as session:
+        statement = select(GenerationJob.id).where(GenerationJob.status == "queued").order_by(GenerationJob.id)
+        if exclude:
+            statement = statement.where(GenerationJob.id.not_in(exclude))
+        return list(session.exec(statement.limit(limit)).all())
+
+
+def requeue_stale_generation_jobs(stale_after_seconds: int) -> int:
+    """Return jobs abandoned in ``running`` (e.g. by a crashed process) to the queue."""
+
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+    with session_scope() as session:
+        result = session.exec(
+            update(GenerationJob)
+            .where(GenerationJob.status == "running", GenerationJob.started_at < cutoff)
+            .values(status="queued")
+        )
+        return result.rowcount or 0
+
+
+@router.post("/async", response_model=LeadAccepted, status_code=status.HTTP_202_ACCEPTED)
+def ingest_lead_async(
+    payload: LeadCreate,
+    session: SessionDep,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    worker: GenerationWorker = Depends(generation_worker_dependency),
+    context_cache: BrandContextCache = Depends(brand_context_dependency),
+    settings: Settings = Depends(settings_dependency),
+) -> LeadAccepted:
+    context = _get_brand_context(session, context_cache, payload.brand_slug)
+
+    keys = _ingestion_keys(payload, idempotency_key, settings)
+    claimed = None
+    if keys:
+        claimed, original_id = _claim_ingestion(session, keys, settings.ingest_claim_timeout_seconds)
+        if original_id is not None:
+            _mark_replayed(response)
+            original = _latest_generation_job(session, original_id)
+            return LeadAccepted(
+                lead=LeadRead.model_validate(session.get(Lead, original_id)),
+                job_id=original.id if original else None,
+                status=original.status if original else "succeeded",
+            )
+
+    try:
+        lead = _build_lead(payload, context.brand)
+        session.add(lead)
+        session.flush()
+
+        job = GenerationJob(lead_id=lead.id)
+        session.add(job)
+        session.flush()
+
+        accepted = LeadAccepted(lead=LeadRead.model_validate(lead), job_id=job.id, status=job.status)
+        _commit_ingest(session, claimed, lead.id)
+    except Exception:
+        if claimed:
+            _release_claim(session, claimed)
+        raise
+
+    worker.submit(job.id)
+    return accepted
+
+
+@router.get("/export")
+def export_leads(
+    brand_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    include_body: bool = True,
+    gzip: bool = False,
+    settings: Settings = Depends(settings_dependency),
+) -> StreamingResponse:
+    """Stream every matching lead with its generated emails as NDJSON (one lead per line) or CSV."""
+
+    chunks = stream_export(
+        session_scope,
+        ExportFilters(brand_id=brand_id, created_from=created_from, created_to=created_to),
+        export_format=export_format,
+        include_body=include_body,
+        gzip=gzip,
+        yield_per=settings.lead_export_yield_per,
+    )
+    filename = f"leads-export.{export_format}{'.gz' if gzip else ''}"
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/storage", response_model=EmailStorageReport)
+def email_storage_report(
+    session: SessionDep, body_store: EmailBodyStore = Depends(body_store_dependency)
+) -> dict:
+    """How much space the deduplicated, compressed body store saves over inline HTML."""
+
+    return body_store.report(session)
+
+
+@router.post("/storage/compact", response_model=EmailStorageReport)
+def compact_email_storage(
+    session: SessionDep,
+    limit: int = Query(1000, ge=1, le=10000),
+    body_store: EmailBodyStore = Depends(body_store_dependency),
+) -> dict:
+    """Move up to ``limit`` inline bodies from older rows into the body store."""
+
+    body_store.compact(session, limit)
+    return body_store.report(session)
+
+
+@router.get("/search", response_model=Page[LeadRead])
+def search_leads(
+    session: SessionDep,
+    page: PageDep,
+    q: Optional[str] = Query(None, description="Terms matched as prefixes of email, name, company or job title"),
+    brand_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> dict:
+    statement = lead_search_statement(
+        q,
+        brand_id=brand_id,
+        created_from=created_from,
+        created_to=created_to,
+        use_fts=fts_enabled(session.get_bind()),
+    )
+    return paginate(session, statement, Lead.id, page)
+
+
 @router.get("/{lead_id}", response_model=LeadRead)
 def get_lead(lead_id: int, session: SessionDep) -> Lead:
     lead = session.get(Lead, lead_id)
@@ -159,40 +735,65 @@ def get_lead(lead_id: int, session: SessionDep) -> Lead:
     return lead
 
 
-@router.get("/{lead_id}/emails", response_model=list[GeneratedEmailRead])
-def list_lead_emails(lead_id: int, session: SessionDep) -> list[GeneratedEmail]:
-    statement = select(GeneratedEmail).where(GeneratedEmail.lead_id == lead_id)
-    return session.exec(statement).all()
+@router.get("/{lead_id}/emails", response_model=Page[GeneratedEmailListItem])
+def list_lead_emails(
+    lead_id: int,
+    session: SessionDep,
+    page: PageDep,
+    email_status: Optional[str] = Query(None, alias="status"),
+    campaign_id: Optional[int] = None,
+    include_body: bool = False,
+) -> dict:
+    statement = lead_emails_statement(lead_id, include_body=include_body)
+    if email_status is not None:
+        statement = statement.where(GeneratedEmail.status == email_status)
+    if campaign_id is not None:
+        statement = statement.where(GeneratedEmail.campaign_id == campaign_id)
+    result = paginate(session, statement, GeneratedEmail.id, page)
+    if include_body:
+        get_body_store().hydrate(session, result["items"])
+    return result
+
+
+@router.get("/{lead_id}/generation", response_model=GenerationJobRead)
+def get_lead_generation(lead_id: int, session: SessionDep) -> GenerationJob:
+    job = _latest_generation_job(session, lead_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No generation job for lead")
+    return job
+
+
+def _load_preview(session: SessionDep, cache: BrandContextCache, lead_id: int) -> tuple[Lead, BrandContext]:
+    lead = session.get(Lead, lead_id)
+    if not lead:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
+    context = _get_brand_context_by_id(session, cache, lead.brand_id)
+    if not context:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Brand missing for lead")
+    _release_connection(session)
+    return lead, context
 
 
 @router.post("/{lead_id}/preview", response_model=EmailPreview)
-def regenerate_preview(
+async def regenerate_preview(
     lead_id: int,
     session: SessionDep,
     renderer: EmailRenderer = Depends(renderer_dependency),
     openai_client: OpenAIClient = Depends(openai_dependency),
+    context_cache: BrandContextCache = Depends(brand_context_dependency),
 ) -> EmailPreview:
-    lead = session.get(Lead, lead_id)
-    if not lead:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
-
-    brand = session.get(Brand, lead.brand_id)
-    if not brand:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Brand missing for lead")
-
-    campaign = _get_active_campaign(session, brand)
-    generated = _generate_email(
+    lead, context = await run_in_threadpool(_load_preview, session, context_cache, lead_id)
+    generated = await _agenerate_email(
         session=session,
         lead=lead,
-        brand=brand,
-        campaign=campaign,
+        context=context,
         renderer=renderer,
         openai_client=openai_client,
     )
     return EmailPreview(
         subject=generated.subject,
         html_body=generated.html_body,
-        tone_used=campaign.tone_override if campaign else brand.default_tone,
+        tone_used=context.tone,
         template_id=generated.template_id,
         campaign_id=generated.campaign_id,
     )
@@ -202,29 +803,97 @@ def regenerate_preview(
 def send_generated_email(
     payload: EmailSendRequest,
     session: SessionDep,
-    gmail_client: GmailClient = Depends(gmail_dependency),
+    gmail_registry: GmailClientRegistry = Depends(gmail_registry_dependency),
+    body_store: EmailBodyStore = Depends(body_store_dependency),
+    outbox: OutboxDispatcher = Depends(outbox_dependency),
 ) -> dict:
     generated = session.get(GeneratedEmail, payload.email_id)
     if not generated:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Generated email not found")
+    body_store.hydrate(session, [generated])
 
     lead = session.get(Lead, generated.lead_id)
     brand = session.get(Brand, lead.brand_id) if lead else None
     if not lead or not brand:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email missing lead or brand context")
 
-    result = gmail_client.send_html_email(
-        to_address=lead.email,
-        subject=generated.subject,
-        html_body=generated.html_body,
-        from_address=brand.sender_email or f"info@{brand.slug}.com",
-        from_name=brand.sender_name or brand.name,
-    )
+    if generated.status not in SENDABLE_STATUSES:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Email is already {generated.status}")
+
+    client = gmail_registry.client_for(brand)
+    if not client.configured:
+        logger.warning("Gmail service not configured; skipping send.")
+        return {"status": "skipped", "reason": "gmail_not_configured"}
+
+    # Direct sends draw on the same per-mailbox quota as the outbox.
+    bucket = outbox.bucket_for(mailbox_key(brand))
+    if not bucket.try_acquire():
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Gmail send quota for this mailbox is exhausted",
+            headers={"Retry-After": str(math.ceil(bucket.wait_time()))},
+        )
 
-    if result.get("status") == "sent":
-        generated.status = "sent"
-        generated.sent_at = datetime.utcnow()
+    # Claimed like an outbox send, so a concurrent enqueue or direct send cannot deliver it twice.
+    claimed = session.exec(
+        update(GeneratedEmail)
+        .where(GeneratedEmail.id == generated.id, GeneratedEmail.status.in_(SENDABLE_STATUSES))
+        .values(status="sending", updated_at=datetime.utcnow())
+    )
+    session.commit()
+    if not claimed.rowcount:
+        bucket.release()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email is already being sent")
+
+    try:
+        with stage("gmail_send"):
+            result = client.send_html_email(
+                to_address=lead.email,
+                subject=generated.subject,
+                html_body=generated.html_body,
+                from_address=brand.sender_email or f"info@{brand.slug}.com",
+                from_name=brand.sender_name or brand.name,
+            )
+    except Exception as exc:
+        generated.status = "failed"
+        generated.last_error = str(exc)
         session.add(generated)
         session.commit()
+        raise
+
+    generated.status = "sent"
+    generated.sent_at = datetime.utcnow()
+    generated.last_error = None
+    session.add(generated)
+    session.commit()
 
     return result
+
+
+@router.post("/send/batch", response_model=EmailSendBatchResult, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_generated_emails(
+    payload: EmailSendBatchRequest,
+    session: SessionDep,
+    outbox: OutboxDispatcher = Depends(outbox_dependency),
+) -> EmailSendBatchResult:
+    requested = list(dict.fromkeys(payload.email_ids))
+    sendable = set(
+        session.exec(
+            select(GeneratedEmail.id).where(
+                GeneratedEmail.id.in_(requested), GeneratedEmail.status.in_(SENDABLE_STATUSES)
+            )
+        ).all()
+    )
+    if sendable:
+        session.exec(
+            update(GeneratedEmail)
+            .where(GeneratedEmail.id.in_(sendable), GeneratedEmail.status.in_(SENDABLE_STATUSES))
+            .values(status="queued", send_attempts=0, next_attempt_at=None, last_error=None, updated_at=datetime.utcnow())
+        )
+        session.commit()
+        outbox.wake()
+
+    return EmailSendBatchResult(
+        queued=[email_id for email_id in requested if email_id in sendable],
+        skipped=[email_id for email_id in requested if email_id not in sendable],
+    )
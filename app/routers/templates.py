@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, status
 from sqlmodel import select
 
 from app.database import SessionDep
+from app.dependencies import get_brand_context_cache
 from app.models import Brand, EmailTemplate
-from app.schemas import EmailTemplateCreate, EmailTemplateRead, EmailTemplateUpdate
+from app.pagination import PageDep, list_columns, paginate
+from app.schemas import EmailTemplateCreate, EmailTemplateListItem, EmailTemplateRead, EmailTemplateUpdate, Page
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[EmailTemplateRead])
-def list_templates(session: SessionDep) -> list[EmailTemplate]:
-    return session.exec(select(EmailTemplate)).all()
+@router.get("/", response_model=Page[EmailTemplateListItem])
+def list_templates(
+    session: SessionDep,
+    page: PageDep,
+    brand_id: Optional[int] = None,
+    is_default: Optional[bool] = None,
+    include_body: bool = False,
+) -> dict:
+    statement = select(EmailTemplate) if include_body else select(*list_columns(EmailTemplate, exclude={"html_body"}))
+    if brand_id is not None:
+        statement = statement.where(EmailTemplate.brand_id == brand_id)
+    if is_default is not None:
+        statement = statement.where(EmailTemplate.is_default == is_default)
+    return paginate(session, statement, EmailTemplate.id, page)
 
 
 @router.post("/", response_model=EmailTemplateRead, status_code=status.HTTP_201_CREATED)
@@ -31,7 +46,7 @@ def create_template(payload: EmailTemplateCreate, session: SessionDep) -> EmailT
     template = EmailTemplate(**payload.model_dump())
     session.add(template)
     session.commit()
-    session.refresh(template)
+    get_brand_context_cache().invalidate(template.brand_id)
     return template
 
 
@@ -55,7 +70,7 @@ def update_template(template_id: int, payload: EmailTemplateUpdate, session: Ses
 
     session.add(template)
     session.commit()
-    session.refresh(template)
+    get_brand_context_cache().invalidate(template.brand_id)
     return template
 
 
@@ -65,5 +80,7 @@ def delete_template(template_id: int, session: SessionDep) -> None:
     if not template:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
 
+    brand_id = template.brand_id
     session.delete(template)
     session.commit()
+    get_brand_context_cache().invalidate(brand_id)
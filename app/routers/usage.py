@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends
+
+from app.config import Settings
+from app.database import SessionDep
+from app.dependencies import settings_dependency
+from app.schemas import UsageReport
+from app.services.usage import UsageFilters, usage_report
+
+router = APIRouter()
+
+
+@router.get("/", response_model=UsageReport)
+def get_usage(
+    session: SessionDep,
+    brand_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    model: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    group_by: Optional[Literal["day", "brand", "campaign", "model"]] = None,
+    settings: Settings = Depends(settings_dependency),
+) -> dict:
+    """OpenAI requests, cache hits, tokens and estimated cost, read from the daily rollups.
+
+    ``date_from`` and ``date_to`` are inclusive UTC days; ``group_by`` adds a
+    breakdown along one dimension next to the totals.
+    """
+
+    filters = UsageFilters(
+        brand_id=brand_id, campaign_id=campaign_id, model=model, date_from=date_from, date_to=date_to
+    )
+    return usage_report(session, filters, prices=settings.openai_token_prices, group_by=group_by)
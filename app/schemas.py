@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Generic, Optional, TypeVar
 
-from pydantic import BaseModel, EmailStr
+from pydantic import AliasChoices, BaseModel, EmailStr, Field
+
+
+ItemT = TypeVar("ItemT")
 
 
 class ORMBase(BaseModel):
@@ -11,6 +14,11 @@ class ORMBase(BaseModel):
         from_attributes = True
 
 
+class Page(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    next_cursor: Optional[str] = None
+
+
 class FeatureBase(BaseModel):
     name: str
     short_description: str
@@ -35,10 +43,14 @@ class BrandBase(BaseModel):
     default_subject: Optional[str] = None
     default_tone: Optional[str] = None
     openai_style_instructions: Optional[str] = None
+    openai_cache_enabled: bool = True
+    gmail_user_id: Optional[str] = None
 
 
 class BrandCreate(BrandBase):
-    pass
+    gmail_refresh_token: Optional[str] = None
+    gmail_client_id: Optional[str] = None
+    gmail_client_secret: Optional[str] = None
 
 
 class BrandUpdate(BaseModel):
@@ -49,6 +61,11 @@ class BrandUpdate(BaseModel):
     default_subject: Optional[str] = None
     default_tone: Optional[str] = None
     openai_style_instructions: Optional[str] = None
+    openai_cache_enabled: Optional[bool] = None
+    gmail_user_id: Optional[str] = None
+    gmail_refresh_token: Optional[str] = None
+    gmail_client_id: Optional[str] = None
+    gmail_client_secret: Optional[str] = None
 
 
 class BrandRead(BrandBase, ORMBase):
@@ -107,6 +124,10 @@ class EmailTemplateRead(EmailTemplateBase, ORMBase):
     updated_at: datetime
 
 
+class EmailTemplateListItem(EmailTemplateRead):
+    html_body: Optional[str] = None
+
+
 class CampaignBase(BaseModel):
     brand_id: int
     name: str
@@ -175,11 +196,26 @@ class LeadRead(ORMBase):
     company: Optional[str]
     job_title: Optional[str]
     phone_number: Optional[str]
-    metadata: Optional[dict]
+    # ORM objects carry it as ``extra``; column-only rows keep the ``metadata`` column name.
+    metadata: Optional[dict] = Field(default=None, validation_alias=AliasChoices("extra", "metadata"))
     created_at: datetime
     updated_at: datetime
 
 
+class LeadBatchItemResult(BaseModel):
+    index: int
+    status: str
+    lead: Optional[LeadRead] = None
+    email_id: Optional[int] = None
+    errors: list[dict[str, Any]] = []
+
+
+class LeadBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: list[LeadBatchItemResult]
+
+
 class GeneratedEmailRead(ORMBase):
     id: int
     lead_id: int
@@ -188,12 +224,38 @@ class GeneratedEmailRead(ORMBase):
     subject: str
     html_body: str
     status: str
+    send_attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
     sent_at: Optional[datetime]
-    metadata: Optional[dict]
+    metadata: Optional[dict] = Field(default=None, validation_alias=AliasChoices("extra", "metadata"))
+    created_at: datetime
+    updated_at: datetime
+
+
+class GeneratedEmailListItem(GeneratedEmailRead):
+    html_body: Optional[str] = None
+
+
+class GenerationJobRead(ORMBase):
+    id: int
+    lead_id: int
+    status: str
+    attempts: int
+    generated_email_id: Optional[int]
+    error: Optional[str]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
     created_at: datetime
     updated_at: datetime
 
 
+class LeadAccepted(BaseModel):
+    lead: LeadRead
+    job_id: Optional[int] = None
+    status: str
+
+
 class EmailPreview(BaseModel):
     subject: str
     html_body: str
@@ -205,3 +267,61 @@ class EmailPreview(BaseModel):
 class EmailSendRequest(BaseModel):
     email_id: int
 
+
+class EmailSendBatchRequest(BaseModel):
+    email_ids: list[int]
+
+
+class EmailSendBatchResult(BaseModel):
+    queued: list[int]
+    skipped: list[int]
+
+
+class EmailStorageReport(BaseModel):
+    emails: int
+    externalized_emails: int
+    inline_emails: int
+    unique_bodies: int
+    logical_bytes: int
+    stored_bytes: int
+    saved_bytes: int
+    dedup_ratio: float
+    compression_ratio: float
+    codecs: dict[str, int]
+
+
+class UsageTotals(BaseModel):
+    requests: int
+    cache_hits: int
+    cache_hit_ratio: float
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    estimated_cost_usd: float
+
+
+class UsageGroup(UsageTotals):
+    day: Optional[date] = None
+    brand_id: Optional[int] = None
+    campaign_id: Optional[int] = None
+    model: Optional[str] = None
+
+
+class UsageReport(BaseModel):
+    totals: UsageTotals
+    group_by: Optional[str] = None
+    groups: list[UsageGroup]
+
+
+class ProfilingUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+
+
+class ProfilingStatus(BaseModel):
+    enabled: bool
+    sample_rate: float
+    header: str
+    directory: str
+    interval_ms: float
+    profiles_written: int
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import zlib
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, select
+
+from app.models import EmailBody, GeneratedEmail
+
+try:  # optional dependency: pip install salesmailer[zstd]
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def body_digest(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def decompress_body(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed email bodies")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+class EmailBodyStore:
+    """Content-addressed, compressed storage for rendered email HTML.
+
+    Identical bodies are stored once. ``GeneratedEmail`` rows reference a body
+    by ``body_digest`` and keep an empty inline ``html_body``; callers that need
+    the HTML (preview, send, export) hydrate it explicitly, so listings and
+    status updates never read or decompress bodies.
+    """
+
+    def __init__(self, *, codec: str = "zlib", level: int = 6) -> None:
+        if codec == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; compressing email bodies with zlib")
+            codec = "zlib"
+        self.codec = codec
+        self.level = level
+
+    def compress(self, html: str) -> bytes:
+        raw = html.encode("utf-8")
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(raw)
+        return zlib.compress(raw, self.level)
+
+    def put_many(self, session: Session, bodies: Sequence[str]) -> list[str]:
+        """Store ``bodies`` that are not stored yet; returns their digests in order."""
+
+        digests = [body_digest(html) for html in bodies]
+        unique = dict(zip(digests, bodies))
+        existing = set(session.exec(select(EmailBody.digest).where(EmailBody.digest.in_(list(unique)))).all())
+        now = datetime.utcnow()
+        rows = [
+            {
+                "digest": digest,
+                "codec": self.codec,
+                "size": len(html.encode("utf-8")),
+                "data": self.compress(html),
+                "created_at": now,
+            }
+            for digest, html in unique.items()
+            if digest not in existing
+        ]
+        if rows:
+            self._insert_missing(session, rows)
+        return digests
+
+    @staticmethod
+    def _insert_missing(session: Session, rows: list[dict[str, Any]]) -> None:
+        insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if insert is not None:
+            # A concurrent writer may store the same body first; identical content makes that a no-op.
+            session.exec(insert(EmailBody).values(rows).on_conflict_do_nothing(index_elements=["digest"]))
+            return
+        session.add_all(EmailBody(**row) for row in rows)
+        session.flush()
+
+    def externalize(self, session: Session, emails: Sequence[GeneratedEmail]) -> None:
+        """Move inline bodies into the store and flush ``emails``.
+
+        The in-memory objects keep their HTML after the flush, so callers can
+        still render previews from them without reading it back.
+        """
+
+        inline = [email for email in emails if email.body_digest is None and email.html_body]
+        if not inline:
+            session.add_all(emails)
+            session.flush()
+            return
+
+        bodies = [email.html_body for email in inline]
+        for email, digest in zip(inline, self.put_many(session, bodies)):
+            email.body_digest = digest
+            email.html_body = ""
+        session.add_all(emails)
+        session.flush()
+        for email, html in zip(inline, bodies):
+            set_committed_value(email, "html_body", html)
+
+    def load(self, session: Session, digests: Iterable[str]) -> dict[str, str]:
+        wanted = {digest for digest in digests if digest}
+        if not wanted:
+            return {}
+        rows = session.exec(
+            select(EmailBody.digest, EmailBody.codec, EmailBody.data).where(EmailBody.digest.in_(list(wanted)))
+        ).all()
+        return {digest: decompress_body(codec, data) for digest, codec, data in rows}
+
+    def hydrate(self, session: Session, emails: Sequence[GeneratedEmail]) -> Sequence[GeneratedEmail]:
+        """Fill ``html_body`` on loaded emails from the store without marking them dirty."""
+
+        bodies = self.load(session, (email.body_digest for email in emails))
+        for email in emails:
+            if email.body_digest in bodies:
+                set_committed_value(email, "html_body", bodies[email.body_digest])
+        return emails
+
+    def compact(self, session: Session, limit: int) -> int:
+        """Externalize up to ``limit`` emails that still store their body inline."""
+
+        emails = session.exec(
+            select(GeneratedEmail)
+            .where(GeneratedEmail.body_digest.is_(None), GeneratedEmail.html_body != "")
+            .order_by(GeneratedEmail.id)
+            .limit(limit)
+        ).all()
+        self.externalize(session, emails)
+        return len(emails)
+
+    @staticmethod
+    def report(session: Session) -> dict[str, Any]:
+        emails = GeneratedEmail.__table__
+        bodies = EmailBody.__table__
+        email_count, externalized, inline_bytes = session.exec(
+            select(func.count(), func.count(emails.c.body_digest), func.coalesce(func.sum(func.length(emails.c.html_body)), 0))
+        ).one()
+        referenced_bytes = session.exec(
+            select(func.coalesce(func.sum(bodies.c.size), 0)).select_from(
+                emails.join(bodies, bodies.c.digest == emails.c.body_digest)
+            )
+        ).one()
+        codecs = session.exec(
+            select(
+                bodies.c.codec,
+                func.count(),
+                func.coalesce(func.sum(bodies.c.size), 0),
+                func.coalesce(func.sum(func.length(bodies.c.data)), 0),
+            ).group_by(bodies.c.codec)
+        ).all()
+
+        unique_bodies = sum(count for _, count, _, _ in codecs)
+        unique_bytes = sum(size for _, _, size, _ in codecs)
+        compressed_bytes = sum(stored for _, _, _, stored in codecs)
+        logical_bytes = inline_bytes + referenced_bytes
+        stored_bytes = inline_bytes + compressed_bytes
+        return {
+            "emails": email_count,
+            "externalized_emails": externalized,
+            "inline_emails": email_count - externalized,
+            "unique_bodies": unique_bodies,
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "saved_bytes": logical_bytes - stored_bytes,
+            "dedup_ratio": round(referenced_bytes / unique_bytes, 3) if unique_bytes else 1.0,
+            "compression_ratio": round(unique_bytes / compressed_bytes, 3) if compressed_bytes else 1.0,
+            "codecs": {codec: count for codec, count, _, _ in codecs},
+        }
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from app.models import Brand, Campaign, CampaignFeature, EmailTemplate
+
+
+@dataclass
+class BrandContext:
+    """Everything needed to generate an email for a brand, detached from any session."""
+
+    brand: Brand
+    campaign: Campaign | None
+    features: list[CampaignFeature]
+    template: EmailTemplate
+
+    @property
+    def tone(self) -> str | None:
+        return self.campaign.tone_override if self.campaign else self.brand.default_tone
+
+
+@dataclass
+class _CacheEntry:
+    context: BrandContext
+    expires_at: float
+
+
+class BrandContextCache:
+    """In-process snapshots of per-brand generation context.
+
+    Entries are dropped explicitly by the configuration routers after they
+    commit, and expire after ``ttl_seconds`` as a safety net for writes that
+    bypass the API.
+    """
+
+    def __init__(self, *, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: dict[Hashable, _CacheEntry] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], BrandContext | None]) -> BrandContext | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires_at > now:
+                self.hits += 1
+                return entry.context
+            self.misses += 1
+            version = self._version
+
+        context = loader()
+        if context is None:
+            return None
+
+        with self._lock:
+            # Skip storing a snapshot that raced with an invalidation; it may predate the write.
+            if version == self._version:
+                self._entries[key] = _CacheEntry(context=context, expires_at=self._clock() + self.ttl_seconds)
+        return context
+
+    def invalidate(self, brand_id: int | None = None) -> None:
+        """Drop snapshots for ``brand_id``, or every snapshot when no brand is given."""
+
+        with self._lock:
+            self._version += 1
+            if brand_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key, entry in self._entries.items() if entry.context.brand.id == brand_id]:
+                del self._entries[key]
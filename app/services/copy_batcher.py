@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from app.models import Brand, CampaignFeature, Lead
+from app.services.openai_client import OpenAIClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingBatch:
+    brand: Brand
+    features: Sequence[CampaignFeature]
+    tone: str | None
+    leads: list[Lead] = field(default_factory=list)
+    futures: list[asyncio.Future[dict[str, Any]]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class CopyBatcher:
+    """Coalesce concurrent highlight-copy requests that share brand, features and tone.
+
+    Requests are collected for ``window_seconds`` or until ``max_batch_size``
+    leads are waiting, then sent as one structured request through
+    :meth:`OpenAIClient.agenerate_highlight_copy_batch`. Exposes the same
+    ``agenerate_highlight_copy`` signature as the client so callers can use
+    either interchangeably.
+    """
+
+    def __init__(self, client: OpenAIClient, *, window_seconds: float = 0.05, max_batch_size: int = 20) -> None:
+        self.client = client
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[Hashable, _PendingBatch] = {}
+        # The event loop only keeps weak references to tasks; holding them here keeps
+        # in-flight batches from being garbage collected before their waiters resolve.
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def agenerate_highlight_copy(
+        self,
+        *,
+        brand: Brand,
+        lead: Lead,
+        features: Sequence[CampaignFeature],
+        tone: str | None,
+    ) -> dict[str, Any]:
+        if self.window_seconds <= 0 or self.max_batch_size <= 1 or not features:
+            return await self.client.agenerate_highlight_copy(brand=brand, lead=lead, features=features, tone=tone)
+
+        # The feature ids pin the campaign; brand and tone complete the shared part of the prompt.
+        key = (brand.id, tone, tuple(feature.id for feature in features))
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(brand=brand, features=features, tone=tone)
+            batch.timer = loop.call_later(self.window_seconds, self._flush, key)
+            self._pending[key] = batch
+
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        batch.leads.append(lead)
+        batch.futures.append(future)
+        if len(batch.leads) >= self.max_batch_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self, timeout: float = 10.0) -> None:
+        """Dispatch waiting batches now, give in-flight ones ``timeout`` seconds, then cancel the rest."""
+
+        for key in list(self._pending):
+            self._flush(key)
+        if not self._tasks:
+            return
+        _, unfinished = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def _dispatch(self, batch: _PendingBatch) -> None:
+        try:
+            results = await self.client.agenerate_highlight_copy_batch(
+                brand=batch.brand, leads=batch.leads, features=batch.features, tone=batch.tone
+            )
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001 - surfaced to every waiting request
+            logger.warning("Batched copy generation failed", extra={"batch_size": len(batch.leads)})
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Hashable
 
-from jinja2 import Environment, StrictUndefined
+from jinja2 import Environment, StrictUndefined, Template
 
 from app.models import Campaign, CampaignFeature, EmailTemplate, GeneratedEmail, Lead
 
@@ -22,14 +25,70 @@ class RenderContext:
     openai_notes: dict[str, Any] | None = None
 
 
+@dataclass
+class TemplateCacheInfo:
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class CompiledTemplateCache:
+    """Thread-safe LRU cache of compiled Jinja2 templates."""
+
+    def __init__(self, env: Environment, max_size: int = 256) -> None:
+        self.env = env
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Template] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, source: str) -> Template:
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss on the same key only costs a duplicate compile.
+        compiled = self.env.from_string(source)
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> TemplateCacheInfo:
+        with self._lock:
+            return TemplateCacheInfo(hits=self.hits, misses=self.misses, size=len(self._entries), max_size=self.max_size)
+
+
+def _cache_key(kind: str, template: EmailTemplate, source: str) -> Hashable:
+    # Persisted templates are versioned by updated_at; unsaved ones (the built-in default) by content.
+    if template.id is not None and template.updated_at is not None:
+        return (kind, template.id, template.updated_at)
+    return (kind, hashlib.sha256(source.encode("utf-8")).hexdigest())
+
+
 class EmailRenderer:
     """Render templated emails using a Jinja2 environment."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, cache_size: int = 256) -> None:
         self.env = _environment()
+        self.cache = CompiledTemplateCache(self.env, max_size=cache_size)
 
     def render(self, template: EmailTemplate, context: RenderContext, *, subject_override: str | None = None) -> GeneratedEmail:
-        template_obj = self.env.from_string(template.html_body)
+        template_obj = self.cache.get(_cache_key("body", template, template.html_body), template.html_body)
         subject_template = subject_override or template.subject_template
 
         template_context = {
@@ -55,7 +114,12 @@ class EmailRenderer:
         html_body = template_obj.render(**template_context)
 
         if subject_template:
-            subject = self.env.from_string(subject_template).render(**template_context)
+            subject_key = (
+                ("subject", hashlib.sha256(subject_template.encode("utf-8")).hexdigest())
+                if subject_override
+                else _cache_key("subject", template, subject_template)
+            )
+            subject = self.cache.get(subject_key, subject_template).render(**template_context)
         else:
             subject = context.brand.default_subject or "Confirmation from {brand_name}".format(brand_name=context.brand.name)
 
@@ -66,5 +130,5 @@ class EmailRenderer:
             subject=subject,
             html_body=html_body,
             status="draft",
-            metadata={"tone": context.tone, "openai": context.openai_notes},
+            extra={"tone": context.tone, "openai": context.openai_notes},
         )
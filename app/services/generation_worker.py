@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[int], None]
+PendingLoader = Callable[[int, set[int]], list[int]]
+
+
+class GenerationWorker:
+    """Bounded thread pool that drains persisted email generation jobs.
+
+    Jobs live in the database; the pool only holds job ids. When every slot is
+    busy a job simply stays ``queued`` and is picked up by the next sweep, so
+    nothing is lost if the in-memory backlog is full or the process restarts.
+    """
+
+    def __init__(self, *, max_workers: int = 4, max_pending: int = 100) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._handler: JobHandler | None = None
+        self._pending_loader: PendingLoader | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._inflight: set[int] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self, handler: JobHandler, pending_loader: PendingLoader) -> None:
+        if self._executor:
+            return
+        self._handler = handler
+        self._pending_loader = pending_loader
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="generation")
+        self.resume()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def submit(self, job_id: int) -> bool:
+        """Schedule a job; returns ``False`` when it was left queued for a later sweep."""
+
+        with self._lock:
+            if not self._executor or job_id in self._inflight or len(self._inflight) >= self.max_pending:
+                return False
+            self._inflight.add(job_id)
+        self._executor.submit(self._run, job_id)
+        return True
+
+    def resume(self) -> None:
+        """Schedule queued jobs from the database up to the free backlog capacity."""
+
+        if not self._pending_loader or not self._executor:
+            return
+        with self._lock:
+            capacity = self.max_pending - len(self._inflight)
+            exclude = set(self._inflight)
+        if capacity <= 0:
+            return
+        for job_id in self._pending_loader(capacity, exclude):
+            self.submit(job_id)
+
+    def _run(self, job_id: int) -> None:
+        try:
+            if self._handler:
+                self._handler(job_id)
+        except Exception:  # noqa: BLE001 - the handler persists failures itself
+            logger.exception("Generation job crashed", extra={"job_id": job_id})
+        finally:
+            with self._lock:
+                self._inflight.discard(job_id)
+        try:
+            self.resume()
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to resume queued generation jobs")
@@ -2,15 +2,27 @@ from __future__ import annotations
 
 import base64
 import logging
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 from email.message import EmailMessage
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
+from urllib.parse import urljoin
 
+import httplib2
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp, Request
 from googleapiclient.discovery import build
+from googleapiclient.http import BatchHttpRequest
 
 logger = logging.getLogger(__name__)
 
+# Gmail accepts at most 100 calls per batch request.
+GMAIL_BATCH_LIMIT = 100
+
 
 @dataclass
 class GmailSettings:
@@ -20,27 +32,111 @@ class GmailSettings:
     client_id: str
     client_secret: str
     token_uri: str = "https://oauth2.googleapis.com/token"
+    api_base_url: Optional[str] = None
+
+
+@dataclass
+class OutgoingEmail:
+    email_id: int
+    to_address: str
+    subject: str
+    html_body: str
+    from_address: str
+    from_name: Optional[str] = None
+
+
+def build_raw_message(
+    *,
+    to_address: str,
+    subject: str,
+    html_body: str,
+    from_address: str,
+    from_name: Optional[str] = None,
+) -> dict[str, str]:
+    message = EmailMessage()
+    message["To"] = to_address
+    message["From"] = f"{from_name} <{from_address}>" if from_name else from_address
+    message["Subject"] = subject
+    message.set_content("This email requires an HTML capable client.")
+    message.add_alternative(html_body, subtype="html")
+
+    encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    return {"raw": encoded_message}
 
 
 class GmailClient:
-    """Wrapper around the Gmail API with structured logging."""
+    """Wrapper around the Gmail API with structured logging.
 
-    def __init__(self, settings: GmailSettings | None = None) -> None:
+    httplib2 connections are not thread-safe, so the client keeps a pool of
+    prebuilt service objects, each with its own HTTP transport. Services are
+    built from the discovery document bundled with google-api-python-client,
+    so construction never fetches discovery over the network.
+    """
+
+    def __init__(self, settings: GmailSettings | None = None, *, pool_size: int = 4, checkout_timeout: float = 30.0) -> None:
         self.settings = settings
-        self._service = None
+        self.pool_size = max(1, pool_size)
+        self.checkout_timeout = checkout_timeout
+        self._credentials: Credentials | None = None
+        self._refresh_lock = threading.Lock()
+        self._pool: queue.LifoQueue[Any] = queue.LifoQueue()
         if settings:
-            self._service = self._build_service(settings)
+            self._credentials = self._build_credentials(settings)
+            for _ in range(self.pool_size):
+                self._pool.put(self._build_service(self._credentials))
+
+    @property
+    def configured(self) -> bool:
+        return self._credentials is not None
 
-    def _build_service(self, settings: GmailSettings):  # type: ignore[no-untyped-def]
-        creds = Credentials(
-            token=settings.token,
+    def _build_credentials(self, settings: GmailSettings) -> Credentials:
+        return Credentials(
+            token=settings.token or None,
             refresh_token=settings.refresh_token,
             token_uri=settings.token_uri,
             client_id=settings.client_id,
             client_secret=settings.client_secret,
             scopes=["https://www.googleapis.com/auth/gmail.send"],
         )
-        return build("gmail", "v1", credentials=creds)
+
+    def _build_service(self, credentials: Credentials):  # type: ignore[no-untyped-def]
+        http = AuthorizedHttp(credentials, http=httplib2.Http())
+        client_options = {"api_endpoint": self.settings.api_base_url} if self.settings.api_base_url else None
+        return build(
+            "gmail", "v1", http=http, static_discovery=True, cache_discovery=False, client_options=client_options
+        )
+
+    def _new_batch(self, service: Any, callback: Any) -> BatchHttpRequest:
+        # The batch endpoint comes from the discovery document's rootUrl, which api_endpoint does not override.
+        if self.settings.api_base_url:
+            return BatchHttpRequest(callback=callback, batch_uri=urljoin(self.settings.api_base_url, "batch/gmail/v1"))
+        return service.new_batch_http_request(callback=callback)
+
+    def refresh_if_expiring(self, margin_seconds: float = 300.0) -> bool:
+        """Refresh the OAuth access token ahead of expiry; returns ``True`` when a refresh happened."""
+
+        if not self._credentials:
+            return False
+        with self._refresh_lock:
+            credentials = self._credentials
+            expiring = credentials.expiry is not None and credentials.expiry - datetime.utcnow() < timedelta(
+                seconds=margin_seconds
+            )
+            if credentials.token and not expiring:
+                return False
+            credentials.refresh(Request(httplib2.Http()))
+            logger.info("Refreshed Gmail access token", extra={"user_id": self.settings.user_id})
+            return True
+
+    @contextmanager
+    def _checkout(self) -> Iterator[Any]:
+        """Borrow a service object for the duration of one request or batch."""
+
+        service = self._pool.get(timeout=self.checkout_timeout)
+        try:
+            yield service
+        finally:
+            self._pool.put(service)
 
     def send_html_email(
         self,
@@ -51,22 +147,71 @@ class GmailClient:
         from_address: str,
         from_name: Optional[str] = None,
     ) -> dict[str, Any]:
-        if not self._service:
+        if not self.configured:
             logger.warning("Gmail service not configured; skipping send.")
             return {"status": "skipped", "reason": "gmail_not_configured"}
 
-        message = EmailMessage()
-        message["To"] = to_address
-        message["From"] = f"{from_name} <{from_address}>" if from_name else from_address
-        message["Subject"] = subject
-        message.set_content("This email requires an HTML capable client.")
-        message.add_alternative(html_body, subtype="html")
-
-        encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        send_data = {"raw": encoded_message}
-
-        response = (
-            self._service.users().messages().send(userId=self.settings.user_id, body=send_data).execute()
+        send_data = build_raw_message(
+            to_address=to_address,
+            subject=subject,
+            html_body=html_body,
+            from_address=from_address,
+            from_name=from_name,
         )
+
+        with self._checkout() as service:
+            response = service.users().messages().send(userId=self.settings.user_id, body=send_data).execute()
         logger.info("Email sent via Gmail API", extra={"response": response})
         return {"status": "sent", "response": response}
+
+    def send_many(
+        self, messages: Sequence[OutgoingEmail], *, batch_size: int = GMAIL_BATCH_LIMIT
+    ) -> dict[int, dict[str, Any]]:
+        """Send messages through Gmail batch requests, keyed by ``OutgoingEmail.email_id``.
+
+        Each result is ``{"status": "sent", "response": ...}`` or
+        ``{"status": "error", "exception": ...}`` so partial failures can be
+        handled per email.
+        """
+
+        if not self.configured:
+            logger.warning("Gmail service not configured; skipping send.")
+            return {message.email_id: {"status": "skipped", "reason": "gmail_not_configured"} for message in messages}
+
+        results: dict[int, dict[str, Any]] = {}
+
+        def _collect(request_id: str, response: Any, exception: Exception | None) -> None:
+            if exception is not None:
+                results[int(request_id)] = {"status": "error", "exception": exception}
+            else:
+                results[int(request_id)] = {"status": "sent", "response": response}
+
+        batch_size = max(1, min(batch_size, GMAIL_BATCH_LIMIT))
+        for start in range(0, len(messages), batch_size):
+            chunk = messages[start : start + batch_size]
+            try:
+                with self._checkout() as service:
+                    batch = self._new_batch(service, _collect)
+                    for message in chunk:
+                        send_data = build_raw_message(
+                            to_address=message.to_address,
+                            subject=message.subject,
+                            html_body=message.html_body,
+                            from_address=message.from_address,
+                            from_name=message.from_name,
+                        )
+                        batch.add(
+                            service.users().messages().send(userId=self.settings.user_id, body=send_data),
+                            request_id=str(message.email_id),
+                        )
+                    batch.execute()
+            except Exception as exc:  # noqa: BLE001 - the whole batch request failed
+                logger.warning("Gmail batch request failed", extra={"size": len(chunk), "error": str(exc)})
+                for message in chunk:
+                    results.setdefault(message.email_id, {"status": "error", "exception": exc})
+
+        logger.info(
+            "Gmail batch send finished",
+            extra={"sent": sum(1 for result in results.values() if result["status"] == "sent"), "total": len(messages)},
+        )
+        return results
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+from app.models import Brand
+from app.services.gmail_client import GmailClient, GmailSettings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAILBOX = "default"
+
+
+def has_own_mailbox(brand: Brand | Any) -> bool:
+    return bool(getattr(brand, "gmail_refresh_token", None))
+
+
+def mailbox_key(brand: Brand | Any) -> str:
+    """Quota key for the Gmail account a brand actually sends through."""
+
+    if has_own_mailbox(brand):
+        return brand.gmail_user_id or f"brand:{brand.id}"
+    return DEFAULT_MAILBOX
+
+
+class GmailClientRegistry:
+    """Lazily built Gmail clients per brand, cached with LRU eviction.
+
+    Brands without their own credentials share ``default``. A cached client is
+    rebuilt when the brand's ``updated_at`` changes, so credential edits take
+    effect on the next send.
+    """
+
+    def __init__(
+        self,
+        *,
+        default: GmailClient,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        token_uri: str = "https://oauth2.googleapis.com/token",
+        api_base_url: str | None = None,
+        max_clients: int = 32,
+        pool_size: int = 2,
+        refresh_margin_seconds: float = 300.0,
+    ) -> None:
+        self.default = default
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_uri = token_uri
+        self.api_base_url = api_base_url
+        self.max_clients = max_clients
+        self.pool_size = pool_size
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._clients: OrderedDict[int, tuple[datetime | None, GmailClient]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def client_for(self, brand: Brand) -> GmailClient:
+        if not has_own_mailbox(brand):
+            client = self.default
+        else:
+            client = self._cached_client(brand)
+        try:
+            client.refresh_if_expiring(self.refresh_margin_seconds)
+        except Exception:  # noqa: BLE001 - the send itself retries the refresh on 401
+            logger.exception("Proactive Gmail token refresh failed", extra={"brand_id": getattr(brand, "id", None)})
+        return client
+
+    def invalidate(self, brand_id: int | None = None) -> None:
+        with self._lock:
+            if brand_id is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(brand_id, None)
+
+    def _cached_client(self, brand: Brand) -> GmailClient:
+        with self._lock:
+            entry = self._clients.get(brand.id)
+            if entry and entry[0] == brand.updated_at:
+                self._clients.move_to_end(brand.id)
+                return entry[1]
+
+        client = GmailClient(
+            GmailSettings(
+                user_id=brand.gmail_user_id or "me",
+                token="",
+                refresh_token=brand.gmail_refresh_token or "",
+                client_id=brand.gmail_client_id or self.client_id or "",
+                client_secret=brand.gmail_client_secret or self.client_secret or "",
+                token_uri=self.token_uri,
+                api_base_url=self.api_base_url,
+            ),
+            pool_size=self.pool_size,
+        )
+        with self._lock:
+            self._clients[brand.id] = (brand.updated_at, client)
+            self._clients.move_to_end(brand.id)
+            while len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        return client
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class IngestionKeys:
+    """The key a new submission claims plus every key that identifies a duplicate of it."""
+
+    claim: str
+    lookup: tuple[str, ...]
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def ingestion_keys(
+    *,
+    brand_slug: str,
+    email: str,
+    idempotency_key: str | None,
+    window_seconds: int,
+    now: datetime,
+) -> IngestionKeys | None:
+    """Derive dedup keys for a lead submission.
+
+    An ``Idempotency-Key`` header wins. Otherwise the submission is keyed on
+    (brand, email, time bucket); the previous bucket is looked up too, so a
+    retry that straddles a bucket boundary is still caught. Returns ``None``
+    when there is no header and content hashing is disabled.
+    """
+
+    if idempotency_key:
+        key = f"key:{_digest(brand_slug, idempotency_key)}"
+        return IngestionKeys(claim=key, lookup=(key,))
+    if window_seconds <= 0:
+        return None
+
+    bucket = int(now.timestamp()) // window_seconds
+    current, previous = (
+        f"hash:{_digest(brand_slug, email.strip().lower(), str(index))}" for index in (bucket, bucket - 1)
+    )
+    return IngestionKeys(claim=current, lookup=(current, previous))
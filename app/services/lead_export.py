@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import Session, select
+
+from app.models import EmailBody, GeneratedEmail, Lead
+from app.services.body_store import decompress_body
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+LEAD_COLUMNS = (
+    "id",
+    "brand_id",
+    "email",
+    "first_name",
+    "last_name",
+    "company",
+    "job_title",
+    "phone_number",
+    "metadata",
+    "created_at",
+)
+EMAIL_COLUMNS = ("id", "campaign_id", "template_id", "subject", "html_body", "status", "sent_at", "created_at")
+CHUNK_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    brand_id: int | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+def _email_columns(include_body: bool) -> tuple[str, ...]:
+    return EMAIL_COLUMNS if include_body else tuple(name for name in EMAIL_COLUMNS if name != "html_body")
+
+
+def export_statement(filters: ExportFilters, *, include_body: bool):  # type: ignore[no-untyped-def]
+    """One row per lead/email pair (leads without emails appear once), ordered by lead."""
+
+    leads = Lead.__table__
+    emails = GeneratedEmail.__table__
+    bodies = EmailBody.__table__
+    columns = [
+        *[leads.c[name].label(f"lead_{name}") for name in LEAD_COLUMNS],
+        *[emails.c[name].label(f"email_{name}") for name in _email_columns(include_body)],
+    ]
+    joined = leads.outerjoin(emails, emails.c.lead_id == leads.c.id)
+    if include_body:
+        columns += [bodies.c.codec.label("body_codec"), bodies.c.data.label("body_data")]
+        joined = joined.outerjoin(bodies, bodies.c.digest == emails.c.body_digest)
+    statement = select(*columns).select_from(joined).order_by(leads.c.id, emails.c.id)
+    if filters.brand_id is not None:
+        statement = statement.where(leads.c.brand_id == filters.brand_id)
+    if filters.created_from is not None:
+        statement = statement.where(leads.c.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        statement = statement.where(leads.c.created_at < filters.created_to)
+    return statement
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _email_record(values: Any, email_columns: tuple[str, ...]) -> dict[str, Any]:
+    record = {name: values[f"email_{name}"] for name in email_columns}
+    if "html_body" in record and values["body_data"] is not None:
+        record["html_body"] = decompress_body(values["body_codec"], values["body_data"])
+    return record
+
+
+def _ndjson_lines(rows: Iterable[Any], email_columns: tuple[str, ...]) -> Iterator[str]:
+    # Rows arrive ordered by lead, so each lead is complete once the next one starts.
+    current: dict[str, Any] | None = None
+    for row in rows:
+        values = row._mapping
+        if current is None or current["id"] != values["lead_id"]:
+            if current is not None:
+                yield json.dumps(current, default=_json_default) + "\n"
+            current = {name: values[f"lead_{name}"] for name in LEAD_COLUMNS}
+            current["emails"] = []
+        if values["email_id"] is not None:
+            current["emails"].append(_email_record(values, email_columns))
+    if current is not None:
+        yield json.dumps(current, default=_json_default) + "\n"
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(rows: Iterable[Any], email_columns: tuple[str, ...]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([f"lead_{name}" for name in LEAD_COLUMNS] + [f"email_{name}" for name in email_columns])
+    for row in rows:
+        values = row._mapping
+        record = [values[f"lead_{name}"] for name in LEAD_COLUMNS]
+        if values["email_id"] is not None:
+            record += _email_record(values, email_columns).values()
+        writer.writerow([_csv_value(value) for value in record])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def _chunked(lines: Iterable[str], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    pending: list[bytes] = []
+    size = 0
+    for line in lines:
+        encoded = line.encode("utf-8")
+        pending.append(encoded)
+        size += len(encoded)
+        if size >= chunk_bytes:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def _gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(
+    session_factory: SessionFactory,
+    filters: ExportFilters,
+    *,
+    export_format: str = "ndjson",
+    include_body: bool = True,
+    gzip: bool = False,
+    yield_per: int = 1000,
+) -> Iterator[bytes]:
+    """Yield the export as byte chunks while reading rows ``yield_per`` at a time.
+
+    The generator owns its session, so it can outlive the request handler that
+    built the ``StreamingResponse``; memory is bounded by one row batch plus
+    one output chunk regardless of export size.
+    """
+
+    email_columns = _email_columns(include_body)
+    with session_factory() as session:
+        statement = export_statement(filters, include_body=include_body).execution_options(yield_per=yield_per)
+        rows = session.exec(statement)
+        lines = _csv_lines(rows, email_columns) if export_format == "csv" else _ndjson_lines(rows, email_columns)
+        chunks = _chunked(lines)
+        yield from _gzipped(chunks) if gzip else chunks
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import func, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import select
+
+from app.models import Lead
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "leads_fts"
+SEARCH_COLUMNS = ("email", "first_name", "last_name", "company", "job_title")
+
+_COLUMN_LIST = ", ".join(SEARCH_COLUMNS)
+_NEW_VALUES = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_OLD_VALUES = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+# External-content FTS5 table: the index stores only tokens, rows live in ``leads``.
+_CREATE_FTS = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({_COLUMN_LIST}, content='leads', content_rowid='id')"
+)
+_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON leads BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON leads BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_COLUMN_LIST} ON leads BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+    END""",
+)
+
+
+def install_lead_search(bind: Engine) -> bool:
+    """Create the FTS5 index over lead contact fields and its sync triggers.
+
+    Only SQLite builds with FTS5 get the index; other backends (or SQLite
+    without the module) fall back to ``LIKE`` matching. An index created on a
+    database that already holds leads is rebuilt from the table.
+    """
+
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.begin() as connection:
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+        ).first()
+        if not exists:
+            try:
+                connection.exec_driver_sql(_CREATE_FTS)
+            except OperationalError:
+                logger.warning("SQLite FTS5 is unavailable; lead search falls back to LIKE matching")
+                return False
+            connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        for trigger in _TRIGGERS:
+            connection.exec_driver_sql(trigger)
+    fts_enabled.cache_clear()
+    return True
+
+
+@lru_cache
+def fts_enabled(bind: Engine) -> bool:
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect() as connection:
+        return (
+            connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+            ).first()
+            is not None
+        )
+
+
+def fts_query(terms: list[str]) -> str:
+    """Prefix-match every term; each is quoted so punctuation like ``@`` or ``.`` stays literal."""
+
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def lead_search_statement(  # type: ignore[no-untyped-def]
+    query: str | None,
+    *,
+    brand_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    use_fts: bool = True,
+):
+    statement = select(Lead)
+    if brand_id is not None:
+        statement = statement.where(Lead.brand_id == brand_id)
+    if created_from is not None:
+        statement = statement.where(Lead.created_at >= created_from)
+    if created_to is not None:
+        statement = statement.where(Lead.created_at < created_to)
+
+    terms = (query or "").split()
+    if not terms:
+        return statement
+    if use_fts:
+        matches = text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match").bindparams(
+            match=fts_query(terms)
+        )
+        return statement.where(Lead.id.in_(matches))
+    for term in terms:
+        pattern = _like_pattern(term)
+        statement = statement.where(
+            or_(*[func.lower(getattr(Lead, column)).like(pattern, escape="\\") for column in SEARCH_COLUMNS])
+        )
+    return statement
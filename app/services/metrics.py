@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached context lookup (sub-millisecond) up to a slow OpenAI call.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Shards:
+    """Per-thread slots of running values, summed on scrape.
+
+    A thread only ever writes its own slot, so recording takes no lock; the
+    lock is taken when a thread records for the first time and when scraping.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._slots: list[list[float]] = []
+
+    def local(self) -> list[float]:
+        slot = getattr(self._local, "slot", None)
+        if slot is None:
+            slot = [0.0] * self._size
+            with self._lock:
+                self._slots.append(slot)
+            self._local.slot = slot
+        return slot
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            slots = list(self._slots)
+        return [sum(column) for column in zip(*slots)] if slots else [0.0] * self._size
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label: str | None = None) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self._children: dict[str, _Shards] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _slot_size(self) -> int:
+        return 1
+
+    def _slot(self, label_value: str) -> list[float]:
+        shards = self._children.get(label_value)
+        if shards is None:
+            with self._lock:
+                shards = self._children.setdefault(label_value, _Shards(self._slot_size()))
+        return shards.local()
+
+    def _labels(self, label_value: str, **extra: str) -> str:
+        pairs = {self.label: label_value} if self.label else {}
+        pairs.update(extra)
+        if not pairs:
+            return ""
+        rendered = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs.items())
+        return "{" + rendered + "}"
+
+    def samples(self) -> Iterator[str]:
+        for label_value, shards in sorted(self._children.items()):
+            yield f"{self.name}{self._labels(label_value)} {_format(shards.totals()[0])}"
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, label_value: str = "", amount: float = 1.0) -> None:
+        self._slot(label_value)[0] += amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, label_value: str = "", amount: float = 1.0) -> None:
+        self._slot(label_value)[0] += amount
+
+    def dec(self, label_value: str = "", amount: float = 1.0) -> None:
+        self._slot(label_value)[0] -= amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, label: str | None = None, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, label)
+
+    def _slot_size(self) -> int:
+        # One count per bucket, the +Inf bucket, then the sum of observations.
+        return len(self.buckets) + 2
+
+    def observe(self, label_value: str, value: float) -> None:
+        slot = self._slot(label_value)
+        slot[bisect_left(self.buckets, value)] += 1
+        slot[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        for label_value, shards in sorted(self._children.items()):
+            totals = shards.totals()
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), totals):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format(bound)
+                yield f"{self.name}_bucket{self._labels(label_value, le=le)} {_format(cumulative)}"
+            yield f"{self.name}_sum{self._labels(label_value)} {_format(totals[-1])}"
+            yield f"{self.name}_count{self._labels(label_value)} {_format(cumulative)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY: list[_Metric] = []
+
+# Seconds per stage for the request being served; None outside a request.
+_REQUEST_TIMINGS: ContextVar[dict[str, float] | None] = ContextVar("request_timings", default=None)
+
+STAGE_SECONDS = Histogram(
+    "salesmailer_stage_duration_seconds", "Time spent in each lead pipeline stage.", label="stage"
+)
+STAGE_ERRORS = Counter("salesmailer_stage_errors_total", "Pipeline stages that raised.", label="stage")
+OPENAI_CACHE_HITS = Counter("salesmailer_openai_cache_hits_total", "Highlight copy served from the response cache.")
+OPENAI_FALLBACKS = Counter(
+    "salesmailer_openai_fallbacks_total", "Highlight copy produced without OpenAI (no API key or no features)."
+)
+HTTP_IN_FLIGHT = Gauge("salesmailer_http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_ERRORS = Counter("salesmailer_http_errors_total", "HTTP requests that failed with a 5xx or an exception.")
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the enclosed block into ``STAGE_SECONDS``; exceptions also count in ``STAGE_ERRORS``."""
+
+    start = perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(name)
+        raise
+    finally:
+        elapsed = perf_counter() - start
+        STAGE_SECONDS.observe(name, elapsed)
+        add_request_time(name, elapsed)
+
+
+@contextmanager
+def request_timings() -> Iterator[dict[str, float]]:
+    """Collect stage durations for the current request.
+
+    The dict is shared by reference, so time recorded in thread-pool workers
+    (which run with a copy of the request's context) lands in it too.
+    """
+
+    timings: dict[str, float] = {}
+    token = _REQUEST_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _REQUEST_TIMINGS.reset(token)
+
+
+def add_request_time(name: str, seconds: float) -> None:
+    timings = _REQUEST_TIMINGS.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def record_copy(openai_notes: dict[str, Any]) -> None:
+    if openai_notes.get("cache_hit"):
+        OPENAI_CACHE_HITS.inc()
+    if openai_notes.get("model_used", "fallback") == "fallback":
+        OPENAI_FALLBACKS.inc()
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware tracking in-flight HTTP requests and server errors."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        failed = False
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            nonlocal failed
+            if message["type"] == "http.response.start" and message["status"] >= 500:
+                failed = True
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            if failed:
+                HTTP_ERRORS.inc()
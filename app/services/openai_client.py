@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import random
 from dataclasses import dataclass
 from typing import Any, Sequence
 
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI, OpenAI
 
 from app.models import Brand, CampaignFeature, Lead
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -13,26 +21,119 @@ class OpenAIConfig:
     model: str = "gpt-4o-mini"
     temperature: float = 0.7
     max_tokens: int = 500
+    base_url: str | None = None
+    timeout_seconds: float = 30.0
+    deadline_seconds: float = 60.0
+    max_concurrency: int = 16
+    max_retries: int = 3
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 8.0
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True
+    return isinstance(exc, openai.APIStatusError) and exc.status_code >= 500
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(header) if header else None
+    except ValueError:
+        return None
+
+
+_BATCH_RESPONSE_FORMAT: dict[str, Any] = {
+    "type": "json_schema",
+    "name": "lead_summaries",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "summaries": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"index": {"type": "integer"}, "summary": {"type": "string"}},
+                    "required": ["index", "summary"],
+                    "additionalProperties": False,
+                },
+            }
+        },
+        "required": ["summaries"],
+        "additionalProperties": False,
+    },
+}
+
+
+def _parse_batch_summaries(text: str) -> dict[int, str]:
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        logger.warning("Batched OpenAI response was not valid JSON")
+        return {}
+    summaries: dict[int, str] = {}
+    for item in payload.get("summaries", []) if isinstance(payload, dict) else []:
+        if isinstance(item, dict) and isinstance(item.get("index"), int) and isinstance(item.get("summary"), str):
+            summaries[item["index"]] = item["summary"]
+    return summaries
+
+
+def _split_usage(total: int | None, parts: int) -> list[int | None]:
+    """Equal shares of ``total`` tokens; the first share also takes the remainder."""
+
+    if total is None or parts == 0:
+        return [None] * parts
+    share, remainder = divmod(total, parts)
+    return [share + remainder] + [share] * (parts - 1)
 
 
 class OpenAIClient:
     """Thin wrapper around the OpenAI client with graceful fallbacks."""
 
-    def __init__(self, *, api_key: str | None = None, config: OpenAIConfig | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        api_key: str | None = None,
+        config: OpenAIConfig | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
         self.api_key = api_key
         self.config = config or OpenAIConfig()
+        self.cache = cache
         self._client: OpenAI | None = None
+        self._async_client: AsyncOpenAI | None = None
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
 
         if self.api_key:
-            self._client = OpenAI(api_key=self.api_key)
+            self._client = OpenAI(
+                api_key=self.api_key,
+                base_url=self.config.base_url,
+                timeout=self.config.timeout_seconds,
+                max_retries=self.config.max_retries,
+            )
+            # Retries are handled by _acreate so the backoff can respect the per-call deadline.
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.config.base_url,
+                timeout=self.config.timeout_seconds,
+                max_retries=0,
+            )
 
-    def _build_prompt(self, brand: Brand, lead: Lead, features: Sequence[CampaignFeature], tone: str | None) -> str:
+    @staticmethod
+    def _feature_lines(features: Sequence[CampaignFeature]) -> list[str]:
         feature_lines = []
         for campaign_feature in features:
             bf = campaign_feature.brand_feature
             feature_lines.append(
                 f"- {bf.feature.name}: {campaign_feature.highlight_text or bf.feature.short_description}"
             )
+        return feature_lines
+
+    def _build_prompt(self, brand: Brand, lead: Lead, features: Sequence[CampaignFeature], tone: str | None) -> str:
+        feature_lines = self._feature_lines(features)
 
         tone_text = tone or brand.default_tone or "professional"
 
@@ -46,6 +147,69 @@ class OpenAIClient:
         )
         return prompt
 
+    def _build_batch_prompt(
+        self, brand: Brand, leads: Sequence[Lead], features: Sequence[CampaignFeature], tone: str | None
+    ) -> str:
+        feature_lines = self._feature_lines(features)
+        lead_lines = [
+            f"{index}. {lead.first_name or ''} {lead.last_name or ''} ({lead.company or 'Unknown company'})"
+            for index, lead in enumerate(leads)
+        ]
+
+        tone_text = tone or brand.default_tone or "professional"
+
+        prompt = (
+            "Compose a short paragraph for a confirmation email for each lead listed below.\n"
+            f"Brand: {brand.name}. Tone: {tone_text}.\n"
+            "Features to highlight:\n"
+            + "\n".join(feature_lines)
+            + "\nInclude a warm thank you and mention that further details are attached via the links provided.\n"
+            "Leads:\n"
+            + "\n".join(lead_lines)
+            + "\nReturn one summary per lead, using the lead number as its index."
+        )
+        return prompt
+
+    def _fallback_copy(self, brand: Brand, lead: Lead, features: Sequence[CampaignFeature]) -> dict[str, Any]:
+        # Deterministic fallback for development
+        return {
+            "summary": (
+                f"Hi {lead.first_name or lead.email}, thank you for connecting with {brand.name}. "
+                "Here are the highlights we're excited to share: "
+                + ", ".join(cf.brand_feature.feature.name for cf in features)
+            ),
+            "model_used": "fallback",
+        }
+
+    def _cache_key(self, brand: Brand, prompt: str) -> str | None:
+        if self.cache is None or not getattr(brand, "openai_cache_enabled", True):
+            return None
+        return ResponseCache.make_key(
+            prompt=prompt,
+            model=self.config.model,
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+        )
+
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        if response.output and response.output[0].content:
+            return "".join(part.text for part in response.output[0].content if hasattr(part, "text"))
+        return ""
+
+    def _parse_response(self, response: Any, cache_key: str | None) -> dict[str, Any]:
+        text_content = self._response_text(response)
+
+        result = {
+            "summary": text_content.strip(),
+            "model_used": self.config.model,
+            "prompt_tokens": getattr(response.usage, "input_tokens", None),
+            "completion_tokens": getattr(response.usage, "output_tokens", None),
+        }
+        if cache_key and result["summary"]:
+            self.cache.set(cache_key, result)
+        return {**result, "cache_hit": False}
+
     def generate_highlight_copy(
         self,
         *,
@@ -60,15 +224,13 @@ class OpenAIClient:
         prompt = self._build_prompt(brand, lead, features, tone)
 
         if not self._client:
-            # Deterministic fallback for development
-            return {
-                "summary": (
-                    f"Hi {lead.first_name or lead.email}, thank you for connecting with {brand.name}. "
-                    "Here are the highlights we're excited to share: "
-                    + ", ".join(cf.brand_feature.feature.name for cf in features)
-                ),
-                "model_used": "fallback",
-            }
+            return self._fallback_copy(brand, lead, features)
+
+        cache_key = self._cache_key(brand, prompt)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cache_hit": True}
 
         response = self._client.responses.create(
             model=self.config.model,
@@ -76,14 +238,131 @@ class OpenAIClient:
             max_output_tokens=self.config.max_tokens,
             input=prompt,
         )
+        return self._parse_response(response, cache_key)
 
-        text_content = ""
-        if response.output and response.output[0].content:
-            text_content = "".join(part.text for part in response.output[0].content if hasattr(part, "text"))
+    async def agenerate_highlight_copy(
+        self,
+        *,
+        brand: Brand,
+        lead: Lead,
+        features: Sequence[CampaignFeature],
+        tone: str | None,
+    ) -> dict[str, Any]:
+        """Async counterpart of :meth:`generate_highlight_copy` for use on the event loop."""
 
-        return {
-            "summary": text_content.strip(),
-            "model_used": self.config.model,
-            "prompt_tokens": getattr(response.usage, "input_tokens", None),
-            "completion_tokens": getattr(response.usage, "output_tokens", None),
-        }
+        if not features:
+            return {"summary": "Thank you for your interest!"}
+
+        prompt = self._build_prompt(brand, lead, features, tone)
+
+        if not self._async_client:
+            return self._fallback_copy(brand, lead, features)
+
+        cache_key = self._cache_key(brand, prompt)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cache_hit": True}
+
+        response = await self._acreate(input=prompt)
+        return self._parse_response(response, cache_key)
+
+    async def agenerate_highlight_copy_batch(
+        self,
+        *,
+        brand: Brand,
+        leads: Sequence[Lead],
+        features: Sequence[CampaignFeature],
+        tone: str | None,
+    ) -> list[dict[str, Any]]:
+        """Generate copy for several leads sharing brand, features and tone with one structured request.
+
+        Leads served from the cache are not sent; leads missing from the
+        structured reply fall back to individual requests.
+        """
+
+        if not features or not self._async_client or len(leads) == 1:
+            return [
+                await self.agenerate_highlight_copy(brand=brand, lead=lead, features=features, tone=tone)
+                for lead in leads
+            ]
+
+        results: list[dict[str, Any] | None] = [None] * len(leads)
+        cache_keys: list[str | None] = []
+        for index, lead in enumerate(leads):
+            cache_key = self._cache_key(brand, self._build_prompt(brand, lead, features, tone))
+            cache_keys.append(cache_key)
+            cached = self.cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                results[index] = {**cached, "cache_hit": True}
+
+        misses = [index for index, result in enumerate(results) if result is None]
+        if len(misses) > 1:
+            response = await self._acreate(
+                input=self._build_batch_prompt(brand, [leads[index] for index in misses], features, tone),
+                max_output_tokens=self.config.max_tokens * len(misses),
+                text={"format": _BATCH_RESPONSE_FORMAT},
+            )
+            summaries = _parse_batch_summaries(self._response_text(response))
+            served = [
+                (index, summaries[position].strip())
+                for position, index in enumerate(misses)
+                if summaries.get(position, "").strip()
+            ]
+            # Usage is reported per request; the leads it served split it so the shares add up to the bill.
+            prompt_shares = _split_usage(getattr(response.usage, "input_tokens", None), len(served))
+            completion_shares = _split_usage(getattr(response.usage, "output_tokens", None), len(served))
+            for (index, summary), prompt_tokens, completion_tokens in zip(served, prompt_shares, completion_shares):
+                result = {
+                    "summary": summary,
+                    "model_used": self.config.model,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "batch_size": len(misses),
+                }
+                if cache_keys[index]:
+                    self.cache.set(cache_keys[index], result)
+                results[index] = {**result, "cache_hit": False}
+
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = await self.agenerate_highlight_copy(
+                    brand=brand, lead=leads[index], features=features, tone=tone
+                )
+        return results  # type: ignore[return-value]
+
+    async def _acreate(self, **request: Any) -> Any:
+        """Call the Responses API under the concurrency limit with jittered exponential backoff."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.deadline_seconds
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                async with self._semaphore:
+                    remaining = deadline - loop.time()
+                    return await asyncio.wait_for(
+                        self._async_client.responses.create(
+                            **{
+                                "model": self.config.model,
+                                "temperature": self.config.temperature,
+                                "max_output_tokens": self.config.max_tokens,
+                                **request,
+                            }
+                        ),
+                        timeout=min(self.config.timeout_seconds, max(remaining, 0.0)),
+                    )
+            except Exception as exc:
+                if attempt >= self.config.max_retries or not _is_retryable(exc):
+                    raise
+                # Full jitter keeps a burst of 429s from retrying in lockstep.
+                delay = random.uniform(0, min(self.config.backoff_max_seconds, self.config.backoff_base_seconds * 2**attempt))
+                delay = max(delay, _retry_after(exc) or 0.0)
+                if loop.time() + delay >= deadline:
+                    raise
+                attempt += 1
+                logger.warning("Retrying OpenAI request", extra={"attempt": attempt, "delay": delay, "error": str(exc)})
+                await asyncio.sleep(delay)
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from datetime import datetime, timedelta
+from typing import Any
+
+from googleapiclient.errors import HttpError
+from sqlalchemy import or_
+from sqlmodel import Session, select, update
+
+from app.models import Brand, GeneratedEmail, Lead
+from app.services.body_store import EmailBodyStore
+from app.services.gmail_client import GmailClient, OutgoingEmail
+from app.services.gmail_registry import mailbox_key
+from app.services.metrics import stage
+from app.services.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+ClientFactory = Callable[[Brand], GmailClient]
+
+_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded")
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, HttpError):
+        status_code = int(getattr(exc.resp, "status", 0) or 0)
+        if status_code == 429 or status_code >= 500:
+            return True
+        detail = f"{exc} {getattr(exc, 'error_details', '')}"
+        return status_code == 403 and any(reason in detail for reason in _RATE_LIMIT_REASONS)
+    return isinstance(exc, (OSError, TimeoutError))
+
+
+def due_emails_statement(now: datetime, limit: int):  # type: ignore[no-untyped-def]
+    return (
+        select(GeneratedEmail.id, Brand)
+        .join(Lead, Lead.id == GeneratedEmail.lead_id)
+        .join(Brand, Brand.id == Lead.brand_id)
+        .where(
+            GeneratedEmail.status == "queued",
+            or_(GeneratedEmail.next_attempt_at.is_(None), GeneratedEmail.next_attempt_at <= now),
+        )
+        .order_by(GeneratedEmail.next_attempt_at, GeneratedEmail.id)
+        .limit(limit)
+    )
+
+
+def sender_mailbox(brand: Brand) -> str:
+    return brand.sender_email or f"info@{brand.slug}.com"
+
+
+class OutboxDispatcher:
+    """Background dispatcher that drains queued ``GeneratedEmail`` rows through Gmail.
+
+    Emails move ``queued`` -> ``sending`` -> ``sent``; failed attempts go back to
+    ``queued`` with an exponential ``next_attempt_at`` until ``max_attempts`` is
+    reached, after which they are marked ``failed``. Each Gmail mailbox has its
+    own token bucket so one busy brand cannot consume another brand's quota,
+    and groups for different mailboxes are sent in parallel.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: SessionFactory,
+        client_for: ClientFactory,
+        body_store: EmailBodyStore | None = None,
+        rate_per_second: float = 1.0,
+        burst: int = 10,
+        max_concurrency: int = 4,
+        max_attempts: int = 5,
+        backoff_base_seconds: float = 30.0,
+        backoff_max_seconds: float = 3600.0,
+        poll_interval_seconds: float = 2.0,
+        batch_size: int = 50,
+    ) -> None:
+        self.session_factory = session_factory
+        self.client_for = client_for
+        self.body_store = body_store or EmailBodyStore()
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def start(self) -> None:
+        if self._thread:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="outbox-send")
+        self._thread = threading.Thread(target=self._run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def bucket_for(self, mailbox: str) -> TokenBucket:
+        with self._buckets_lock:
+            bucket = self._buckets.get(mailbox)
+            if bucket is None:
+                bucket = TokenBucket(rate=self.rate_per_second, capacity=self.burst)
+                self._buckets[mailbox] = bucket
+            return bucket
+
+    def requeue_stale(self, stale_after_seconds: int) -> int:
+        """Return emails stuck in ``sending`` (e.g. after a crash) to the queue."""
+
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+        with self.session_factory() as session:
+            result = session.exec(
+                update(GeneratedEmail)
+                .where(GeneratedEmail.status == "sending", GeneratedEmail.updated_at < cutoff)
+                .values(status="queued", updated_at=datetime.utcnow())
+            )
+            return result.rowcount or 0
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                dispatched = self.dispatch_due()
+            except Exception:  # noqa: BLE001 - keep the dispatcher alive
+                logger.exception("Outbox dispatch cycle failed")
+                dispatched = 0
+            if not dispatched:
+                self._wake.wait(self.poll_interval_seconds)
+                self._wake.clear()
+
+    def dispatch_due(self) -> int:
+        """Claim due emails and hand them to the send pool; returns how many were dispatched.
+
+        Claimed emails are grouped per Gmail mailbox and each group is sent as
+        Gmail batch requests, so one pool slot covers up to ``batch_size`` emails.
+        """
+
+        now = datetime.utcnow()
+        due: dict[str, list[int]] = {}
+        deferred: dict[int, datetime] = {}
+        claimed_groups: list[list[int]] = []
+        with self.session_factory() as session:
+            for email_id, brand in session.exec(due_emails_statement(now, self.batch_size)).all():
+                due.setdefault(mailbox_key(brand), []).append(email_id)
+
+            for mailbox, email_ids in due.items():
+                # The slot is taken before any tokens, so a group that cannot be sent this cycle keeps
+                # its mailbox's quota. It is pushed back one poll interval, which lets the mailboxes
+                # queued behind it reach the next free slot first.
+                if not self._slots.acquire(blocking=False):
+                    retry_at = now + timedelta(seconds=self.poll_interval_seconds)
+                    deferred.update(dict.fromkeys(email_ids, retry_at))
+                    continue
+
+                bucket = self.bucket_for(mailbox)
+                sendable = []
+                for email_id in email_ids:
+                    if bucket.try_acquire():
+                        sendable.append(email_id)
+                    else:
+                        deferred[email_id] = now + timedelta(seconds=bucket.wait_time())
+
+                claimed = []
+                if sendable:
+                    claimed = list(
+                        session.exec(
+                            update(GeneratedEmail)
+                            .where(GeneratedEmail.id.in_(sendable), GeneratedEmail.status == "queued")
+                            .values(status="sending", updated_at=now)
+                            .returning(GeneratedEmail.id)
+                        ).scalars()
+                    )
+                if len(claimed) < len(sendable):
+                    # Rows already claimed elsewhere (or no longer queued) give their tokens back.
+                    bucket.release(len(sendable) - len(claimed))
+                if claimed:
+                    claimed_groups.append(claimed)
+                else:
+                    self._slots.release()
+
+            for email_id, next_attempt_at in deferred.items():
+                session.exec(
+                    update(GeneratedEmail)
+                    .where(GeneratedEmail.id == email_id, GeneratedEmail.status == "queued")
+                    .values(next_attempt_at=next_attempt_at)
+                )
+            session.commit()
+
+        for email_ids in claimed_groups:
+            self._executor.submit(self._deliver, email_ids)
+        return sum(len(email_ids) for email_ids in claimed_groups)
+
+    def _deliver(self, email_ids: list[int]) -> None:
+        try:
+            with self.session_factory() as session:
+                rows = session.exec(
+                    select(GeneratedEmail, Lead, Brand)
+                    .join(Lead, Lead.id == GeneratedEmail.lead_id)
+                    .join(Brand, Brand.id == Lead.brand_id)
+                    .where(GeneratedEmail.id.in_(email_ids))
+                ).all()
+                if not rows:
+                    return
+
+                emails = {generated.id: generated for generated, _, _ in rows}
+                self.body_store.hydrate(session, list(emails.values()))
+                # Brands can share a mailbox quota yet hold their own credentials, so each brand
+                # sends through its own client.
+                by_brand: dict[int, tuple[Brand, list[OutgoingEmail]]] = {}
+                for generated, lead, brand in rows:
+                    by_brand.setdefault(brand.id, (brand, []))[1].append(
+                        OutgoingEmail(
+                            email_id=generated.id,
+                            to_address=lead.email,
+                            subject=generated.subject,
+                            html_body=generated.html_body,
+                            from_address=sender_mailbox(brand),
+                            from_name=brand.sender_name or brand.name,
+                        )
+                    )
+
+                results: dict[int, dict[str, Any]] = {}
+                for brand, messages in by_brand.values():
+                    try:
+                        with stage("gmail_send_batch"):
+                            results.update(self.client_for(brand).send_many(messages))
+                    except Exception as exc:  # noqa: BLE001 - applied to every email of this brand
+                        results.update(
+                            {message.email_id: {"status": "error", "exception": exc} for message in messages}
+                        )
+
+                sent_at = datetime.utcnow()
+                for email_id, generated in emails.items():
+                    generated.send_attempts += 1
+                    result = results.get(email_id) or {"status": "error", "exception": RuntimeError("no response")}
+                    if result["status"] == "sent":
+                        generated.status = "sent"
+                        generated.sent_at = sent_at
+                        generated.next_attempt_at = None
+                        generated.last_error = None
+                    elif result["status"] == "error":
+                        self._record_error(generated, result["exception"])
+                    else:
+                        self._mark_failed(generated, str(result.get("reason") or result["status"]))
+                    session.add(generated)
+        except Exception:  # noqa: BLE001 - the rows are recovered by requeue_stale
+            logger.exception("Outbox delivery crashed", extra={"email_ids": email_ids})
+        finally:
+            self._slots.release()
+            self._wake.set()
+
+    def _record_error(self, generated: GeneratedEmail, exc: BaseException) -> None:
+        if not _is_retryable(exc) or generated.send_attempts >= self.max_attempts:
+            logger.warning("Outbox send failed permanently", extra={"email_id": generated.id, "error": str(exc)})
+            self._mark_failed(generated, str(exc))
+            return
+
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (generated.send_attempts - 1))
+        generated.status = "queued"
+        generated.last_error = str(exc)
+        generated.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    @staticmethod
+    def _mark_failed(generated: GeneratedEmail, reason: str) -> None:
+        generated.status = "failed"
+        generated.last_error = reason
+        generated.next_attempt_at = None
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from types import FrameType
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.services.metrics import request_timings
+
+logger = logging.getLogger(__name__)
+
+# Server-Timing entries and the request stages (see ``metrics.stage``) each one adds up.
+SERVER_TIMING_STAGES = {
+    "db": ("sql", "db_commit"),
+    "openai": ("openai",),
+    "render": ("render",),
+    "gmail": ("gmail_send",),
+}
+
+# Innermost frames of threads that are parked rather than working.
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+
+
+def server_timing(timings: dict[str, float], total_seconds: float) -> str:
+    entries = []
+    for name, stages in SERVER_TIMING_STAGES.items():
+        if any(stage in timings for stage in stages):
+            entries.append(f"{name};dur={sum(timings.get(stage, 0.0) for stage in stages) * 1000:.1f}")
+    entries.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def _folded_stack(frame: FrameType | None) -> str | None:
+    if frame is None or frame.f_code.co_filename.endswith(_IDLE_FILES):
+        return None
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of busy threads every ``interval`` seconds.
+
+    Sampling from a side thread sees work in both the event loop and the
+    thread pool running sync handlers, which a per-thread profiler such as
+    cProfile would miss, and costs the request nothing between samples.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _folded_stack(frame)
+                if stack:
+                    self.stacks[stack] += 1
+
+
+class ProfilerControl:
+    """Runtime switch for request profiling; profiles are written as folded stacks.
+
+    When enabled, a request is profiled if it carries ``header`` or wins a
+    ``sample_rate`` draw. Each profile lands in ``directory`` as a ``.folded``
+    file that flamegraph.pl or speedscope can open.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = False,
+        sample_rate: float = 0.0,
+        header: str = "X-Profile",
+        directory: str = "profiles",
+        interval_ms: float = 5.0,
+    ) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.header = header
+        self.directory = Path(directory)
+        self.interval_ms = interval_ms
+        self.profiles_written = 0
+
+    def should_profile(self, scope: dict[str, Any]) -> bool:
+        if not self.enabled:
+            return False
+        if self.header in Headers(scope=scope):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def profile_name(self, scope: dict[str, Any]) -> str:
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope.get("path", "")).strip("_") or "root"
+        return f"{datetime.utcnow():%Y%m%dT%H%M%S}-{scope.get('method', 'GET')}-{path}-{uuid.uuid4().hex[:8]}.folded"
+
+    def write(self, name: str, profiler: SamplingProfiler) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            lines = [f"{stack} {count}\n" for stack, count in profiler.stacks.most_common()]
+            (self.directory / name).write_text("".join(lines), encoding="utf-8")
+        except OSError:
+            logger.exception("Could not write request profile", extra={"profile": name})
+            return
+        self.profiles_written += 1
+        logger.info("Wrote request profile", extra={"profile": name, "samples": profiler.samples})
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "header": self.header,
+            "directory": str(self.directory),
+            "interval_ms": self.interval_ms,
+            "profiles_written": self.profiles_written,
+        }
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding a ``Server-Timing`` header and, when selected, profiling the request."""
+
+    def __init__(self, app: Any, profiler: ProfilerControl | None = None) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampler = None
+        profile_name = None
+        if self.profiler is not None and self.profiler.should_profile(scope):
+            sampler = SamplingProfiler(self.profiler.interval_ms / 1000)
+            profile_name = self.profiler.profile_name(scope)
+            sampler.start()
+
+        start = perf_counter()
+        with request_timings() as timings:
+
+            async def send_wrapper(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(timings, perf_counter() - start))
+                    if profile_name:
+                        headers.append("X-Profile-Name", profile_name)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if sampler is not None:
+                    await run_in_threadpool(self._finish_profile, sampler, profile_name)
+
+    def _finish_profile(self, sampler: SamplingProfiler, name: str) -> None:
+        sampler.stop()
+        self.profiler.write(name, sampler)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+
+class ResponseCache:
+    """Content-addressed cache for model responses.
+
+    Entries live in a bounded in-memory LRU with a TTL. When ``path`` is set a
+    SQLite file backs the memory tier so responses survive restarts; misses in
+    memory fall through to it and hits are promoted back into memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 86400.0,
+        max_entries: int = 2048,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(*, prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+        payload = json.dumps(
+            {"prompt": prompt, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[1])
+            if entry:
+                del self._entries[key]
+
+            value = self._load_persistent(key, now)
+            if value is None:
+                self.misses += 1
+                return None
+            self._store_memory(key, value[0], value[1])
+            self.hits += 1
+            return dict(value[1])
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        expires_at = self._clock() + self.ttl_seconds
+        with self._lock:
+            self._store_memory(key, expires_at, dict(value))
+            if self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+
+    def prune(self) -> int:
+        """Remove expired entries from both tiers; returns the number of persistent rows removed."""
+
+        now = self._clock()
+        with self._lock:
+            for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+            if not self._db:
+                return 0
+            return self._db.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db:
+                self._db.close()
+                self._db = None
+
+    def _store_memory(self, key: str, expires_at: float, value: dict[str, Any]) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_persistent(self, key: str, now: float) -> tuple[float, dict[str, Any]] | None:
+        if not self._db:
+            return None
+        row = self._db.execute(
+            "SELECT value, expires_at FROM response_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if not row:
+            return None
+        return row[1], json.loads(row[0])
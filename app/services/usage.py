@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import and_, func, insert, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from app.models import GeneratedEmail, UsageDaily, UsageEvent
+
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+_ROLLUP_KEY = ("day", "brand_id", "campaign_id", "model")
+_COUNTERS = ("requests", "cache_hits", "prompt_tokens", "completion_tokens")
+
+# Dimensions a report can be broken down by, mapped to their rollup column.
+GROUP_BY = {"day": "day", "brand": "brand_id", "campaign": "campaign_id", "model": "model"}
+
+Prices = Mapping[str, Sequence[float]]
+
+
+@dataclass(frozen=True)
+class UsageFilters:
+    brand_id: int | None = None
+    campaign_id: int | None = None
+    model: str | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+
+
+def usage_event(brand_id: int, generated: GeneratedEmail) -> dict[str, Any]:
+    """Usage row for ``generated``, taken from the OpenAI notes the renderer stored in ``extra``.
+
+    Cache hits record zero tokens: the reply was served without an API call,
+    so only misses count towards spend.
+    """
+
+    notes = (generated.extra or {}).get("openai") or {}
+    cache_hit = bool(notes.get("cache_hit"))
+    return {
+        "generated_email_id": generated.id,
+        "brand_id": brand_id,
+        "campaign_id": generated.campaign_id,
+        "model": notes.get("model_used") or "none",
+        "prompt_tokens": 0 if cache_hit else notes.get("prompt_tokens") or 0,
+        "completion_tokens": 0 if cache_hit else notes.get("completion_tokens") or 0,
+        "cache_hit": cache_hit,
+        "created_at": generated.created_at or datetime.utcnow(),
+    }
+
+
+def _rollup_increments(events: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    increments: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for event in events:
+        key = (event["created_at"].date(), event["brand_id"], event["campaign_id"] or 0, event["model"])
+        row = increments.setdefault(key, {**dict(zip(_ROLLUP_KEY, key)), **dict.fromkeys(_COUNTERS, 0)})
+        row["requests"] += 1
+        row["cache_hits"] += int(event["cache_hit"])
+        row["prompt_tokens"] += event["prompt_tokens"]
+        row["completion_tokens"] += event["completion_tokens"]
+    return list(increments.values())
+
+
+def record_usage(session: Session, emails: Sequence[tuple[int, GeneratedEmail]]) -> None:
+    """Write usage events for flushed ``(brand_id, email)`` pairs and bump their daily rollups.
+
+    Runs inside the caller's transaction, so usage commits (or rolls back)
+    together with the emails it describes.
+    """
+
+    events = [usage_event(brand_id, generated) for brand_id, generated in emails]
+    if not events:
+        return
+    session.exec(insert(UsageEvent.__table__).values(events))
+
+    rollups = UsageDaily.__table__
+    now = datetime.utcnow()
+    increments = _rollup_increments(events)
+    upsert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        statement = upsert(rollups).values([{**row, "updated_at": now} for row in increments])
+        statement = statement.on_conflict_do_update(
+            index_elements=list(_ROLLUP_KEY),
+            set_={
+                **{name: rollups.c[name] + statement.excluded[name] for name in _COUNTERS},
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        session.exec(statement)
+        return
+
+    for row in increments:
+        updated = session.exec(
+            update(rollups)
+            .where(and_(*[rollups.c[name] == row[name] for name in _ROLLUP_KEY]))
+            .values({**{name: rollups.c[name] + row[name] for name in _COUNTERS}, "updated_at": now})
+        )
+        if not updated.rowcount:
+            session.exec(insert(rollups).values({**row, "updated_at": now}))
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, prices: Prices) -> float:
+    """USD cost from ``prices`` (model -> input/output price per million tokens); unknown models cost 0."""
+
+    input_price, output_price = prices.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def _totals(requests: int, cache_hits: int, prompt_tokens: int, completion_tokens: int, cost: float) -> dict[str, Any]:
+    return {
+        "requests": requests,
+        "cache_hits": cache_hits,
+        "cache_hit_ratio": round(cache_hits / requests, 4) if requests else 0.0,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "estimated_cost_usd": round(cost, 6),
+    }
+
+
+def usage_report(
+    session: Session,
+    filters: UsageFilters,
+    *,
+    prices: Prices,
+    group_by: str | None = None,
+) -> dict[str, Any]:
+    """Totals (and optionally one breakdown) read from the daily rollups only.
+
+    The work depends on the number of rollup rows in range, which grows with
+    days x brands x campaigns x models rather than with email volume.
+    """
+
+    rollups = UsageDaily.__table__
+    dimension = rollups.c[GROUP_BY[group_by]] if group_by else None
+    keys = [rollups.c.model] if dimension is None or dimension is rollups.c.model else [dimension, rollups.c.model]
+    statement = select(*keys, *[func.sum(rollups.c[name]) for name in _COUNTERS]).group_by(*keys)
+    if filters.brand_id is not None:
+        statement = statement.where(rollups.c.brand_id == filters.brand_id)
+    if filters.campaign_id is not None:
+        statement = statement.where(rollups.c.campaign_id == filters.campaign_id)
+    if filters.model is not None:
+        statement = statement.where(rollups.c.model == filters.model)
+    if filters.date_from is not None:
+        statement = statement.where(rollups.c.day >= filters.date_from)
+    if filters.date_to is not None:
+        statement = statement.where(rollups.c.day <= filters.date_to)
+
+    # Cost is priced per model, so rows are always split by model and folded here.
+    grand = [0, 0, 0, 0, 0.0]
+    groups: dict[Any, list[Any]] = {}
+    for row in session.exec(statement.order_by(*keys)).all():
+        *key, requests, cache_hits, prompt_tokens, completion_tokens = row
+        model = key[-1]
+        values = (requests, cache_hits, prompt_tokens, completion_tokens)
+        cost = estimate_cost(model, prompt_tokens, completion_tokens, prices)
+        targets = [grand]
+        if group_by:
+            targets.append(groups.setdefault(key[0], [0, 0, 0, 0, 0.0]))
+        for target in targets:
+            for position, value in enumerate(values):
+                target[position] += value
+            target[4] += cost
+
+    breakdown = []
+    for value, sums in groups.items():
+        if group_by == "campaign" and value == 0:
+            value = None
+        breakdown.append({GROUP_BY[group_by]: value, **_totals(*sums)})
+    return {"totals": _totals(*grand), "group_by": group_by, "groups": breakdown}
@@ -41,6 +41,19 @@ async function api(path, { method = "GET", body } = {}) {
   return response.json();
 }
 
+async function apiList(path) {
+  const items = [];
+  let cursor = null;
+  do {
+    const separator = path.includes("?") ? "&" : "?";
+    const query = cursor ? `${separator}limit=500&cursor=${encodeURIComponent(cursor)}` : `${separator}limit=500`;
+    const page = await api(`${path}${query}`);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 function resolveKey(item, key) {
   if (typeof key === "function") {
     return key(item);
@@ -248,14 +261,14 @@ function displayPreview({ subject, html_body: htmlBody, tone }) {
 }
 
 async function loadBrands() {
-  state.brands = await api("/brands/");
+  state.brands = await apiList("/brands/");
   renderBrandList();
   await loadBrandFeatures();
   renderCampaignFeatureSelect();
 }
 
 async function loadFeatures() {
-  state.features = await api("/features/");
+  state.features = await apiList("/features/");
   renderFeatureList();
 }
 
@@ -272,12 +285,12 @@ async function loadBrandFeatures() {
 }
 
 async function loadTemplates() {
-  state.templates = await api("/templates/");
+  state.templates = await apiList("/templates/");
   renderTemplateList();
 }
 
 async function loadCampaigns() {
-  state.campaigns = await api("/campaigns/");
+  state.campaigns = await apiList("/campaigns/");
   renderCampaignList();
   const featurePairs = await Promise.all(
     state.campaigns.map(async (campaign) => {
@@ -391,7 +404,7 @@ document.addEventListener("DOMContentLoaded", () => {
     const data = Object.fromEntries(new FormData(event.target).entries());
     try {
       const lead = await api("/leads/", { method: "POST", body: data });
-      const emails = await api(`/leads/${lead.id}/emails`);
+      const emails = await apiList(`/leads/${lead.id}/emails?include_body=true`);
       if (emails.length) {
         const latest = emails[emails.length - 1];
         const brand = state.brands.find((b) => b.id === lead.brand_id);
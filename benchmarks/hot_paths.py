@@ -0,0 +1,456 @@
+"""Time the render, prompt-building, MIME and lead query hot paths.
+
+Every case calls the same code the application runs: ``EmailRenderer.render``
+across template sizes and feature counts, ``OpenAIClient._build_prompt`` and
+``_build_batch_prompt``, the MIME assembly behind ``GmailClient.send_html_email``
+and the ``leads.py`` query helpers against seeded SQLite databases. Nothing
+touches the network. Each case is timed with ``timeit`` auto-ranging and the
+best and median per-call times over ``--repeat`` runs are reported.
+
+Results can be written as JSON with ``--json`` and compared against an earlier
+run with ``--compare``; the exit status is non-zero when any case's median got
+slower than ``--threshold`` times its baseline.
+
+Usage::
+
+    python -m benchmarks.hot_paths --json bench.json
+    python -m benchmarks.hot_paths --lead-counts 1000 100000 1000000 --data-dir .bench-data
+    python -m benchmarks.hot_paths --compare bench.json --filter render
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from itertools import cycle
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, select
+
+from app.config import Settings
+from app.database import create_db_engine
+from app.models import (
+    Brand,
+    BrandFeature,
+    Campaign,
+    CampaignFeature,
+    EmailBody,
+    EmailTemplate,
+    Feature,
+    GeneratedEmail,
+    Lead,
+)
+from app.pagination import PageParams, paginate
+from app.routers.leads import (
+    DEFAULT_TEMPLATE,
+    active_campaign_statement,
+    brand_template_statement,
+    campaign_features_statement,
+    lead_emails_statement,
+)
+from app.services.email_renderer import EmailRenderer, RenderContext
+from app.services.gmail_client import build_raw_message
+from app.services.lead_search import install_lead_search, lead_search_statement
+from app.services.openai_client import OpenAIClient
+
+TEMPLATE_SIZES = {"1KiB": 1024, "16KiB": 16 * 1024, "128KiB": 128 * 1024}
+FEATURE_COUNTS = (1, 5, 20)
+BODY_SIZES = {"1KiB": 1024, "16KiB": 16 * 1024, "128KiB": 128 * 1024}
+DEFAULT_LEAD_COUNTS = (1_000, 10_000, 100_000)
+BRANDS = 10
+SEED_CHUNK = 10_000
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka")
+FIRST_NAMES = ("Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken")
+EPOCH = datetime(2024, 1, 1)
+
+Case = tuple[str, str, dict[str, Any], Callable[[], object]]
+
+
+def _features(count: int) -> list[CampaignFeature]:
+    return [
+        CampaignFeature(
+            id=index,
+            campaign_id=1,
+            brand_feature_id=index,
+            sort_order=index,
+            highlight_text=f"Highlight {index}: collect and showcase verified reviews.",
+            brand_feature=BrandFeature(
+                id=index,
+                brand_id=1,
+                feature_id=index,
+                asset_label=f"Guide {index}",
+                asset_url=f"https://example.com/assets/{index}",
+                cta_text="Learn more",
+                feature=Feature(
+                    id=index,
+                    name=f"Feature {index}",
+                    short_description="Short description of the feature.",
+                    long_description="A longer description of the feature. " * 4,
+                ),
+            ),
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def _brand() -> Brand:
+    return Brand(id=1, name="Bench", slug="bench", sender_name="Bench Team", default_tone="friendly")
+
+
+def _lead(index: int = 0) -> Lead:
+    return Lead(
+        id=index + 1,
+        brand_id=1,
+        email=f"lead{index}@example.com",
+        first_name=FIRST_NAMES[index % len(FIRST_NAMES)],
+        last_name="Lovelace",
+        company=COMPANIES[index % len(COMPANIES)],
+    )
+
+
+def _template(size: int) -> EmailTemplate:
+    # Static filler stands in for the layout and styling of a real branded template.
+    filler = '<p style="margin:0 0 12px;font-family:Arial,sans-serif">Static brand copy and footer text.</p>\n'
+    repeats = max(0, (size - len(DEFAULT_TEMPLATE)) // len(filler))
+    return EmailTemplate(
+        id=1,
+        brand_id=1,
+        name=f"bench-{size}",
+        subject_template="Thanks {{ lead.first_name }}, welcome to {{ brand.name }}",
+        html_body=DEFAULT_TEMPLATE + filler * repeats,
+        is_default=True,
+        updated_at=EPOCH,
+    )
+
+
+def render_cases() -> Iterator[Case]:
+    renderer = EmailRenderer()
+    for size_label, size in TEMPLATE_SIZES.items():
+        template = _template(size)
+        for count in FEATURE_COUNTS:
+            context = RenderContext(
+                lead=_lead(),
+                brand=_brand(),
+                campaign=None,
+                features=_features(count),
+                tone="friendly",
+                openai_notes={"summary": "Thanks for your interest. " * 5},
+            )
+            yield (
+                f"render[template={size_label},features={count}]",
+                "render",
+                {"template_bytes": len(template.html_body), "features": count},
+                lambda template=template, context=context: renderer.render(template, context),
+            )
+
+
+def prompt_cases() -> Iterator[Case]:
+    client = OpenAIClient()
+    brand, lead = _brand(), _lead()
+    for count in FEATURE_COUNTS:
+        features = _features(count)
+        yield (
+            f"prompt[features={count}]",
+            "prompt",
+            {"features": count},
+            lambda features=features: client._build_prompt(brand, lead, features, "friendly"),
+        )
+    leads = [_lead(index) for index in range(20)]
+    features = _features(5)
+    yield (
+        "prompt_batch[leads=20,features=5]",
+        "prompt",
+        {"leads": 20, "features": 5},
+        lambda: client._build_batch_prompt(brand, leads, features, "friendly"),
+    )
+
+
+def mime_cases() -> Iterator[Case]:
+    for label, size in BODY_SIZES.items():
+        html_body = ("<p>" + "x" * 96 + "</p>\n") * (size // 104)
+        yield (
+            f"mime[body={label}]",
+            "mime",
+            {"body_bytes": len(html_body)},
+            lambda html_body=html_body: build_raw_message(
+                to_address="lead@example.com",
+                subject="Thanks for reaching out",
+                html_body=html_body,
+                from_address="team@example.com",
+                from_name="Bench Team",
+            ),
+        )
+
+
+def _seed(engine, lead_count: int) -> None:  # type: ignore[no-untyped-def]
+    """Brands with one active campaign, features and templates, then leads with one email each."""
+
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(lead_count)
+    with engine.begin() as connection:
+        stamps = {"created_at": EPOCH, "updated_at": EPOCH}
+        connection.execute(
+            Brand.__table__.insert(),
+            [{"id": brand, "name": f"Brand {brand}", "slug": f"brand-{brand}", **stamps} for brand in range(1, BRANDS + 1)],
+        )
+        connection.execute(
+            Feature.__table__.insert(),
+            [{"id": index, "name": f"Feature {index}", "short_description": "Feature", **stamps} for index in range(1, 6)],
+        )
+        connection.execute(
+            BrandFeature.__table__.insert(),
+            [
+                {"id": (brand - 1) * 5 + index, "brand_id": brand, "feature_id": index, **stamps}
+                for brand in range(1, BRANDS + 1)
+                for index in range(1, 6)
+            ],
+        )
+        connection.execute(
+            Campaign.__table__.insert(),
+            [
+                {"id": (brand - 1) * 3 + index, "brand_id": brand, "name": f"Campaign {index}", "is_active": index == 1, **stamps}
+                for brand in range(1, BRANDS + 1)
+                for index in range(1, 4)
+            ],
+        )
+        connection.execute(
+            CampaignFeature.__table__.insert(),
+            [
+                {
+                    "campaign_id": (brand - 1) * 3 + 1,
+                    "brand_feature_id": (brand - 1) * 5 + index,
+                    "sort_order": index,
+                    **stamps,
+                }
+                for brand in range(1, BRANDS + 1)
+                for index in range(1, 6)
+            ],
+        )
+        connection.execute(
+            EmailTemplate.__table__.insert(),
+            [
+                {"brand_id": brand, "name": f"Template {index}", "html_body": DEFAULT_TEMPLATE, "is_default": index == 1, **stamps}
+                for brand in range(1, BRANDS + 1)
+                for index in range(1, 4)
+            ],
+        )
+        connection.execute(
+            EmailBody.__table__.insert(),
+            [{"digest": "0" * 64, "codec": "zlib", "size": 0, "data": b"", "created_at": EPOCH}],
+        )
+
+    for start in range(0, lead_count, SEED_CHUNK):
+        ids = range(start + 1, min(start + SEED_CHUNK, lead_count) + 1)
+        leads = []
+        for lead_id in ids:
+            created = EPOCH + timedelta(minutes=lead_id)
+            leads.append(
+                {
+                    "id": lead_id,
+                    "brand_id": rng.randint(1, BRANDS),
+                    "email": f"lead{lead_id}@{rng.choice(COMPANIES).lower()}.example",
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": f"Surname{lead_id % 997}",
+                    "company": rng.choice(COMPANIES),
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+        emails = [
+            {
+                "lead_id": lead["id"],
+                "campaign_id": (lead["brand_id"] - 1) * 3 + 1,
+                "subject": "Thanks",
+                "html_body": "",
+                "body_digest": "0" * 64,
+                "status": "sent",
+                "created_at": lead["created_at"],
+                "updated_at": lead["created_at"],
+            }
+            for lead in leads
+        ]
+        with engine.begin() as connection:
+            connection.execute(Lead.__table__.insert(), leads)
+            connection.execute(GeneratedEmail.__table__.insert(), emails)
+    install_lead_search(engine)
+
+
+def _lead_database(directory: Path, lead_count: int):  # type: ignore[no-untyped-def]
+    path = directory / f"leads-{lead_count}.db"
+    engine = create_db_engine(Settings(database_url=f"sqlite:///{path}", server_timing_enabled=False))
+    seeded = False
+    if path.exists():
+        with engine.connect() as connection:
+            try:
+                seeded = connection.execute(select(func.count()).select_from(Lead.__table__)).scalar_one() == lead_count
+            except Exception:  # noqa: BLE001 - a partial or foreign file is simply reseeded
+                seeded = False
+    if not seeded:
+        engine.dispose()
+        path.unlink(missing_ok=True)
+        engine = create_db_engine(Settings(database_url=f"sqlite:///{path}", server_timing_enabled=False))
+        print(f"seeding {lead_count} leads into {path} ...", file=sys.stderr)
+        _seed(engine, lead_count)
+    return engine
+
+
+def _fetch(session: Session, statement) -> list[Any]:  # type: ignore[no-untyped-def]
+    return session.exec(statement).all()
+
+
+def query_cases(session: Session, lead_count: int) -> Iterator[Case]:
+    rng = random.Random(0)
+    brand_ids = cycle(rng.randint(1, BRANDS) for _ in range(256))
+    lead_ids = cycle(rng.randint(1, lead_count) for _ in range(256))
+    first_page = PageParams(limit=50, after_id=None)
+    window_start = EPOCH + timedelta(minutes=lead_count // 2)
+    params = {"leads": lead_count}
+
+    def case(name: str, run: Callable[[], object]) -> Case:
+        return f"query[{name},leads={lead_count}]", "query", {**params, "query": name}, run
+
+    yield case("active_campaign", lambda: _fetch(session, active_campaign_statement(next(brand_ids)).limit(1)))
+    yield case("brand_template", lambda: _fetch(session, brand_template_statement(next(brand_ids)).limit(1)))
+    yield case(
+        "campaign_features", lambda: _fetch(session, campaign_features_statement((next(brand_ids) - 1) * 3 + 1))
+    )
+    yield case(
+        "lead_emails", lambda: _fetch(session, lead_emails_statement(next(lead_ids), include_body=False))
+    )
+    yield case(
+        "browse_brand_window",
+        lambda: paginate(
+            session,
+            lead_search_statement(
+                None, brand_id=next(brand_ids), created_from=window_start, created_to=window_start + timedelta(days=7)
+            ),
+            Lead.id,
+            first_page,
+        ),
+    )
+    yield case(
+        "search_fts",
+        lambda: paginate(session, lead_search_statement("globex ada", use_fts=True), Lead.id, first_page),
+    )
+    yield case(
+        "search_like",
+        lambda: paginate(session, lead_search_statement("globex ada", use_fts=False), Lead.id, first_page),
+    )
+
+
+def measure(run: Callable[[], object], repeat: int) -> dict[str, Any]:
+    timer = timeit.Timer(run)
+    loops, _ = timer.autorange()
+    timings = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+    median = statistics.median(timings)
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "min_us": round(min(timings) * 1e6, 3),
+        "median_us": round(median * 1e6, 3),
+        "ops_per_sec": round(1 / median, 1),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+    *, lead_counts: list[int], repeat: int, data_dir: Path | None, name_filter: str | None, skip_queries: bool
+) -> list[dict[str, Any]]:
+    results = []
+
+    def record(cases: Iterator[Case]) -> None:
+        for name, group, case_params, call in cases:
+            if name_filter and name_filter not in name:
+                continue
+            call()  # warm caches (compiled templates, statement cache) before timing
+            result = {"name": name, "group": group, "params": case_params, **measure(call, repeat)}
+            print(f"{name:<52}{result['median_us']:>14.1f} us{result['ops_per_sec']:>14.1f} ops/s")
+            results.append(result)
+
+    record(render_cases())
+    record(prompt_cases())
+    record(mime_cases())
+    if skip_queries:
+        return results
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = data_dir or Path(scratch)
+        directory.mkdir(parents=True, exist_ok=True)
+        for lead_count in lead_counts:
+            engine = _lead_database(directory, lead_count)
+            with Session(engine) as session:
+                record(query_cases(session, lead_count))
+            engine.dispose()
+    return results
+
+
+def compare(results: list[dict[str, Any]], baseline_path: Path, threshold: float) -> list[str]:
+    baseline = {entry["name"]: entry for entry in json.loads(baseline_path.read_text())["results"]}
+    regressions = []
+    print(f"\ncompared with {baseline_path}:")
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None:
+            continue
+        ratio = result["median_us"] / previous["median_us"] if previous["median_us"] else 1.0
+        flag = "SLOWER" if ratio > threshold else ""
+        print(f"{result['name']:<52}{previous['median_us']:>12.1f} -> {result['median_us']:>10.1f} us  x{ratio:.2f} {flag}")
+        if flag:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lead-counts", type=int, nargs="+", default=list(DEFAULT_LEAD_COUNTS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", type=Path, help="keep seeded databases here and reuse them on later runs")
+    parser.add_argument("--filter", dest="name_filter", help="only run cases whose name contains this text")
+    parser.add_argument("--skip-queries", action="store_true", help="skip the seeded-database query cases")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.10, help="median ratio counted as a regression")
+    args = parser.parse_args()
+
+    results = run(
+        lead_counts=args.lead_counts,
+        repeat=args.repeat,
+        data_dir=args.data_dir,
+        name_filter=args.name_filter,
+        skip_queries=args.skip_queries,
+    )
+    # Compare first: the baseline may be the same file this run is about to overwrite.
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    if args.json:
+        meta = {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        args.json.write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
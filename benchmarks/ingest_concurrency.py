@@ -0,0 +1,119 @@
+"""Compare concurrent lead-ingest throughput for the default and production SQLite profiles.
+
+Each simulated ingest mirrors the write path of ``POST /leads/``: insert a lead,
+insert its generated email and commit. Inserts go through SQLAlchemy Core on the
+application's tables, so the numbers isolate the database profile from the
+OpenAI call and template rendering.
+
+Usage::
+
+    python -m benchmarks.ingest_concurrency --threads 1 4 16 --ingests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel
+
+from app.config import Settings
+from app.database import create_db_engine
+from app.models import Brand, GeneratedEmail, Lead
+
+HTML_BODY = "<p>" + "Thank you for reaching out. " * 60 + "</p>"
+
+
+def _prepare(profile: str, directory: Path):  # type: ignore[no-untyped-def]
+    settings = Settings(database_url=f"sqlite:///{directory / f'{profile}.db'}", sqlite_profile=profile)
+    engine = create_db_engine(settings)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        brand_id = connection.execute(
+            Brand.__table__.insert().values(
+                name="Bench", slug="bench", openai_cache_enabled=True, created_at=now, updated_at=now
+            )
+        ).inserted_primary_key[0]
+    return engine, brand_id
+
+
+def _ingest(engine, brand_id: int, count: int, errors: list[str]) -> None:  # type: ignore[no-untyped-def]
+    for index in range(count):
+        now = datetime.utcnow()
+        try:
+            with engine.begin() as connection:
+                lead_id = connection.execute(
+                    Lead.__table__.insert().values(
+                        brand_id=brand_id,
+                        email=f"lead{index}@example.com",
+                        first_name="Bench",
+                        created_at=now,
+                        updated_at=now,
+                    )
+                ).inserted_primary_key[0]
+                connection.execute(
+                    GeneratedEmail.__table__.insert().values(
+                        lead_id=lead_id,
+                        subject="Confirmation",
+                        html_body=HTML_BODY,
+                        status="draft",
+                        send_attempts=0,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+        except OperationalError as exc:
+            errors.append(str(exc.orig))
+
+
+def run(profile: str, threads: int, ingests: int) -> dict[str, float | int | str]:
+    with tempfile.TemporaryDirectory() as directory:
+        engine, brand_id = _prepare(profile, Path(directory))
+        errors: list[str] = []
+        workers = [threading.Thread(target=_ingest, args=(engine, brand_id, ingests, errors)) for _ in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    completed = threads * ingests - len(errors)
+    return {
+        "profile": profile,
+        "threads": threads,
+        "ingests": completed,
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "ingests_per_second": round(completed / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ingests", type=int, default=200, help="ingests per thread")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    results = [run(profile, threads, args.ingests) for threads in args.threads for profile in ("default", "production")]
+    print(f"{'profile':<12}{'threads':>8}{'ingests':>9}{'errors':>8}{'seconds':>10}{'ingest/s':>11}")
+    for result in results:
+        print(
+            f"{result['profile']:<12}{result['threads']:>8}{result['ingests']:>9}{result['errors']:>8}"
+            f"{result['seconds']:>10}{result['ingests_per_second']:>11}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""Load-test lead ingestion, preview and send against local OpenAI and Gmail stubs.
+
+The harness starts the stubs from ``benchmarks.service_stubs``, launches the
+application under uvicorn with ``OPENAI_BASE_URL``, ``GMAIL_API_BASE_URL`` and
+``GMAIL_TOKEN_URI`` pointing at them and a fresh SQLite database, seeds a brand
+with an active campaign, then drives each scenario at increasing concurrency:
+
+* ``ingest``: ``POST /leads/`` with a new lead per request
+* ``preview``: ``POST /leads/{id}/preview`` on seeded leads
+* ``send``: ``POST /leads/send``, each request for a different draft email
+
+A sent email cannot be sent again, so before each ``send`` level the harness
+tops up a pool of drafts through ``POST /leads/batch``; a level that drains the
+pool is rerun with a larger one.
+
+Each concurrency level runs for ``--duration`` seconds and reports throughput,
+p50/p95/p99 latency, the error rate and the mean of each ``Server-Timing``
+component. The saturation point is the last level whose throughput still grew
+by more than ``--saturation-gain`` over the previous one; past it requests only
+queue, on the threadpool or behind the SQLite writer.
+
+Pass ``--app-url`` to drive an application that is already running (it must
+be configured against the stubs itself, see ``python -m benchmarks.service_stubs``).
+
+Usage::
+
+    python -m benchmarks.load_test --concurrency 1 4 16 64 --duration 15
+    python -m benchmarks.load_test --scenario ingest --openai-latency fixed:800 --openai-error-rate 0.02
+    python -m benchmarks.load_test --workers 4 --env OPENAI_MAX_CONCURRENCY=64 --json load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.service_stubs import add_stub_arguments, behaviour_from_args, start_stubs, stub_environment
+
+SCENARIOS = ("ingest", "preview", "send")
+DEFAULT_CONCURRENCY = (1, 2, 4, 8, 16, 32, 64)
+FIRST_NAMES = ("Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken")
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _server_timing(header: str | None) -> dict[str, float]:
+    timings: dict[str, float] = {}
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if params.startswith("dur="):
+            timings[name] = float(params[4:])
+    return timings
+
+
+@contextmanager
+def _application(args: argparse.Namespace, stub_env: dict[str, str]) -> Iterator[str]:
+    """Run uvicorn against the stubs and a throwaway database; yields its base URL."""
+
+    with tempfile.TemporaryDirectory(prefix="salesmailer-load-") as tmp:
+        env = {
+            **os.environ,
+            **stub_env,
+            "DATABASE_URL": f"sqlite:///{Path(tmp) / 'load.db'}",
+            "OPENAI_CACHE_ENABLED": str(args.openai_cache).lower(),
+            "PROFILING_DIR": str(Path(tmp) / "profiles"),
+            # /leads/send draws on the per-mailbox send quota; lift it so the run measures the app.
+            "GMAIL_SEND_RATE_PER_SECOND": "100000",
+            "GMAIL_SEND_BURST": "100000",
+        }
+        for pair in args.env:
+            name, _, value = pair.partition("=")
+            env[name] = value
+
+        url = f"http://{args.host}:{args.port}"
+        command = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", args.host, "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning",
+        ]
+        process = subprocess.Popen(command, env=env)
+        try:
+            _wait_ready(url, process, timeout=30.0)
+            yield url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"application exited with status {process.returncode}")
+        try:
+            httpx.get(f"{url}/docs", timeout=1.0)
+            return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"application at {url} did not become ready within {timeout:.0f}s")
+
+
+def _post(client: httpx.Client, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+    response = client.post(path, json=payload)
+    response.raise_for_status()
+    return response.json()
+
+
+def _lead_payload(brand_slug: str) -> dict[str, Any]:
+    token = uuid.uuid4().hex[:12]
+    return {
+        "brand_slug": brand_slug,
+        "email": f"load-{token}@example.com",
+        "first_name": random.choice(FIRST_NAMES),
+        "company": f"Company {token[:4]}",
+    }
+
+
+def seed(url: str, leads: int, features: int) -> dict[str, Any]:
+    """Create a brand with an active campaign and ``leads`` leads through the API."""
+
+    slug = f"load-{uuid.uuid4().hex[:8]}"
+    with httpx.Client(base_url=url, timeout=60.0) as client:
+        brand = _post(client, "/brands/", {"name": "Load Test", "slug": slug, "sender_email": f"info@{slug}.com"})
+        campaign = _post(client, "/campaigns/", {"brand_id": brand["id"], "name": "Load Test", "is_active": True})
+        for position in range(features):
+            feature = _post(
+                client,
+                "/features/",
+                {"name": f"Feature {position} {slug}", "short_description": f"What feature {position} does for you."},
+            )
+            brand_feature = _post(
+                client, "/features/brand", {"brand_id": brand["id"], "feature_id": feature["id"], "cta_text": "Learn more"}
+            )
+            _post(
+                client,
+                f"/campaigns/{campaign['id']}/features",
+                {"campaign_id": campaign["id"], "brand_feature_id": brand_feature["id"], "sort_order": position},
+            )
+
+        lead_ids = [_post(client, "/leads/", _lead_payload(slug))["id"] for _ in range(leads)]
+        email_ids = []
+        for lead_id in lead_ids:
+            response = client.get(f"/leads/{lead_id}/emails")
+            response.raise_for_status()
+            email_ids.extend(item["id"] for item in response.json()["items"])
+    return {"brand_slug": slug, "lead_ids": lead_ids, "email_ids": email_ids}
+
+
+def top_up_drafts(url: str, fixtures: dict[str, Any], count: int, chunk: int = 500) -> None:
+    """Ingest leads in batches until at least ``count`` unsent drafts are waiting for the send scenario."""
+
+    with httpx.Client(base_url=url, timeout=300.0) as client:
+        while len(fixtures["email_ids"]) < count:
+            size = min(chunk, count - len(fixtures["email_ids"]))
+            response = client.post("/leads/batch", json=[_lead_payload(fixtures["brand_slug"]) for _ in range(size)])
+            response.raise_for_status()
+            fixtures["email_ids"].extend(item["email_id"] for item in response.json()["results"] if item["email_id"])
+
+
+def _request(scenario: str, fixtures: dict[str, Any]) -> tuple[str, dict[str, Any] | None] | None:
+    if scenario == "ingest":
+        return "/leads/", _lead_payload(fixtures["brand_slug"])
+    if scenario == "preview":
+        return f"/leads/{random.choice(fixtures['lead_ids'])}/preview", None
+    if not fixtures["email_ids"]:
+        return None
+    return "/leads/send", {"email_id": fixtures["email_ids"].pop()}
+
+
+async def run_level(
+    url: str, scenario: str, fixtures: dict[str, Any], concurrency: int, duration: float, timeout: float
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    timing_totals: dict[str, float] = {}
+    errors = 0
+    exhausted = False
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker() -> None:
+            nonlocal errors, exhausted
+            while time.perf_counter() < deadline:
+                request = _request(scenario, fixtures)
+                if request is None:
+                    exhausted = True
+                    return
+                path, payload = request
+                start = time.perf_counter()
+                try:
+                    response = await client.post(path, json=payload)
+                except httpx.HTTPError as exc:
+                    code = type(exc).__name__
+                    failed = True
+                    timings: dict[str, float] = {}
+                else:
+                    code = str(response.status_code)
+                    failed = response.status_code >= 400
+                    timings = _server_timing(response.headers.get("Server-Timing"))
+                latencies.append(time.perf_counter() - start)
+                statuses[code] = statuses.get(code, 0) + 1
+                errors += failed
+                for name, milliseconds in timings.items():
+                    timing_totals[name] = timing_totals.get(name, 0.0) + milliseconds
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": count,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "error_rate": errors / count if count else 0.0,
+        "statuses": statuses,
+        "server_timing_ms": {name: total / count for name, total in sorted(timing_totals.items())},
+        "exhausted": exhausted,
+    }
+
+
+def saturation_point(levels: list[dict[str, Any]], min_gain: float) -> int | None:
+    """Concurrency after which throughput stopped growing by at least ``min_gain``."""
+
+    for previous, current in zip(levels, levels[1:]):
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return previous["concurrency"]
+    return None
+
+
+def print_report(scenario: str, levels: list[dict[str, Any]], saturated_at: int | None) -> None:
+    print(f"\n{scenario}")
+    print(f"  {'conc':>5} {'req':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}  server-timing (mean ms)")
+    for level in levels:
+        timing = " ".join(f"{name}={value:.1f}" for name, value in level["server_timing_ms"].items())
+        print(
+            f"  {level['concurrency']:>5} {level['requests']:>7} {level['throughput_rps']:>8.1f}"
+            f" {level['p50_ms']:>9.1f} {level['p95_ms']:>9.1f} {level['p99_ms']:>9.1f}"
+            f" {level['error_rate']:>6.1%}  {timing}"
+        )
+    if saturated_at is None:
+        print("  throughput still rising at the highest level; try more concurrency")
+    else:
+        print(f"  saturates at concurrency {saturated_at}")
+
+
+def run(args: argparse.Namespace, url: str) -> dict[str, Any]:
+    fixtures = seed(url, args.seed_leads, args.features)
+    results: dict[str, Any] = {}
+    for scenario in args.scenario:
+        levels = []
+        drafts = args.seed_leads
+        for concurrency in args.concurrency:
+            while True:
+                if scenario == "send":
+                    top_up_drafts(url, fixtures, drafts)
+                level = asyncio.run(run_level(url, scenario, fixtures, concurrency, args.duration, args.timeout))
+                if not level["exhausted"]:
+                    break
+                # The pool ran dry before the level ended; measure it again with twice as many drafts.
+                drafts *= 2
+                time.sleep(args.pause)
+            # The next level runs at higher concurrency, so start it with headroom over this one.
+            drafts = max(drafts, 2 * level["requests"])
+            levels.append(level)
+            time.sleep(args.pause)
+        saturated_at = saturation_point(levels, args.saturation_gain)
+        print_report(scenario, levels, saturated_at)
+        results[scenario] = {"levels": levels, "saturation_concurrency": saturated_at}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--pause", type=float, default=1.0, help="seconds to let the app settle between levels")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request client timeout")
+    parser.add_argument("--seed-leads", type=int, default=20, help="leads created up front for preview and send")
+    parser.add_argument("--features", type=int, default=5, help="campaign features on the seeded brand")
+    parser.add_argument("--saturation-gain", type=float, default=0.05, help="throughput growth still counted as scaling")
+    parser.add_argument("--app-url", help="drive an already running application instead of starting one")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--openai-cache", action="store_true", help="leave the OpenAI response cache on")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE", help="extra app settings")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stubs: dict[str, Any] = {}
+    if args.app_url:
+        results = run(args, args.app_url.rstrip("/"))
+    else:
+        openai_stub, gmail_stub = start_stubs(
+            openai=behaviour_from_args(args, "openai"), gmail=behaviour_from_args(args, "gmail"), host=args.host
+        )
+        try:
+            with _application(args, stub_environment(openai_stub, gmail_stub)) as url:
+                results = run(args, url)
+        finally:
+            openai_stub.stop()
+            gmail_stub.stop()
+        stubs = {"openai": openai_stub.behaviour.stats(), "gmail": gmail_stub.behaviour.stats()}
+        print(f"\nstub calls: openai {stubs['openai']}, gmail {stubs['gmail']}")
+    if args.json:
+        meta = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "arguments": {key: value for key, value in vars(args).items() if key != "json"},
+        }
+        args.json.write_text(json.dumps({"meta": meta, "results": results, "stubs": stubs}, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
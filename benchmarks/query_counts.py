@@ -0,0 +1,128 @@
+"""Pin the number of SQL statements each feature endpoint executes.
+
+The script seeds a throwaway SQLite database with one brand and a campaign of
+``--features`` features, calls each endpoint through FastAPI's test client and
+counts the statements it runs. Counts must not grow with the number of
+features; an endpoint that exceeds its budget fails the run with a non-zero
+exit status.
+
+Usage::
+
+    python -m benchmarks.query_counts --features 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+QUERY_BUDGETS = {
+    "GET /features/brand/{brand_id}": 1,
+    "POST /features/brand": 2,
+    "PATCH /features/brand/{brand_feature_id}": 2,
+    "GET /campaigns/{campaign_id}/features": 1,
+    "POST /campaigns/{campaign_id}/features": 3,
+    "PATCH /campaigns/features/{campaign_feature_id}": 2,
+}
+
+
+def seed(client, features: int, slug: str = "bench") -> dict[str, int]:  # type: ignore[no-untyped-def]
+    """Seed brand ``slug`` with a campaign of ``features`` features; returns the ids the calls need."""
+
+    brand = client.post("/brands/", json={"name": slug, "slug": slug}).json()
+    campaign = client.post("/campaigns/", json={"brand_id": brand["id"], "name": "Launch", "is_active": True}).json()
+    brand_feature_ids = []
+    for index in range(features + 1):
+        feature = client.post("/features/", json={"name": f"{slug} {index}", "short_description": "Fast"}).json()
+        brand_feature = client.post("/features/brand", json={"brand_id": brand["id"], "feature_id": feature["id"]}).json()
+        brand_feature_ids.append(brand_feature["id"])
+    for index, brand_feature_id in enumerate(brand_feature_ids[:-1]):
+        campaign_feature = client.post(
+            f"/campaigns/{campaign['id']}/features",
+            json={"campaign_id": campaign["id"], "brand_feature_id": brand_feature_id, "sort_order": index},
+        ).json()
+    spare = client.post("/features/", json={"name": f"{slug} spare", "short_description": "Spare"}).json()
+    return {
+        "brand_id": brand["id"],
+        "campaign_id": campaign["id"],
+        "feature_id": spare["id"],
+        "brand_feature_id": brand_feature_ids[-1],
+        "campaign_feature_id": campaign_feature["id"],
+    }
+
+
+def endpoint_calls(client, ids: dict[str, int]) -> dict[str, Callable[[], Any]]:  # type: ignore[no-untyped-def]
+    """One request per budgeted endpoint, keyed like ``QUERY_BUDGETS``."""
+
+    return {
+        "GET /features/brand/{brand_id}": lambda: client.get(f"/features/brand/{ids['brand_id']}"),
+        "POST /features/brand": lambda: client.post(
+            "/features/brand", json={"brand_id": ids["brand_id"], "feature_id": ids["feature_id"]}
+        ),
+        "PATCH /features/brand/{brand_feature_id}": lambda: client.patch(
+            f"/features/brand/{ids['brand_feature_id']}", json={"cta_text": "Try it"}
+        ),
+        "GET /campaigns/{campaign_id}/features": lambda: client.get(f"/campaigns/{ids['campaign_id']}/features"),
+        "POST /campaigns/{campaign_id}/features": lambda: client.post(
+            f"/campaigns/{ids['campaign_id']}/features",
+            json={"campaign_id": ids["campaign_id"], "brand_feature_id": ids["brand_feature_id"]},
+        ),
+        "PATCH /campaigns/features/{campaign_feature_id}": lambda: client.patch(
+            f"/campaigns/features/{ids['campaign_feature_id']}", json={"highlight_text": "Now faster"}
+        ),
+    }
+
+
+def run(features: int) -> list[dict[str, object]]:
+    from fastapi.testclient import TestClient
+
+    from app.database import count_queries
+    from app.main import app
+
+    results = []
+    with TestClient(app) as client:
+        for name, call in endpoint_calls(client, seed(client, features)).items():
+            with count_queries() as statements:
+                response = call()
+            response.raise_for_status()
+            results.append(
+                {
+                    "endpoint": name,
+                    "queries": len(statements),
+                    "budget": QUERY_BUDGETS[name],
+                    "statements": list(statements),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=25, help="features attached to the seeded campaign")
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Point the app at a scratch database and keep background pollers quiet while counting.
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(directory) / 'query_counts.db'}"
+        os.environ["OUTBOX_ENABLED"] = "false"
+        results = run(args.features)
+
+    print(f"{'endpoint':<52}{'queries':>8}{'budget':>8}")
+    for result in results:
+        marker = "" if result["queries"] <= result["budget"] else "  over budget"
+        print(f"{result['endpoint']:<52}{result['queries']:>8}{result['budget']:>8}{marker}")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if any(result["queries"] > result["budget"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Check that the hot lead-generation queries are served by an index.
+
+Each query is built by the same helper the application uses, then run through
+SQLite's ``EXPLAIN QUERY PLAN`` against a freshly created schema. A query fails
+the check when it scans its table without an index or sorts through a temporary
+B-tree instead of reading rows in index order. The exit status is non-zero if
+any query fails, so the script can run in CI.
+
+Usage::
+
+    python -m benchmarks.query_plans
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlmodel import SQLModel
+
+from app.routers.leads import (
+    active_campaign_statement,
+    brand_template_statement,
+    campaign_features_statement,
+    lead_emails_statement,
+)
+from app.services.lead_search import lead_search_statement
+from app.services.outbox import due_emails_statement
+
+HOT_QUERIES = {
+    "active_campaign": (active_campaign_statement(1), "ix_campaigns_brand_active_updated"),
+    "brand_template": (brand_template_statement(1), "ix_email_templates_brand_default_updated"),
+    "campaign_features": (campaign_features_statement(1), "ix_campaign_features_campaign_sort"),
+    "lead_emails": (lead_emails_statement(1), "ix_generated_emails_lead_id"),
+    "lead_window": (
+        lead_search_statement(None, brand_id=1, created_from=datetime.utcnow() - timedelta(days=7), created_to=datetime.utcnow()),
+        "ix_leads_brand_created",
+    ),
+    "outbox_due": (due_emails_statement(datetime.utcnow(), 50), "ix_generated_emails_status_next_attempt"),
+}
+
+
+def explain(connection, statement) -> list[str]:  # type: ignore[no-untyped-def]
+    compiled = statement.compile(dialect=connection.dialect)
+    # The planner does not look at bound values, so placeholders are left as NULL.
+    parameters = (None,) * len(compiled.positiontup or ())
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def check(plan: list[str], expected_index: str) -> list[str]:
+    problems = []
+    if not any(expected_index in step for step in plan):
+        problems.append(f"does not use {expected_index}")
+    problems.extend(f"sorts rows: {step}" for step in plan if "TEMP B-TREE" in step)
+    return problems
+
+
+def run() -> list[dict[str, object]]:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    results = []
+    with engine.connect() as connection:
+        for name, (statement, expected_index) in HOT_QUERIES.items():
+            plan = explain(connection, statement)
+            results.append({"query": name, "plan": plan, "problems": check(plan, expected_index)})
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    results = run()
+    for result in results:
+        print(f"{result['query']:<20}{'FAIL' if result['problems'] else 'ok'}")
+        for step in result["plan"]:
+            print(f"    {step}")
+        for problem in result["problems"]:
+            print(f"    ! {problem}")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if any(result["problems"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Local stand-ins for the OpenAI Responses API and the Gmail send endpoints.
+
+Both stubs answer with payloads shaped like the real services, after a delay
+drawn from a configurable latency distribution, and fail a configurable share
+of requests. Point the application at them through ``OPENAI_BASE_URL`` and
+``GMAIL_API_BASE_URL``/``GMAIL_TOKEN_URI``; ``benchmarks.load_test`` does this
+automatically.
+
+Latency specs: ``0`` (none), ``fixed:MS``, ``uniform:LOW_MS,HIGH_MS`` or
+``lognormal:MEDIAN_MS,SIGMA``.
+
+Usage::
+
+    python -m benchmarks.service_stubs --openai-latency lognormal:400,0.5 --gmail-error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Latency:
+    kind: str = "none"
+    params: tuple[float, ...] = ()
+
+    @classmethod
+    def parse(cls, spec: str) -> Latency:
+        if spec in ("", "0", "none"):
+            return cls()
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(value) for value in raw.split(",") if value)
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"invalid latency spec {spec!r}; use fixed:MS, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+        return cls(kind, params)
+
+    def sample(self) -> float:
+        """Seconds to wait before answering."""
+
+        if self.kind == "fixed":
+            milliseconds = self.params[0]
+        elif self.kind == "uniform":
+            milliseconds = random.uniform(*self.params)
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            milliseconds = random.lognormvariate(math.log(median), sigma)
+        else:
+            milliseconds = 0.0
+        return milliseconds / 1000
+
+
+@dataclass
+class StubBehaviour:
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    error_status: int = 429
+    requests: int = 0
+    errors: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def draw(self) -> int | None:
+        """Sleep for one latency sample; returns an error status when this call should fail."""
+
+        time.sleep(self.latency.sample())
+        failed = random.random() < self.error_rate
+        with self._lock:
+            self.requests += 1
+            self.errors += failed
+        return self.error_status if failed else None
+
+    def stats(self) -> dict[str, Any]:
+        return {"requests": self.requests, "errors": self.errors}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, every response waits on a delayed ACK.
+    disable_nagle_algorithm = True
+    behaviour: StubBehaviour
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json", **headers: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, payload: dict[str, Any]) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"))
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class OpenAIStubHandler(_StubHandler):
+    """``POST .../responses``: plain copy, or ``{"summaries": [...]}`` for structured batch prompts."""
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler naming
+        request = json.loads(self._body() or b"{}")
+        if not self.path.rstrip("/").endswith("/responses"):
+            self._json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        status = self.behaviour.draw()
+        if status is not None:
+            self._json(status, {"error": {"message": "stubbed failure", "type": "stub_error", "code": str(status)}})
+            return
+
+        prompt = request.get("input") or ""
+        if isinstance(prompt, list):
+            prompt = json.dumps(prompt)
+        if (request.get("text") or {}).get("format", {}).get("type") == "json_schema":
+            leads = re.findall(r"^(\d+)\. ", prompt.split("Leads:", 1)[-1], flags=re.MULTILINE)
+            text = json.dumps(
+                {"summaries": [{"index": int(index), "summary": f"Thanks for your interest, lead {index}."} for index in leads]}
+            )
+        else:
+            text = "Thank you for reaching out! Here is a short overview of the highlights we picked for you."
+        self._json(200, _openai_response(request.get("model") or "stub-model", text, _tokens(prompt)))
+
+
+def _openai_response(model: str, text: str, input_tokens: int) -> dict[str, Any]:
+    output_tokens = _tokens(text)
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": model,
+        "output": [
+            {
+                "type": "message",
+                "id": f"msg_{uuid.uuid4().hex}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def _gmail_error(status: int) -> dict[str, Any]:
+    reason = "rateLimitExceeded" if status in (403, 429) else "backendError"
+    return {"error": {"code": status, "message": "stubbed failure", "errors": [{"reason": reason, "message": reason}]}}
+
+
+def _gmail_message() -> dict[str, Any]:
+    return {"id": uuid.uuid4().hex[:16], "threadId": uuid.uuid4().hex[:16], "labelIds": ["SENT"]}
+
+
+class GmailStubHandler(_StubHandler):
+    """OAuth token refresh, ``users.messages.send`` and the ``batch/gmail/v1`` multipart endpoint."""
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler naming
+        body = self._body()
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/token"):
+            self._json(200, {"access_token": f"stub-{uuid.uuid4().hex}", "expires_in": 3600, "token_type": "Bearer"})
+        elif re.fullmatch(r"/gmail/v1/users/[^/]+/messages/send", path):
+            status = self.behaviour.draw()
+            self._json(status, _gmail_error(status)) if status else self._json(200, _gmail_message())
+        elif path == "/batch/gmail/v1":
+            self._batch(body)
+        else:
+            self._json(404, _gmail_error(404))
+
+    def _batch(self, body: bytes) -> None:
+        # One latency draw for the HTTP round trip; each inner call can still fail on its own.
+        time.sleep(self.behaviour.latency.sample())
+        parts = []
+        for content_id in re.findall(rb"Content-ID: <([^>]+)>", body):
+            status = self._part_status(content_id.decode())
+            payload = json.dumps(_gmail_error(status) if status else _gmail_message())
+            reason = "OK" if status is None else "Error"
+            parts.append(
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id.decode()}>\r\n\r\n"
+                f"HTTP/1.1 {status or 200} {reason}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{payload}\r\n"
+            )
+        boundary = f"batch_{uuid.uuid4().hex}"
+        response = "".join(f"--{boundary}\r\n{part}" for part in parts) + f"--{boundary}--\r\n"
+        self._send(200, response.encode("utf-8"), content_type=f"multipart/mixed; boundary={boundary}")
+
+    def _part_status(self, content_id: str) -> int | None:
+        """Error status for one inner call of a batch, or ``None`` when it succeeds."""
+
+        failed = random.random() < self.behaviour.error_rate
+        with self.behaviour._lock:
+            self.behaviour.requests += 1
+            self.behaviour.errors += failed
+        return self.behaviour.error_status if failed else None
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connection bursts into 1s SYN retries at high concurrency.
+    request_queue_size = 1024
+
+
+class StubServer:
+    def __init__(self, handler: type[_StubHandler], behaviour: StubBehaviour, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.behaviour = behaviour
+        handler_class = type(handler.__name__, (handler,), {"behaviour": behaviour})
+        self._server = _Server((host, port), handler_class)
+        self._thread = threading.Thread(target=self._server.serve_forever, name=handler.__name__, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> StubServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def start_stubs(
+    *,
+    openai: StubBehaviour,
+    gmail: StubBehaviour,
+    host: str = "127.0.0.1",
+    openai_port: int = 0,
+    gmail_port: int = 0,
+) -> tuple[StubServer, StubServer]:
+    return (
+        StubServer(OpenAIStubHandler, openai, host, openai_port).start(),
+        StubServer(GmailStubHandler, gmail, host, gmail_port).start(),
+    )
+
+
+def stub_environment(openai_server: StubServer, gmail_server: StubServer) -> dict[str, str]:
+    """Settings that route the application's OpenAI and Gmail traffic to the stubs."""
+
+    return {
+        "OPENAI_API_KEY": "stub-key",
+        "OPENAI_BASE_URL": f"{openai_server.url}/v1",
+        "GMAIL_API_BASE_URL": f"{gmail_server.url}/",
+        "GMAIL_TOKEN_URI": f"{gmail_server.url}/token",
+        "GMAIL_USER_ID": "me",
+        "GMAIL_TOKEN": "stub-token",
+        "GMAIL_REFRESH_TOKEN": "stub-refresh",
+        "GMAIL_CLIENT_ID": "stub-client",
+        "GMAIL_CLIENT_SECRET": "stub-secret",
+    }
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    for service, latency in (("openai", "lognormal:400,0.5"), ("gmail", "lognormal:150,0.4")):
+        parser.add_argument(f"--{service}-latency", default=latency, help="0, fixed:MS, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+        parser.add_argument(f"--{service}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{service}-error-status", type=int, default=429)
+
+
+def behaviour_from_args(args: argparse.Namespace, service: str) -> StubBehaviour:
+    return StubBehaviour(
+        latency=Latency.parse(getattr(args, f"{service}_latency")),
+        error_rate=getattr(args, f"{service}_error_rate"),
+        error_status=getattr(args, f"{service}_error_status"),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--openai-port", type=int, default=8081)
+    parser.add_argument("--gmail-port", type=int, default=8082)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    openai_server, gmail_server = start_stubs(
+        openai=behaviour_from_args(args, "openai"),
+        gmail=behaviour_from_args(args, "gmail"),
+        host=args.host,
+        openai_port=args.openai_port,
+        gmail_port=args.gmail_port,
+    )
+    print("Stubs running; start the app with:")
+    for name, value in stub_environment(openai_server, gmail_server).items():
+        print(f"  export {name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        openai_server.stop()
+        gmail_server.stop()
+
+
+if __name__ == "__main__":
+    main()
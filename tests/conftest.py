@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+# The engine is created when app.database is imported, so the scratch database
+# has to be configured before any app module is.
+_DATA_DIR = tempfile.mkdtemp(prefix="salesmailer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_DATA_DIR) / 'tests.db'}"
+os.environ["OUTBOX_ENABLED"] = "false"
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["PROFILING_DIR"] = str(Path(_DATA_DIR) / "profiles")
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
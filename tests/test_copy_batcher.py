@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.models import Brand, Lead
+from app.services.copy_batcher import CopyBatcher
+from app.services.openai_client import OpenAIClient, OpenAIConfig
+from benchmarks.service_stubs import OpenAIStubHandler, StubBehaviour, StubServer
+
+LEADS = 7
+
+
+class RecordingOpenAIHandler(OpenAIStubHandler):
+    """Keeps the usage block of every response it sends."""
+
+    usages: list[dict[str, Any]]
+
+    def _json(self, status: int, payload: dict[str, Any]) -> None:
+        if "usage" in payload:
+            self.usages.append(payload["usage"])
+        super()._json(status, payload)
+
+
+@pytest.fixture()
+def handler() -> type[RecordingOpenAIHandler]:
+    return type("Handler", (RecordingOpenAIHandler,), {"usages": []})
+
+
+@pytest.fixture()
+def openai_stub(handler: type[RecordingOpenAIHandler]) -> Iterator[StubServer]:
+    server = StubServer(handler, StubBehaviour()).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+async def _generate(batcher: CopyBatcher) -> list[dict[str, Any]]:
+    brand = Brand(id=1, name="Acme", slug="acme")
+    features = [
+        SimpleNamespace(
+            id=index,
+            highlight_text=None,
+            brand_feature=SimpleNamespace(feature=SimpleNamespace(name=f"Feature {index}", short_description="Fast")),
+        )
+        for index in range(3)
+    ]
+    leads = [Lead(brand_id=1, email=f"lead{index}@example.com", first_name=f"Lead {index}") for index in range(LEADS)]
+    try:
+        return await asyncio.gather(
+            *(batcher.agenerate_highlight_copy(brand=brand, lead=lead, features=features, tone=None) for lead in leads)
+        )
+    finally:
+        await batcher.aclose()
+
+
+def test_concurrent_leads_share_one_model_request(
+    openai_stub: StubServer, handler: type[RecordingOpenAIHandler]
+) -> None:
+    client = OpenAIClient(api_key="stub-key", config=OpenAIConfig(base_url=f"{openai_stub.url}/v1"))
+    batcher = CopyBatcher(client, window_seconds=0.05, max_batch_size=20)
+
+    results = asyncio.run(_generate(batcher))
+
+    assert len(handler.usages) == 1
+    assert len(results) == LEADS
+    assert all(result["summary"] and result["batch_size"] == LEADS for result in results)
+    assert len({result["summary"] for result in results}) == LEADS
+    usage = handler.usages[0]
+    assert sum(result["prompt_tokens"] for result in results) == usage["input_tokens"]
+    assert sum(result["completion_tokens"] for result in results) == usage["output_tokens"]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.services.gmail_client import GMAIL_BATCH_LIMIT, GmailClient, GmailSettings, OutgoingEmail
+from benchmarks.service_stubs import GmailStubHandler, StubBehaviour, StubServer
+
+
+class RecordingGmailHandler(GmailStubHandler):
+    """Records every call and fails the batch parts of emails whose id is a multiple of three."""
+
+    calls: list[tuple[str, int]]
+
+    def _body(self) -> bytes:
+        body = super()._body()
+        self.calls.append((self.path.split("?", 1)[0], len(re.findall(rb"Content-ID: <", body))))
+        return body
+
+    def _part_status(self, content_id: str) -> int | None:
+        email_id = int(content_id.rsplit("+", 1)[1])
+        return 429 if email_id % 3 == 0 else None
+
+
+@pytest.fixture()
+def handler() -> type[RecordingGmailHandler]:
+    return type("Handler", (RecordingGmailHandler,), {"calls": []})
+
+
+@pytest.fixture()
+def gmail_stub(handler: type[RecordingGmailHandler]) -> Iterator[StubServer]:
+    server = StubServer(handler, StubBehaviour()).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def _client(server: StubServer) -> GmailClient:
+    settings = GmailSettings(
+        user_id="me",
+        token="token",
+        refresh_token="refresh",
+        client_id="client",
+        client_secret="secret",
+        token_uri=f"{server.url}/token",
+        api_base_url=f"{server.url}/",
+    )
+    return GmailClient(settings, pool_size=1)
+
+
+def _messages(count: int) -> list[OutgoingEmail]:
+    return [
+        OutgoingEmail(
+            email_id=email_id,
+            to_address=f"lead{email_id}@example.com",
+            subject="Thanks",
+            html_body="<p>Hello</p>",
+            from_address="sales@example.com",
+        )
+        for email_id in range(1, count + 1)
+    ]
+
+
+def _batch_calls(handler: type[RecordingGmailHandler]) -> list[int]:
+    return [parts for path, parts in handler.calls if path == "/batch/gmail/v1"]
+
+
+def test_send_many_posts_batches_to_the_configured_base_url(
+    gmail_stub: StubServer, handler: type[RecordingGmailHandler]
+) -> None:
+    results = _client(gmail_stub).send_many(_messages(2))
+
+    assert _batch_calls(handler) == [2]
+    assert set(results) == {1, 2}
+
+
+def test_send_many_splits_batches_at_the_gmail_limit(
+    gmail_stub: StubServer, handler: type[RecordingGmailHandler]
+) -> None:
+    results = _client(gmail_stub).send_many(_messages(GMAIL_BATCH_LIMIT * 2 + 5))
+
+    assert GMAIL_BATCH_LIMIT == 100
+    assert _batch_calls(handler) == [100, 100, 5]
+    assert len(results) == 205
+
+
+def test_send_many_honours_a_smaller_batch_size(
+    gmail_stub: StubServer, handler: type[RecordingGmailHandler]
+) -> None:
+    _client(gmail_stub).send_many(_messages(25), batch_size=10)
+
+    assert _batch_calls(handler) == [10, 10, 5]
+
+
+def test_send_many_maps_each_part_to_its_own_result(gmail_stub: StubServer) -> None:
+    results = _client(gmail_stub).send_many(_messages(10))
+
+    for email_id, result in results.items():
+        if email_id % 3 == 0:
+            assert result["status"] == "error"
+            assert isinstance(result["exception"], HttpError)
+            assert result["exception"].resp.status == 429
+        else:
+            assert result["status"] == "sent"
+            assert result["response"]["labelIds"] == ["SENT"]
+
+
+def test_send_many_reports_every_email_when_the_batch_request_fails() -> None:
+    server = StubServer(type("Handler", (RecordingGmailHandler,), {"calls": []}), StubBehaviour()).start()
+    client = _client(server)
+    server.stop()
+
+    results = client.send_many(_messages(3))
+
+    assert {result["status"] for result in results.values()} == {"error"}
+    assert set(results) == {1, 2, 3}
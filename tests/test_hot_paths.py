@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pytest
+from sqlmodel import Session
+
+from benchmarks.hot_paths import _lead_database, mime_cases, prompt_cases, query_cases, render_cases
+
+OFFLINE_CASES = {name: call for cases in (render_cases(), prompt_cases(), mime_cases()) for name, _, _, call in cases}
+
+
+@pytest.mark.parametrize("name", OFFLINE_CASES)
+def test_offline_case_runs(name: str) -> None:
+    assert OFFLINE_CASES[name]() is not None
+
+
+def test_query_cases_run_against_a_seeded_database(tmp_path) -> None:  # type: ignore[no-untyped-def]
+    engine = _lead_database(tmp_path, 200)
+    try:
+        with Session(engine) as session:
+            for _, _, _, call in query_cases(session, 200):
+                call()
+    finally:
+        engine.dispose()
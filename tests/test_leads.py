@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import session_scope
+from app.dependencies import gmail_registry_dependency, outbox_dependency
+from app.routers import leads
+from app.services.gmail_client import GmailClient, GmailSettings
+from app.services.gmail_registry import GmailClientRegistry
+from app.services.outbox import OutboxDispatcher
+from benchmarks.service_stubs import GmailStubHandler, StubBehaviour, StubServer
+
+
+@pytest.fixture(scope="module")
+def brand(client) -> dict:  # type: ignore[no-untyped-def]
+    slug = f"ingest-{uuid.uuid4().hex[:8]}"
+    brand = client.post("/brands/", json={"name": slug, "slug": slug}).json()
+    client.post("/campaigns/", json={"brand_id": brand["id"], "name": "Launch", "is_active": True})
+    return brand
+
+
+def _lead(brand: dict, **fields) -> dict:  # type: ignore[no-untyped-def]
+    return {"brand_slug": brand["slug"], "email": f"{uuid.uuid4().hex[:8]}@example.com", **fields}
+
+
+def test_ingest_stores_lead_and_email(client, brand) -> None:  # type: ignore[no-untyped-def]
+    response = client.post("/leads/", json=_lead(brand, first_name="Ada", metadata={"source": "form"}))
+
+    assert response.status_code == 201, response.text
+    lead = response.json()
+    assert lead["metadata"] == {"source": "form"}
+    assert client.get(f"/leads/{lead['id']}").json()["metadata"] == {"source": "form"}
+    emails = client.get(f"/leads/{lead['id']}/emails").json()["items"]
+    assert len(emails) == 1
+    assert emails[0]["metadata"]["openai"]["summary"]
+
+
+def test_ingest_batch_reports_each_item(client, brand) -> None:  # type: ignore[no-untyped-def]
+    response = client.post("/leads/batch", json=[_lead(brand), {"brand_slug": brand["slug"]}, _lead(brand)])
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert [item["status"] for item in result["results"]] == ["created", "invalid", "created"]
+
+
+def test_ingest_batch_rejects_non_object_items_individually(client, brand) -> None:  # type: ignore[no-untyped-def]
+    response = client.post("/leads/batch", json=[_lead(brand), "not a lead", None])
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [item["status"] for item in results] == ["created", "invalid", "invalid"]
+    assert results[1]["errors"]
+
+
+def test_ingest_async_generates_in_background(client, brand) -> None:  # type: ignore[no-untyped-def]
+    response = client.post("/leads/async", json=_lead(brand, metadata={"source": "api"}))
+
+    assert response.status_code == 202, response.text
+    accepted = response.json()
+    assert accepted["lead"]["metadata"] == {"source": "api"}
+    deadline = time.monotonic() + 10
+    while (job := client.get(f"/leads/{accepted['lead']['id']}/generation").json())["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline, job
+        time.sleep(0.05)
+    assert job["status"] == "succeeded", job
+
+
+@pytest.mark.parametrize("path, created", [("/leads/", 201), ("/leads/async", 202)])
+def test_failed_ingest_releases_its_claim(  # type: ignore[no-untyped-def]
+    client, brand, monkeypatch, path: str, created: int
+) -> None:
+    payload = _lead(brand)
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    build_lead = leads._build_lead
+
+    def failing_build_lead(*args, **kwargs):  # type: ignore[no-untyped-def]
+        monkeypatch.setattr(leads, "_build_lead", build_lead)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(leads, "_build_lead", failing_build_lead)
+    failing_client = TestClient(client.app, raise_server_exceptions=False)
+    assert failing_client.post(path, json=payload, headers=headers).status_code == 500
+
+    retry = client.post(path, json=payload, headers=headers)
+    assert retry.status_code == created, retry.text
+
+
+def _email_id(client, brand: dict) -> int:  # type: ignore[no-untyped-def]
+    lead = client.post("/leads/", json=_lead(brand)).json()
+    return client.get(f"/leads/{lead['id']}/emails").json()["items"][0]["id"]
+
+
+@contextmanager
+def _send_overrides(client, gmail: GmailClient, burst: int = 10) -> Iterator[None]:  # type: ignore[no-untyped-def]
+    outbox = OutboxDispatcher(
+        session_factory=session_scope, client_for=lambda brand: gmail, rate_per_second=0.001, burst=burst
+    )
+    client.app.dependency_overrides[gmail_registry_dependency] = lambda: GmailClientRegistry(default=gmail)
+    client.app.dependency_overrides[outbox_dependency] = lambda: outbox
+    try:
+        yield
+    finally:
+        client.app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def gmail_send(client) -> Iterator[None]:  # type: ignore[no-untyped-def]
+    server = StubServer(GmailStubHandler, StubBehaviour()).start()
+    settings = GmailSettings(
+        user_id="me",
+        token="token",
+        refresh_token="refresh",
+        client_id="client",
+        client_secret="secret",
+        token_uri=f"{server.url}/token",
+        api_base_url=f"{server.url}/",
+    )
+    try:
+        with _send_overrides(client, GmailClient(settings, pool_size=1)):
+            yield
+    finally:
+        server.stop()
+
+
+def test_send_rejects_emails_that_are_not_draft_or_failed(client, brand, gmail_send) -> None:  # type: ignore[no-untyped-def]
+    email_id = _email_id(client, brand)
+    sent = client.post("/leads/send", json={"email_id": email_id})
+    assert sent.status_code == 200, sent.text
+    assert sent.json()["status"] == "sent"
+    assert client.post("/leads/send", json={"email_id": email_id}).status_code == 409
+
+    queued_id = _email_id(client, brand)
+    assert client.post("/leads/send/batch", json={"email_ids": [queued_id]}).json()["queued"] == [queued_id]
+    assert client.post("/leads/send", json={"email_id": queued_id}).status_code == 409
+
+
+def test_skipped_send_does_not_spend_quota(client, brand) -> None:  # type: ignore[no-untyped-def]
+    email_id = _email_id(client, brand)
+    with _send_overrides(client, GmailClient(), burst=1):
+        for _ in range(3):
+            response = client.post("/leads/send", json={"email_id": email_id})
+            assert response.status_code == 200, response.text
+            assert response.json()["status"] == "skipped"
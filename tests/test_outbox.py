@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import time
+import uuid
+from typing import Any
+
+from sqlmodel import select
+
+from app.database import session_scope
+from app.models import Brand, GeneratedEmail
+from app.services import outbox as outbox_module
+from app.services.gmail_registry import DEFAULT_MAILBOX
+from app.services.outbox import OutboxDispatcher
+
+
+class RecordingClient:
+    def __init__(self, brand_id: int, sends: list[tuple[int, list[int]]]) -> None:
+        self.brand_id = brand_id
+        self.sends = sends
+
+    def send_many(self, messages: list[Any]) -> dict[int, dict[str, Any]]:
+        self.sends.append((self.brand_id, [message.email_id for message in messages]))
+        return {message.email_id: {"status": "sent", "response": {}} for message in messages}
+
+
+def _queued_email(client, brand: dict) -> int:  # type: ignore[no-untyped-def]
+    lead = client.post("/leads/", json={"brand_slug": brand["slug"], "email": f"{uuid.uuid4().hex[:8]}@example.com"})
+    email_id = client.get(f"/leads/{lead.json()['id']}/emails").json()["items"][0]["id"]
+    assert client.post("/leads/send/batch", json={"email_ids": [email_id]}).json()["queued"] == [email_id]
+    return email_id
+
+
+def _dispatcher(sends: list[tuple[int, list[int]]], burst: int = 10) -> OutboxDispatcher:
+    return OutboxDispatcher(
+        session_factory=session_scope,
+        client_for=lambda brand: RecordingClient(brand.id, sends),
+        rate_per_second=0.001,
+        burst=burst,
+        poll_interval_seconds=0.05,
+    )
+
+
+def _wait_until_sent(email_ids: list[int]) -> None:
+    deadline = time.monotonic() + 10
+    while True:
+        with session_scope() as session:
+            statuses = session.exec(select(GeneratedEmail.status).where(GeneratedEmail.id.in_(email_ids))).all()
+        if set(statuses) == {"sent"}:
+            return
+        assert time.monotonic() < deadline, statuses
+        time.sleep(0.05)
+
+
+def test_brands_sharing_a_mailbox_send_with_their_own_credentials(client) -> None:  # type: ignore[no-untyped-def]
+    mailbox = f"{uuid.uuid4().hex[:8]}@example.com"
+    brands = []
+    for token in ("refresh-a", "refresh-b"):
+        slug = f"shared-{uuid.uuid4().hex[:8]}"
+        brand = client.post(
+            "/brands/", json={"name": slug, "slug": slug, "gmail_user_id": mailbox, "gmail_refresh_token": token}
+        ).json()
+        brands.append(brand)
+    email_ids = [_queued_email(client, brand) for brand in brands]
+
+    sends: list[tuple[int, list[int]]] = []
+    dispatcher = _dispatcher(sends)
+    dispatcher.start()
+    try:
+        _wait_until_sent(email_ids)
+    finally:
+        dispatcher.stop()
+
+    sent_by_brand = {brand_id: ids for brand_id, ids in sends if set(ids) & set(email_ids)}
+    assert sent_by_brand == {brands[0]["id"]: [email_ids[0]], brands[1]["id"]: [email_ids[1]]}
+
+
+def test_tokens_for_rows_claimed_elsewhere_are_returned(client, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    slug = f"surplus-{uuid.uuid4().hex[:8]}"
+    brand = client.post("/brands/", json={"name": slug, "slug": slug}).json()
+    queued_id = _queued_email(client, brand)
+    # A second due row that another worker has already moved on from.
+    taken_id = _queued_email(client, brand)
+    with session_scope() as session:
+        session.get(GeneratedEmail, taken_id).status = "sending"
+
+    def due_emails_statement(now, limit):  # type: ignore[no-untyped-def]
+        return select(GeneratedEmail.id, Brand).where(
+            GeneratedEmail.id.in_([queued_id, taken_id]), Brand.id == brand["id"]
+        )
+
+    monkeypatch.setattr(outbox_module, "due_emails_statement", due_emails_statement)
+    dispatcher = _dispatcher([], burst=2)
+    dispatcher.start()
+    try:
+        _wait_until_sent([queued_id])
+    finally:
+        dispatcher.stop()
+
+    bucket = dispatcher.bucket_for(DEFAULT_MAILBOX)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
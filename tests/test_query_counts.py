@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.database import count_queries
+from benchmarks.query_counts import QUERY_BUDGETS, endpoint_calls, seed
+
+FEATURES = 10
+
+
+@pytest.fixture(scope="module")
+def seeded(client) -> dict[str, int]:  # type: ignore[no-untyped-def]
+    return seed(client, FEATURES, slug=f"budget-{uuid.uuid4().hex[:8]}")
+
+
+@pytest.mark.parametrize("endpoint", list(QUERY_BUDGETS))
+def test_feature_endpoint_stays_within_query_budget(client, seeded, endpoint) -> None:  # type: ignore[no-untyped-def]
+    call = endpoint_calls(client, seeded)[endpoint]
+    with count_queries() as statements:
+        response = call()
+
+    assert response.status_code < 400, response.text
+    assert len(statements) <= QUERY_BUDGETS[endpoint], "\n".join(statements)
+
+
+def test_feature_listings_do_not_grow_with_feature_count(client, seeded) -> None:  # type: ignore[no-untyped-def]
+    with count_queries() as statements:
+        features = client.get(f"/campaigns/{seeded['campaign_id']}/features").json()
+
+    assert len(features) >= FEATURES
+    assert all(item["brand_feature"]["feature"]["name"] for item in features)
+    assert len(statements) == 1
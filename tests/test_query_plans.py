@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlmodel import SQLModel
+
+from app.models import Lead
+from benchmarks.query_plans import HOT_QUERIES, check, explain
+
+
+@pytest.fixture(scope="module")
+def connection():  # type: ignore[no-untyped-def]
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_its_index(connection, name: str) -> None:  # type: ignore[no-untyped-def]
+    statement, expected_index = HOT_QUERIES[name]
+    plan = explain(connection, statement)
+    assert check(plan, expected_index) == [], plan
+
+
+def test_check_flags_a_scan_without_the_index(connection) -> None:  # type: ignore[no-untyped-def]
+    plan = explain(connection, select(Lead.id).where(Lead.company == "Acme").order_by(Lead.created_at))
+    assert check(plan, "ix_leads_brand_created") == [
+        "does not use ix_leads_brand_created",
+        *[f"sorts rows: {step}" for step in plan if "TEMP B-TREE" in step],
+    ]
+    assert any("TEMP B-TREE" in step for step in plan)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from sqlmodel import select
+
+from app.database import session_scope
+from app.dependencies import copy_batcher_dependency
+from app.models import Brand, EmailTemplate, Lead, UsageDaily
+from app.services.copy_batcher import CopyBatcher
+from app.services.email_renderer import EmailRenderer, RenderContext
+from app.services.openai_client import OpenAIClient, OpenAIConfig
+from app.services.response_cache import ResponseCache
+from app.services.usage import record_usage
+from benchmarks.query_counts import seed
+from benchmarks.service_stubs import OpenAIStubHandler, StubBehaviour, StubServer
+
+
+@pytest.fixture()
+def cached_openai(client) -> Iterator[StubServer]:  # type: ignore[no-untyped-def]
+    server = StubServer(OpenAIStubHandler, StubBehaviour()).start()
+    openai_client = OpenAIClient(
+        api_key="stub-key", config=OpenAIConfig(base_url=f"{server.url}/v1"), cache=ResponseCache()
+    )
+    client.app.dependency_overrides[copy_batcher_dependency] = lambda: CopyBatcher(openai_client, window_seconds=0)
+    try:
+        yield server
+    finally:
+        client.app.dependency_overrides.clear()
+        server.stop()
+
+
+def test_cache_hits_are_stored_with_the_email_and_counted(client, cached_openai) -> None:  # type: ignore[no-untyped-def]
+    slug = f"usage-{uuid.uuid4().hex[:8]}"
+    brand_id = seed(client, 3, slug=slug)["brand_id"]
+
+    notes = []
+    for _ in range(2):
+        # Same name and company, so the second lead's prompt is served from the cache.
+        lead = client.post(
+            "/leads/", json={"brand_slug": slug, "email": f"{uuid.uuid4().hex[:8]}@example.com", "first_name": "Ada"}
+        ).json()
+        email = client.get(f"/leads/{lead['id']}/emails").json()["items"][0]
+        notes.append(email["metadata"]["openai"])
+
+    assert [note["cache_hit"] for note in notes] == [False, True]
+    assert cached_openai.behaviour.requests == 1
+    totals = client.get("/usage", params={"brand_id": brand_id}).json()["totals"]
+    assert (totals["requests"], totals["cache_hits"]) == (2, 1)
+    assert totals["prompt_tokens"] == notes[0]["prompt_tokens"] > 0
+
+
+def test_rendered_email_usage_reaches_the_daily_rollup(client) -> None:  # type: ignore[no-untyped-def]
+    slug = f"rollup-{uuid.uuid4().hex[:8]}"
+    brand_id = client.post("/brands/", json={"name": slug, "slug": slug}).json()["id"]
+    model = f"model-{slug}"
+    notes = {"summary": "Thanks!", "model_used": model, "prompt_tokens": 11, "completion_tokens": 5, "cache_hit": False}
+
+    with session_scope() as session:
+        lead = Lead(brand_id=brand_id, email=f"{slug}@example.com")
+        session.add(lead)
+        session.flush()
+        template = EmailTemplate(
+            brand_id=brand_id, name="Plain", subject_template="Hi", html_body="<p>{{ lead.email }}</p>"
+        )
+        context = RenderContext(
+            lead=lead, brand=session.get(Brand, brand_id), campaign=None, features=[], tone=None, openai_notes=notes
+        )
+        generated = EmailRenderer().render(template, context)
+        session.add(generated)
+        session.flush()
+        record_usage(session, [(brand_id, generated)])
+
+    with session_scope() as session:
+        rollup = session.exec(select(UsageDaily).where(UsageDaily.brand_id == brand_id)).one()
+    assert (rollup.model, rollup.campaign_id, rollup.requests, rollup.cache_hits) == (model, 0, 1, 0)
+    assert (rollup.prompt_tokens, rollup.completion_tokens) == (11, 5)